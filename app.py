@@ -2,6 +2,7 @@
 """
 Django application entry point.
 Run this file with: python app.py
+Production serving with pre-forked workers: python app.py serve
 """
 import os
 import sys
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Blocking/locking file scan benchmark on a synthetic lock-storm dump.
+
+Writes a blocking_sessions.csv and a sessions_locks.csv of --lines lines
+each (1M by default) into a temporary directory and times the parsers in
+spool_parsers.py against the per-line ``re.search`` loops they replaced.
+
+    python benchmarks/blocking_scan.py [--lines 1000000] [--repeat 3] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from records import BlockingSession, BlockingEdge  # noqa: E402
+from spool_parsers import _int_or_none, parse_blocking_sessions, parse_session_lock_edges  # noqa: E402
+
+
+def write_blocking_sessions(path, lines, rng):
+    """Session rows with a "SID x is blocking status S blocking y" line every tenth row."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            sid = rng.randint(100, 5000)
+            if i % 10 == 9:
+                f.write(f"SID {sid} is blocking status ACTIVE blocking {rng.randint(100, 5000)}\n")
+            else:
+                f.write(f"{i} {sid} {rng.randint(10000, 99999)} ACTIVE WAITING enq {sid} {rng.randint(1, 50)}\n")
+
+
+def write_sessions_locks(path, lines, rng):
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(lines):
+            f.write(f"SID {rng.randint(100, 5000)} is blocking the sessions {rng.randint(100, 5000)}\n")
+
+
+# The parsers as they were before the pattern registry: an inline pattern
+# looked up in re's cache and searched on every line.
+
+def legacy_blocking_sessions(path):
+    sessions = []
+    edges = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) >= 4:
+                sessions.append(BlockingSession(
+                    parts[1],
+                    parts[4] if len(parts) >= 7 else None,
+                    _int_or_none(parts[6]) if len(parts) >= 7 else None,
+                    _int_or_none(parts[7]) if len(parts) >= 8 else None,
+                ))
+            match = re.search(r"SID (\d+) is blocking status \w+ blocking (\d+)", line)
+            if match:
+                edges.add(BlockingEdge(match.group(1), match.group(2)))
+    return tuple(sessions), frozenset(edges)
+
+
+def legacy_session_lock_edges(path):
+    edges = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = re.search(r"SID (\d+) is blocking the sessions (\d+)", line.strip())
+            if match:
+                edges.append(BlockingEdge(match.group(1), match.group(2)))
+    return tuple(edges)
+
+
+def best_of(func, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(path)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, default=1_000_000, help="lines per synthetic file")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per parser; the best is reported")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    options = parser.parse_args(argv)
+
+    rng = random.Random(options.seed)
+    cases = [
+        ("blocking_sessions.csv", write_blocking_sessions, legacy_blocking_sessions, parse_blocking_sessions),
+        ("sessions_locks.csv", write_sessions_locks, legacy_session_lock_edges, parse_session_lock_edges),
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for filename, write, legacy, current in cases:
+            path = os.path.join(tmp, filename)
+            write(path, options.lines, rng)
+            legacy_s = best_of(legacy, path, options.repeat)
+            current_s = best_of(current, path, options.repeat)
+            results.append({
+                'file': filename,
+                'lines': options.lines,
+                'bytes': os.path.getsize(path),
+                'legacy_s': round(legacy_s, 3),
+                'current_s': round(current_s, 3),
+                'speedup': round(legacy_s / current_s, 2) if current_s else None,
+                'lines_per_s': round(options.lines / current_s) if current_s else None,
+            })
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print(f"{r['file']:24} {r['lines']:>9,} lines  legacy {r['legacy_s']:.3f}s  "
+                  f"current {r['current_s']:.3f}s  x{r['speedup']}  ({r['lines_per_s']:,} lines/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark: how long a fresh process takes to become ready.
+
+Each scenario is run in a new interpreter under ``python -X importtime``:
+
+    urls       django.setup() and the URLconf (what a worker loads before
+               its first request, including views.py)
+    app-check  ``python app.py check``, i.e. a management command from cron
+
+For every scenario this reports the median wall time, the slowest
+modules by cumulative import time and, per top-level package, the time
+spent importing it. It exits non-zero if a scenario is slower than
+--budget-ms or imports any of the --forbid packages (pandas and numpy by
+default; nothing on the start-up path should need them).
+
+    python benchmarks/cold_start.py [--runs 5] [--budget-ms 1500] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'urls': ['-c', 'import django; django.setup(); import oracle_db_project.urls'],
+    'app-check': ['app.py', 'check'],
+}
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us, depth)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def run_scenario(args, runs):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='oracle_db_project.settings')
+    wall = []
+    modules = {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + args,
+            cwd=BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+        modules = parse_importtime(result.stderr)
+    return wall, modules
+
+
+def summarize(name, wall, modules, top):
+    packages = defaultdict(int)
+    for module, (self_us, _, _) in modules.items():
+        packages[module.split('.')[0]] += self_us
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    return {
+        'scenario': name,
+        'wall_ms': {
+            'median': round(statistics.median(wall), 1),
+            'min': round(min(wall), 1),
+            'max': round(max(wall), 1),
+        },
+        'import_ms': round(sum(self_us for self_us, _, _ in modules.values()) / 1000, 1),
+        'modules': len(modules),
+        'slowest_modules': [
+            {'module': module, 'cumulative_ms': round(cumulative / 1000, 1), 'self_ms': round(self_us / 1000, 1)}
+            for module, (self_us, cumulative, _) in slowest
+        ],
+        'packages_ms': {
+            package: round(us / 1000, 1)
+            for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        'loaded': sorted(packages),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help="fresh processes per scenario")
+    parser.add_argument('--top', type=int, default=15, help="modules/packages to list")
+    parser.add_argument('--budget-ms', type=float, help="fail if a scenario's median wall time exceeds this")
+    parser.add_argument('--forbid', default='pandas,numpy',
+                        help="comma-separated packages that must not be imported at start-up")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    options = parser.parse_args(argv)
+
+    forbidden = {name for name in options.forbid.split(',') if name}
+    reports = []
+    failures = []
+    for name in options.scenario or SCENARIOS:
+        wall, modules = run_scenario(SCENARIOS[name], options.runs)
+        report = summarize(name, wall, modules, options.top)
+        reports.append(report)
+        for package in sorted(forbidden.intersection(report['loaded'])):
+            failures.append(f"{name}: imports {package}")
+        if options.budget_ms is not None and report['wall_ms']['median'] > options.budget_ms:
+            failures.append(f"{name}: {report['wall_ms']['median']} ms > budget {options.budget_ms} ms")
+
+    if options.json:
+        print(json.dumps({'reports': reports, 'failures': failures}, indent=2))
+    else:
+        for report in reports:
+            wall = report['wall_ms']
+            print(f"== {report['scenario']}: median {wall['median']} ms "
+                  f"(min {wall['min']}, max {wall['max']}), "
+                  f"{report['modules']} modules, {report['import_ms']} ms importing")
+            print("   slowest modules (cumulative / self ms):")
+            for entry in report['slowest_modules']:
+                print(f"     {entry['cumulative_ms']:8.1f} {entry['self_ms']:8.1f}  {entry['module']}")
+            print("   by top-level package (ms):")
+            for package, ms in report['packages_ms'].items():
+                print(f"     {ms:8.1f}  {package}")
+        for failure in failures:
+            print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
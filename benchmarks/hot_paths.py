@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""
+Per-stage benchmark of the spool parsers, the snapshot, the score sections,
+the chart datasets and the report views, at several input scales.
+
+For each factor in --scales, synthetic_spool.py writes a collection run of
+Scale().times(factor) to a temporary directory: factor times the
+tablespaces, datafiles, SQL statements, sessions and blocking edges of
+one production database today. A fresh interpreter pointed at that
+directory (ORACLE_REPORT_CSV_DIR) then measures these stages:
+
+    parser    each spool parser called directly on its file
+    snapshot  a Snapshot built from scratch (parse cache cleared)
+    section   each score section in scores.py
+    dataset   each chart dataset in datasets.py
+    view      each page and /api/ dataset through Django's test client,
+              cold (snapshot and caches cleared) and warm
+
+For every stage it reports the median wall time over --repeat runs. One
+more run under tracemalloc gives its peak traced memory and the number of
+memory blocks it allocated and still held at the end. --json prints the
+results in machine-readable form. --baseline compares them with a saved
+--json run: stages more than --tolerance slower are listed and the exit
+status is 1.
+
+    python benchmarks/hot_paths.py [--scales 1,10,100] [--repeat 5] [--json] [--baseline old.json]
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Stages faster than this are too noisy to flag as regressions.
+MIN_REGRESSION_MS = 0.5
+
+
+def _traced_blocks(snapshot):
+    return snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def measure(func, repeat, setup=None):
+    """{'ms', 'peak_kb', 'blocks'} of func(); setup() runs untimed before each call."""
+    if setup is not None:
+        setup()
+    func()  # warm-up: imports, compiled regexes, template loading
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    before = _traced_blocks(tracemalloc.take_snapshot())
+    tracemalloc.reset_peak()
+    start_size, _ = tracemalloc.get_traced_memory()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = _traced_blocks(tracemalloc.take_snapshot())
+    tracemalloc.stop()
+    del result
+    return {
+        'ms': round(1000 * statistics.median(times), 3),
+        'peak_kb': round((peak - start_size) / 1024, 1),
+        'blocks': sum(stat.count_diff for stat in after.compare_to(before, 'filename')),
+    }
+
+
+def run_stages(repeat):
+    """Measure every stage against settings.CSV_DIR; returns a list of stage results."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oracle_db_project.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    settings.SNAPSHOT_WATCHER = None
+    setup_test_environment()
+
+    import snapshot as snapshots
+    from datasets import DATASETS
+    from parse_cache import parse_cache
+    from scores import SECTIONS
+    from snapshot import CSV_DIR, RECORD_SOURCES, BLOCKING_SESSIONS_FILE, Snapshot
+    from spool_parsers import clean_and_read_value, extract_ratio_value, parse_blocking_sessions
+
+    results = []
+
+    def stage(group, name, func, setup=None):
+        results.append({'group': group, 'name': name, **measure(func, repeat, setup)})
+
+    parsers = [(filename, parser) for filename, parser, _ in RECORD_SOURCES.values()] + [
+        (BLOCKING_SESSIONS_FILE, parse_blocking_sessions),
+        ("V_DB_NAME.csv", clean_and_read_value),
+        ("buff_cache_hit_ratio.csv", extract_ratio_value),
+    ]
+    for filename, parser in parsers:
+        path = os.path.join(CSV_DIR, filename)
+        stage('parser', f"{parser.__name__}({filename})", lambda: parser(path))
+
+    stage('snapshot', 'Snapshot', lambda: Snapshot(CSV_DIR), setup=parse_cache.clear)
+    snapshot = Snapshot(CSV_DIR)
+    for name, (_, build) in SECTIONS.items():
+        stage('section', name, lambda: build(snapshot))
+    for name, (_, build) in DATASETS.items():
+        stage('dataset', name, lambda: build(snapshot))
+
+    client = Client()
+
+    def get(path):
+        response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+        return response
+
+    def clear():
+        caches[settings.REPORT_CACHE_ALIAS].clear()
+        snapshots._snapshots.clear()
+        parse_cache.clear()
+
+    paths = [reverse(name) for name in ('summary_report', 'health_check', 'wait_event_summary', 'top_10_checklists')]
+    paths += [reverse('report_dataset', args=[name]) for name in DATASETS]
+    for path in paths:
+        stage('view', f"{path} cold", lambda: get(path), setup=clear)
+        get(path)
+        stage('view', f"{path} warm", lambda: get(path))
+    return results
+
+
+def run_scale(factor, repeat):
+    from synthetic_spool import Scale, write_collection
+
+    with tempfile.TemporaryDirectory() as csv_dir:
+        write_collection(csv_dir, Scale().times(factor))
+        input_bytes = sum(os.path.getsize(os.path.join(csv_dir, name)) for name in os.listdir(csv_dir))
+        env = dict(os.environ, ORACLE_REPORT_CSV_DIR=csv_dir)
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', '--repeat', str(repeat)],
+            cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return {'scale': factor, 'input_bytes': input_bytes, 'stages': json.loads(output)}
+
+
+def regressions(results, baseline, tolerance):
+    """(scale, group, name, baseline ms, ms) of every stage slower than baseline by more than tolerance."""
+    previous = {
+        (run['scale'], s['group'], s['name']): s['ms'] for run in baseline for s in run['stages']
+    }
+    slower = []
+    for run in results:
+        for s in run['stages']:
+            old = previous.get((run['scale'], s['group'], s['name']))
+            if old is not None and s['ms'] > old * (1 + tolerance) and s['ms'] - old > MIN_REGRESSION_MS:
+                slower.append((run['scale'], s['group'], s['name'], old, s['ms']))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='1,10,100',
+                        help="comma-separated factors the synthetic collection is scaled by")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per stage; the median is reported")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    parser.add_argument('--baseline', help="JSON output of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="relative slowdown against --baseline that fails the run (default: 0.25)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.worker:
+        print(json.dumps(run_stages(options.repeat)))
+        return 0
+
+    results = [run_scale(float(factor), options.repeat) for factor in options.scales.split(',')]
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for run in results:
+            print(f"scale x{run['scale']:g} ({run['input_bytes']:,} bytes of spool files)")
+            for s in run['stages']:
+                print(f"  {s['group']:8} {s['name']:58} {s['ms']:10.3f} ms {s['peak_kb']:10.1f} kB peak "
+                      f"{s['blocks']:8,} blocks")
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            slower = regressions(results, json.load(f), options.tolerance)
+        for scale, group, name, old, new in slower:
+            print(f"REGRESSION x{scale:g} {group} {name}: {old:.3f} ms -> {new:.3f} ms", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+"""
+End-to-end load test: many concurrent clients against a local server.
+
+Starts ``python app.py serve`` on a free port with ORACLE_REPORT_CSV_DIR
+pointed at a temporary collection directory. The directory holds a
+synthetic collection of --scale (see synthetic_spool.py), or a copy of
+--csv-dir. --clients concurrent clients then request the pages in --mix,
+each sending its next request as soon as the last one is answered. They
+do this for --duration seconds in each of three phases:
+
+    cold     straight after the server starts, with every cache empty
+    warm     the same server again, with the pages cached
+    refresh  a new collection run is written into the directory a third
+             of the way in, one spool file at a time, so the server
+             reloads its snapshot while under load. This phase runs
+             SNAPSHOT_WATCHER_DEBOUNCE seconds longer, so that the reload
+             lands inside it; if the server still has not reloaded by its
+             end, the test warns and exits with status 1, as its numbers
+             then describe warm caches, not a refresh
+
+For each phase and endpoint it reports requests per second, p50/p95/p99
+and maximum latency, and the error rate: responses other than 200,
+and connections that failed or timed out. --json prints the results in
+machine-readable form.
+
+    python benchmarks/load_test.py [--clients 64] [--duration 15] [--scale 1 | --csv-dir DIR]
+                                   [--workers N] [--threads 8] [--json]
+
+The clients run in several processes, so the load generator itself is not
+limited by one interpreter's GIL. Run it on an otherwise idle machine: the
+clients share its CPUs with the server.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+DEFAULT_MIX = '/=1,/health/=1,/wait_event_summary/=1,/top-10/=1'
+PHASES = ('cold', 'warm', 'refresh')
+REQUEST_TIMEOUT = 30.0
+SERVER_START_TIMEOUT = 120.0
+RELOAD_TIMEOUT = 60.0
+
+
+def parse_mix(mix):
+    """[(path, weight)] from "path=weight,path=weight"."""
+    pairs = []
+    for item in mix.split(','):
+        path, _, weight = item.partition('=')
+        pairs.append((path.strip(), float(weight or 1)))
+    return pairs
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def request(port, path):
+    """(status, seconds) of one GET; status is None when the request failed."""
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=REQUEST_TIMEOUT)
+    try:
+        conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+        response = conn.getresponse()
+        response.read()
+        status = response.status
+    except (OSError, http.client.HTTPException):
+        status = None
+    finally:
+        conn.close()
+    return status, time.perf_counter() - started
+
+
+def run_clients(port, mix, clients, deadline, seed):
+    """Run clients threads until deadline (time.time()); returns [(path, status, seconds)]."""
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    results = []
+    lock = threading.Lock()
+
+    def client(index):
+        rng = random.Random(seed * 1000 + index)
+        done = []
+        while time.time() < deadline:
+            path = rng.choices(paths, weights)[0]
+            status, seconds = request(port, path)
+            done.append((path, status, seconds))
+        with lock:
+            results.extend(done)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def load(port, mix, clients, duration, processes):
+    """[(path, status, seconds)] of clients clients, split over processes, for duration seconds."""
+    processes = max(1, min(processes, clients))
+    shares = [clients // processes + (i < clients % processes) for i in range(processes)]
+    deadline = time.time() + duration
+    with multiprocessing.Pool(processes) as pool:
+        batches = pool.starmap(run_clients, [(port, mix, share, deadline, i) for i, share in enumerate(shares)])
+    return [result for batch in batches for result in batch]
+
+
+def percentile(ordered, q):
+    """Nearest-rank q-th percentile of an ascending list."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def summarize(results, duration, paths):
+    """Per-endpoint and overall statistics of one phase."""
+    rows = []
+    for path in list(paths) + ['all']:
+        selected = [r for r in results if path == 'all' or r[0] == path]
+        latencies = sorted(seconds for _, _, seconds in selected)
+        errors = sum(1 for _, status, _ in selected if status != 200)
+        rows.append({
+            'endpoint': path,
+            'requests': len(selected),
+            'rps': round(len(selected) / duration, 1),
+            'p50_ms': _ms(percentile(latencies, 50)),
+            'p95_ms': _ms(percentile(latencies, 95)),
+            'p99_ms': _ms(percentile(latencies, 99)),
+            'max_ms': _ms(latencies[-1] if latencies else None),
+            'error_rate': round(errors / len(selected), 4) if selected else None,
+        })
+    return rows
+
+
+def _ms(seconds):
+    return None if seconds is None else round(1000 * seconds, 1)
+
+
+def start_server(csv_dir, port, workers, threads, log):
+    env = dict(os.environ, ORACLE_REPORT_CSV_DIR=csv_dir, PYTHONUNBUFFERED='1')
+    command = [sys.executable, 'app.py', 'serve', f'127.0.0.1:{port}', '--threads', str(threads)]
+    if workers:
+        command += ['--workers', str(workers)]
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    # Any response will do; a missing static file touches none of the report caches.
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        status, _ = request(port, '/static/load-test-ready')
+        if status is not None:
+            return server
+        time.sleep(0.1)
+    stop_server(server)
+    raise RuntimeError(f"server did not answer within {SERVER_START_TIMEOUT:.0f}s")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+class ReloadLog(threading.Thread):
+    """Follows the server log and records when the master reports a reload."""
+
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.times = []
+        self._done = threading.Event()
+
+    def run(self):
+        with open(self.path) as log:
+            while not self._done.is_set():
+                line = log.readline()
+                if not line.endswith('\n'):
+                    # A partial line is read again in full once it is written.
+                    log.seek(log.tell() - len(line))
+                    self._done.wait(0.05)
+                elif 'Reloaded:' in line:
+                    self.times.append(time.time())
+
+    def between(self, start, end):
+        return sum(1 for t in self.times if start <= t <= end)
+
+    def wait_after(self, start, timeout):
+        """Time of the first reload after start, waiting up to timeout seconds for it."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            later = [t for t in self.times if t >= start]
+            if later:
+                return later[0]
+            time.sleep(0.1)
+        return None
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def write_run(source, csv_dir, spread):
+    """Copy the spool files of source into csv_dir one by one, over spread seconds."""
+    filenames = sorted(os.listdir(source))
+    for filename in filenames:
+        shutil.copyfile(os.path.join(source, filename), os.path.join(csv_dir, filename))
+        time.sleep(spread / len(filenames))
+
+
+def prepare(csv_dir, options, seed):
+    """Fill csv_dir with the collection to serve: a copy of --csv-dir, or synthetic data."""
+    from synthetic_spool import Scale, write_collection
+
+    if options.csv_dir:
+        for filename in os.listdir(options.csv_dir):
+            path = os.path.join(options.csv_dir, filename)
+            if os.path.isfile(path) and filename.endswith('.csv'):
+                shutil.copyfile(path, os.path.join(csv_dir, filename))
+    else:
+        write_collection(csv_dir, Scale().times(options.scale), seed=seed)
+
+
+def run(options):
+    from oracle_db_project.settings import SNAPSHOT_WATCHER_DEBOUNCE
+
+    mix = parse_mix(options.mix)
+    paths = [path for path, _ in mix]
+    processes = options.processes or min(os.cpu_count() or 1, 8)
+    phases = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_dir = os.path.join(work_dir, 'output_csv')
+        next_run = os.path.join(work_dir, 'next_run')
+        os.makedirs(csv_dir)
+        os.makedirs(next_run)
+        prepare(csv_dir, options, seed=0)
+        # The next run: new values for the synthetic data, new timestamps for a copy.
+        prepare(next_run, options, seed=1)
+        log_path = os.path.join(work_dir, 'server.log')
+
+        with open(log_path, 'w') as log:
+            port = free_port()
+            server = start_server(csv_dir, port, options.workers, options.threads, log)
+            reload_log = ReloadLog(log_path)
+            reload_log.start()
+            try:
+                for phase in PHASES:
+                    duration = options.duration
+                    writer = None
+                    if phase == 'refresh':
+                        # The watcher waits for the directory to settle before the reload.
+                        duration += SNAPSHOT_WATCHER_DEBOUNCE
+                        writer = threading.Timer(options.duration / 3, write_run,
+                                                 (next_run, csv_dir, options.duration / 6))
+                        writer.start()
+                    started = time.time()
+                    results = load(port, mix, options.clients, duration, processes)
+                    ended = time.time()
+                    if writer is not None:
+                        writer.join()
+                    result = {'phase': phase, 'duration_s': duration,
+                              'reloads': reload_log.between(started, ended),
+                              'endpoints': summarize(results, duration, paths)}
+                    if phase == 'refresh' and not result['reloads']:
+                        reloaded = reload_log.wait_after(ended, RELOAD_TIMEOUT)
+                        result['reload_late_s'] = None if reloaded is None else round(reloaded - ended, 1)
+                    phases.append(result)
+            finally:
+                stop_server(server)
+                reload_log.stop()
+        reloads = len(reload_log.times)
+    return {
+        'clients': options.clients,
+        'duration_s': options.duration,
+        'scale': None if options.csv_dir else options.scale,
+        'reloads': reloads,
+        'phases': phases,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=64, help="concurrent clients (default: 64)")
+    parser.add_argument('--duration', type=float, default=15.0, help="seconds per phase (default: 15)")
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f"endpoints and their relative weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="size of the synthetic collection served (default: 1)")
+    parser.add_argument('--csv-dir', help="serve a copy of this collection directory instead of synthetic data")
+    parser.add_argument('--workers', type=int, help="server worker processes (default: serve's default)")
+    parser.add_argument('--threads', type=int, default=8, help="request threads per worker (default: 8)")
+    parser.add_argument('--processes', type=int,
+                        help="client processes the clients are split over (default: CPUs, at most 8)")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    options = parser.parse_args(argv)
+    if options.clients < 1 or options.duration <= 0:
+        parser.error("--clients and --duration must be positive")
+
+    report = run(options)
+    refresh = report['phases'][-1]
+    status = 0
+    if not refresh['reloads']:
+        late = refresh.get('reload_late_s')
+        when = (f"until {late:g} s after it ended" if late is not None
+                else f"nor within {RELOAD_TIMEOUT:.0f} s after it ended")
+        print(f"warning: the server did not reload during the refresh phase ({when}), so its "
+              f"numbers measure warm caches, not a refresh; try a longer --duration",
+              file=sys.stderr)
+        status = 1
+    if options.json:
+        print(json.dumps(report, indent=2))
+        return status
+    source = options.csv_dir or f"synthetic collection x{options.scale:g}"
+    print(f"{options.clients} clients, {options.duration:g} s per phase, {source}; "
+          f"the server reloaded {report['reloads']} time(s)")
+    for phase in report['phases']:
+        print(f"{phase['phase']} ({phase['duration_s']:g} s, {phase['reloads']} reload(s))")
+        for row in phase['endpoints']:
+            if not row['requests']:
+                print(f"  {row['endpoint']:24} no requests")
+                continue
+            print(f"  {row['endpoint']:24} {row['requests']:7,} req {row['rps']:8.1f} req/s  "
+                  f"p50 {row['p50_ms']:7.1f}  p95 {row['p95_ms']:7.1f}  p99 {row['p99_ms']:7.1f}  "
+                  f"max {row['max_ms']:7.1f} ms  errors {100 * row['error_rate']:.2f}%")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Memory per worker process with and without the shared snapshot.
+
+Starts --workers fresh interpreters at once, like a multi-worker server
+does, once per mode:
+
+    own     every worker parses the collection directory itself
+    shared  SNAPSHOT_SHARED: one worker parses and publishes it, the
+            others map the published segment (see shared_snapshot.py)
+
+Each worker loads the snapshot and computes every section score and
+chart dataset from it, as the report views would. It then reports how
+long loading took and how much its private and proportional (PSS) memory
+grew, after loading and after the views' work. Private memory is what
+each extra worker costs; the figures are medians over the workers. The
+workers stay alive until all of them have reported, so shared pages are
+counted once.
+
+--scale loads a synthetic collection of that many times the usual size
+(see synthetic_spool.py) instead of --csv-dir.
+
+    python benchmarks/shared_snapshot.py [--workers 4] [--csv-dir output_csv | --scale 100] [--json]
+
+Linux only (reads /proc/self/smaps_rollup).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+MODES = ('own', 'shared')
+
+
+def memory_kb():
+    """(private, pss) of this process in kB."""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values['Private_Clean'] + values['Private_Dirty'], values['Pss']
+
+
+def run_worker(mode, csv_dir, shared_dir):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oracle_db_project.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    settings.SNAPSHOT_WATCHER = None
+    settings.SNAPSHOT_SHARED = mode == 'shared'
+    settings.SNAPSHOT_SHARED_DIR = shared_dir
+    import datasets
+    import scores
+    from snapshot import get_snapshot
+
+    private_before, pss_before = memory_kb()
+    started = time.perf_counter()
+    snapshot = get_snapshot(csv_dir)
+    loaded = time.perf_counter()
+    private_loaded, _ = memory_kb()
+    scores.section_scores(snapshot)
+    for name, (_, build) in datasets.DATASETS.items():
+        build(snapshot)
+    private_after, pss_after = memory_kb()
+    print(json.dumps({
+        'load_ms': round(1000 * (loaded - started), 1),
+        'snapshot_private_kb': private_loaded - private_before,
+        'private_kb': private_after - private_before,
+        'pss_kb': pss_after - pss_before,
+    }), flush=True)
+    sys.stdin.read()  # stay mapped until every worker has reported
+
+
+def run_mode(mode, workers, csv_dir):
+    with tempfile.TemporaryDirectory() as shared_dir:
+        procs = [
+            subprocess.Popen(
+                [sys.executable, __file__, '--worker', mode, '--csv-dir', csv_dir, '--shared-dir', shared_dir],
+                cwd=BASE_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+            )
+            for _ in range(workers)
+        ]
+        reports = [json.loads(proc.stdout.readline()) for proc in procs]
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    # Medians, so the one worker that parses in shared mode does not skew them.
+    return {
+        'mode': mode,
+        'workers': workers,
+        'max_load_ms': max(r['load_ms'] for r in reports),
+        'snapshot_private_kb': round(statistics.median(r['snapshot_private_kb'] for r in reports)),
+        'private_kb': round(statistics.median(r['private_kb'] for r in reports)),
+        'pss_kb_total': sum(r['pss_kb'] for r in reports),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4, help="worker processes per mode")
+    parser.add_argument('--csv-dir', default=os.path.join(BASE_DIR, 'output_csv'),
+                        help="collection directory to load (default: output_csv/)")
+    parser.add_argument('--scale', type=float,
+                        help="load a synthetic collection scaled by this factor instead of --csv-dir")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--shared-dir', help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    csv_dir = os.path.abspath(options.csv_dir)
+    if options.worker:
+        return run_worker(options.worker, csv_dir, options.shared_dir)
+
+    if options.scale:
+        from synthetic_spool import Scale, write_collection
+
+        with tempfile.TemporaryDirectory() as csv_dir:
+            write_collection(csv_dir, Scale().times(options.scale))
+            results = [run_mode(mode, options.workers, csv_dir) for mode in MODES]
+    else:
+        results = [run_mode(mode, options.workers, csv_dir) for mode in MODES]
+    if options.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            print(f"{r['mode']:7} {r['workers']} workers  slowest load {r['max_load_ms']:.1f} ms  "
+                  f"private per worker: snapshot {r['snapshot_private_kb']:,} kB, "
+                  f"after scores and datasets {r['private_kb']:,} kB  PSS {r['pss_kb_total']:,} kB total")
+
+
+if __name__ == '__main__':
+    main()
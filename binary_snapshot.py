@@ -0,0 +1,383 @@
+"""
+Compiled binary form of a Snapshot that workers memory-map instead of
+re-parsing the text spool files.
+
+Layout (all integers little-endian)::
+
+    magic          8 bytes   b"ORSNAP\\x00\\x01"
+    header length  uint32, followed by 4 bytes of padding
+    header         JSON: source fingerprint, small scalar values and, for
+                   every record collection (including each ranking of the
+                   top-SQL files), its column types and offsets
+    data           8-byte aligned sections, offsets relative to its start:
+                   - string table: uint32 count, (count + 1) uint32 byte
+                     offsets into a UTF-8 blob. SQL_IDs, owners, tablespace
+                     names and other repeated values are interned once;
+                     SQL text is stored once per distinct statement.
+                   - one fixed-width array per record column: float64 ('d'),
+                     int64 ('q') or uint32 string-table index ('s', 'j' for
+                     JSON-encoded values such as count tuples)
+
+Missing values are encoded as NaN, INT64_MIN and string index 0xFFFFFFFF.
+Files are written to a temporary name and renamed into place, so a reader
+that has one mapped never sees a partially written file.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+
+from records import (
+    SummaryValue, Tablespace, AsmGroup, ModifiedTable, ManagerStatus, WaitEvent,
+    BlockingSession, BlockingEdge, CpuSql, IoSql, FragmentedTable, DbLink, TopSql,
+)
+from snapshot import Snapshot, SOURCE_FILES, directory_fingerprint
+
+MAGIC = b"ORSNAP\x00\x01"
+FORMAT_VERSION = 2
+INT64_NULL = -2 ** 63
+STRING_NULL = 0xFFFFFFFF
+DEFAULT_FILENAME = "snapshot.bin"
+
+# record class -> column type per __slots__ entry
+RECORD_LAYOUTS = {
+    SummaryValue: 'ss',
+    Tablespace: 'sd',
+    AsmGroup: 'sds',
+    ModifiedTable: 'sj',
+    ManagerStatus: 'ss',
+    WaitEvent: 'sq',
+    BlockingSession: 'ssqq',
+    BlockingEdge: 'ss',
+    CpuSql: 'ssddqs',
+    IoSql: 'ssddddds',
+    FragmentedTable: 'ssqqdd',
+    DbLink: 'sssssssss',
+}
+RECORD_CLASSES = {cls.__name__: cls for cls in RECORD_LAYOUTS}
+
+# Snapshot attribute -> record class of its collection
+COLLECTIONS = {
+    'summary': SummaryValue,
+    'asm_groups': AsmGroup,
+    'modified_tables': ModifiedTable,
+    'manager_statuses': ManagerStatus,
+    'tablespaces': Tablespace,
+    'wait_events': WaitEvent,
+    'blocking_sessions': BlockingSession,
+    'blocking_edges': BlockingEdge,
+    'lock_edges': BlockingEdge,
+    'fragmented_tables': FragmentedTable,
+    'dblinks': DbLink,
+}
+# Snapshot attribute -> record class of its TopSql rankings
+TOP_SQL = {
+    'cpu_sql': CpuSql,
+    'io_sql': IoSql,
+}
+SCALARS = ('cache_ratios', 'object_counts', 'unusable_indexes', 'archivals', 'has_waiting_locks')
+
+
+def default_path(csv_dir):
+    return os.path.join(csv_dir, getattr(settings, 'SNAPSHOT_BINARY_NAME', DEFAULT_FILENAME))
+
+
+def _stat_fingerprint(fingerprint):
+    """Path-independent form of a directory fingerprint: [mtime_ns, size] or None per file."""
+    return [None if fp is None else [fp[1], fp[2]] for fp in fingerprint]
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return None
+        value = str(value)
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+    def to_bytes(self):
+        offsets = array('I', [0])
+        chunks = []
+        end = 0
+        for value in self.strings:
+            data = value.encode('utf-8')
+            chunks.append(data)
+            end += len(data)
+            offsets.append(end)
+        return struct.pack('<I', len(self.strings)) + offsets.tobytes() + b"".join(chunks)
+
+
+def _pad(data):
+    return data + b"\0" * (-len(data) % 8)
+
+
+def _encode_column(kind, values, strings):
+    if kind == 'd':
+        return array('d', (float('nan') if v is None else float(v) for v in values)).tobytes()
+    if kind == 'q':
+        return array('q', (INT64_NULL if v is None else int(v) for v in values)).tobytes()
+    if kind == 'j':
+        values = (None if v is None else json.dumps(v) for v in values)
+    return array('I', (STRING_NULL if i is None else i for i in map(strings.add, values))).tobytes()
+
+
+def write_snapshot(snapshot, path=None):
+    """Compile snapshot into path (default: snapshot.bin in its csv_dir); returns the path."""
+    path = path or default_path(snapshot.csv_dir)
+    strings = _StringTable()
+    sections = []
+    offset = 0
+
+    def add_section(data):
+        nonlocal offset
+        data = _pad(data)
+        at = offset
+        sections.append(data)
+        offset += len(data)
+        return at
+
+    def add_collection(records, cls):
+        container = 'frozenset' if isinstance(records, frozenset) else 'tuple'
+        records = list(records)
+        columns = []
+        for name, kind in zip(cls.__slots__, RECORD_LAYOUTS[cls]):
+            values = [getattr(record, name) for record in records]
+            columns.append({'type': kind, 'at': add_section(_encode_column(kind, values, strings))})
+        return {
+            'record': cls.__name__,
+            'container': container,
+            'count': len(records),
+            'columns': columns,
+        }
+
+    collections = {}
+    for attr, cls in COLLECTIONS.items():
+        records = getattr(snapshot, attr)
+        collections[attr] = None if records is None else add_collection(records, cls)
+    top_sql = {}
+    for attr, cls in TOP_SQL.items():
+        ranked = getattr(snapshot, attr)
+        top_sql[attr] = {
+            'statements': ranked.statements,
+            'totals': ranked.totals,
+            'top': {metric: add_collection(records, cls) for metric, records in ranked.top.items()},
+        }
+
+    header = {
+        'version': FORMAT_VERSION,
+        'compiled_at': datetime.now().isoformat(),
+        'source_files': list(SOURCE_FILES),
+        'fingerprint': _stat_fingerprint(snapshot.fingerprint),
+        'scalars': {name: getattr(snapshot, name) for name in SCALARS},
+        'errors': {filename: str(e) for filename, e in snapshot.errors.items()},
+        'strings_at': add_section(strings.to_bytes()),
+        'collections': collections,
+        'top_sql': top_sql,
+    }
+    header_bytes = _pad(json.dumps(header, separators=(',', ':')).encode('utf-8'))
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', len(header_bytes), 0))
+        f.write(header_bytes)
+        for data in sections:
+            f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SnapshotFormatError(ValueError):
+    pass
+
+
+def _decode_strings(view, at):
+    (count,) = struct.unpack_from('<I', view, at)
+    offsets = view[at + 4:at + 8 + 4 * count].cast('I')
+    blob_at = at + 8 + 4 * count
+    blob = view[blob_at:blob_at + offsets[-1]]
+    strings = [str(blob[start:end], 'utf-8') for start, end in zip(offsets, offsets[1:])]
+    strings.append(None)  # STRING_NULL is clamped to this index
+    return strings, count
+
+
+def _decode_column(view, kind, at, count, strings, string_count):
+    if kind == 'd':
+        return [v if v == v else None for v in view[at:at + 8 * count].cast('d')]
+    if kind == 'q':
+        return [None if v == INT64_NULL else v for v in view[at:at + 8 * count].cast('q')]
+    indexes = view[at:at + 4 * count].cast('I')
+    values = [strings[min(i, string_count)] for i in indexes]
+    if kind == 'j':
+        values = [None if v is None else _from_json(v) for v in values]
+    return values
+
+
+def _from_json(text):
+    value = json.loads(text)
+    return tuple(value) if isinstance(value, list) else value
+
+
+class _MappedStrings:
+    """String table read from the mapping one entry at a time."""
+    __slots__ = ('offsets', 'blob', 'count')
+
+    def __init__(self, view, at):
+        (self.count,) = struct.unpack_from('<I', view, at)
+        self.offsets = view[at + 4:at + 8 + 4 * self.count].cast('I')
+        blob_at = at + 8 + 4 * self.count
+        self.blob = view[blob_at:blob_at + self.offsets[-1]]
+
+    def __getitem__(self, index):
+        if index >= self.count:
+            return None
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+
+def _column_reader(view, kind, at, count, strings):
+    """Function returning the value in row i of a mapped column."""
+    if kind == 'd':
+        values = view[at:at + 8 * count].cast('d')
+
+        def read(i):
+            value = values[i]
+            return value if value == value else None
+    elif kind == 'q':
+        values = view[at:at + 8 * count].cast('q')
+
+        def read(i):
+            value = values[i]
+            return None if value == INT64_NULL else value
+    else:
+        indexes = view[at:at + 4 * count].cast('I')
+
+        def read(i):
+            value = strings[indexes[i]]
+            return _from_json(value) if kind == 'j' and value is not None else value
+    return read
+
+
+class MappedRecords(Sequence):
+    """A compiled record collection whose records are decoded when accessed.
+
+    Nothing is copied out of the mapping up front, so processes mapping the
+    same file share one copy of the data (see shared_snapshot.py). Each
+    access builds new record objects; keep the ones you need.
+    """
+    __slots__ = ('_cls', '_readers', '_count')
+
+    def __init__(self, cls, readers, count):
+        self._cls = cls
+        self._readers = readers
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._cls(*[read(index) for read in self._readers])
+
+    def __repr__(self):
+        return f"<MappedRecords of {self._count} {self._cls.__name__}>"
+
+
+def _map_collection(view, spec, strings):
+    readers = [
+        _column_reader(view, column['type'], column['at'], spec['count'], strings)
+        for column in spec['columns']
+    ]
+    return MappedRecords(RECORD_CLASSES[spec['record']], readers, spec['count'])
+
+
+def _decode_collection(view, spec, strings, string_count):
+    cls = RECORD_CLASSES[spec['record']]
+    columns = [
+        _decode_column(view, column['type'], column['at'], spec['count'], strings, string_count)
+        for column in spec['columns']
+    ]
+    records = [cls(*row) for row in zip(*columns)]
+    return frozenset(records) if spec['container'] == 'frozenset' else tuple(records)
+
+
+def read_snapshot(path, csv_dir=None, fingerprint=None, lazy=False):
+    """Memory-map a compiled snapshot and rebuild the Snapshot it was compiled from.
+
+    When fingerprint is given, returns None if the compiled file does not
+    match it (i.e. the spool files were rewritten after compiling). With
+    lazy, record collections are MappedRecords reading from the mapping
+    instead of decoded tuples.
+    """
+    # The mapping is released when the last view into it is garbage
+    # collected: right away unless lazy collections still refer to it.
+    with open(path, 'rb') as f:
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    if bytes(view[:8]) != MAGIC:
+        raise SnapshotFormatError(f"{path} is not a compiled snapshot")
+    header_len, _ = struct.unpack_from('<II', view, 8)
+    header = json.loads(bytes(view[16:16 + header_len]).rstrip(b"\0"))
+    if header['version'] != FORMAT_VERSION or header['source_files'] != list(SOURCE_FILES):
+        raise SnapshotFormatError(f"{path} was compiled by an incompatible version")
+    if fingerprint is not None and header['fingerprint'] != _stat_fingerprint(fingerprint):
+        return None
+
+    data = view[16 + header_len:]
+    if lazy:
+        strings = _MappedStrings(data, header['strings_at'])
+
+        def collection(spec):
+            return _map_collection(data, spec, strings)
+    else:
+        strings, string_count = _decode_strings(data, header['strings_at'])
+
+        def collection(spec):
+            return _decode_collection(data, spec, strings, string_count)
+    snapshot = Snapshot.__new__(Snapshot)
+    snapshot.csv_dir = csv_dir or os.path.dirname(os.path.abspath(path))
+    snapshot._set_fingerprint(fingerprint or tuple(
+        None if fp is None else (os.path.join(snapshot.csv_dir, filename), fp[0], fp[1])
+        for filename, fp in zip(SOURCE_FILES, header['fingerprint'])
+    ))
+    snapshot.errors = dict(header['errors'])
+    for name in SCALARS:
+        setattr(snapshot, name, header['scalars'][name])
+    for attr, spec in header['collections'].items():
+        setattr(snapshot, attr, None if spec is None else collection(spec))
+    for attr, spec in header['top_sql'].items():
+        setattr(snapshot, attr, TopSql(spec['statements'], spec['totals'], {
+            metric: collection(ranking)
+            for metric, ranking in spec['top'].items()
+        }))
+    return snapshot
+
+
+def load_snapshot(csv_dir, fingerprint=None):
+    """Snapshot for csv_dir from its compiled file when that is current, else from the spool files."""
+    if fingerprint is None:
+        fingerprint = directory_fingerprint(csv_dir)
+    path = default_path(csv_dir)
+    if os.path.exists(path):
+        try:
+            snapshot = read_snapshot(path, csv_dir, fingerprint)
+        except (OSError, ValueError, KeyError):
+            snapshot = None
+        if snapshot is not None:
+            return snapshot
+    return Snapshot(csv_dir, fingerprint)
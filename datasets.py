@@ -0,0 +1,203 @@
+"""
+Chart datasets of the report pages, served as JSON from /api/<name>/.
+
+The pages render their scores, tables and empty chart containers, then
+fetch each chart's data separately. Every dataset names the snapshot
+attributes it is built from, so it is validated and cached against only
+their spool files, independently of the page and of the other charts.
+The trend datasets read the history store instead, and are validated
+against its runs of the page's database.
+"""
+from collections import Counter
+
+from downsample import lttb
+from history import top_keys, trend
+from snapshot import BLOCKING_SESSIONS_FILE
+
+# name -> (snapshot attributes, build(snapshot) -> JSON-serializable data)
+DATASETS = {}
+
+# Trend datasets read from the history store (see history.py) rather than
+# the snapshot: name -> build(conn, database, since, until, points, tier)
+# -> [series]. since and until bound the window in Unix seconds, tier is
+# the store tier to read (see select_tier()), and each series is
+# downsampled to at most points points.
+HISTORY_DATASETS = {}
+
+WAIT_TREND_SERIES = 5
+
+TABLESPACE_THRESHOLD = 10000
+
+# Leading word of a blocking_sessions.csv wait type -> full wait event name
+WAIT_EVENT_MAP = {
+    'enq': 'enq: TX - row lock contention',
+    'db': 'db file sequential read',
+    'latch': 'latch: cache buffers chains',
+    'buffer': 'buffer busy waits',
+    'log': 'log file sync'
+}
+
+
+def dataset(name, attrs):
+    def register(build):
+        DATASETS[name] = (tuple(attrs), build)
+        return build
+    return register
+
+
+def history_dataset(name):
+    def register(build):
+        HISTORY_DATASETS[name] = build
+        return build
+    return register
+
+
+def downsampled(label, rows, points):
+    """Chart series of [(run_at, value)] rows, downsampled with LTTB to at most points points."""
+    times, values = lttb([run_at for run_at, _ in rows], [value for _, value in rows], points)
+    return {"label": label, "t": times, "counts": values}
+
+
+@dataset('tablespaces', ['tablespaces'])
+def tablespace_chart(snapshot):
+    combined = sorted(snapshot.tablespaces, key=lambda x: x.free_mb, reverse=True)
+    return {
+        "labels": [ts.name for ts in combined],
+        "free_mb": [ts.free_mb for ts in combined],
+        "colors": [
+            'rgba(255, 99, 132, 1)' if ts.free_mb < TABLESPACE_THRESHOLD else 'rgba(74, 144, 226, 1)'
+            for ts in combined
+        ],
+        "threshold": TABLESPACE_THRESHOLD,
+    }
+
+
+@dataset('archivals', ['archivals'])
+def archival_chart(snapshot):
+    return snapshot.archivals
+
+
+@dataset('wait_events', ['wait_events', 'blocking'])
+def wait_event_chart(snapshot):
+    """Top 10 wait events by count, with time estimated from blocking_sessions.csv."""
+    wait_event_counter = Counter()
+    wait_event_details = {}  # {event_name: {count, total_time, avg_time}}
+    for wait_event in snapshot.wait_events:
+        wait_event_counter[wait_event.name] = wait_event.count
+        wait_event_details[wait_event.name] = {
+            'count': wait_event.count,
+            'total_time': 0,
+            'avg_time': 0
+        }
+
+    # Format: session_id sid serial# status wait_type sid count
+    for session in snapshot.blocking_sessions or ():
+        if session.wait_count is None:
+            continue
+        wait_type = session.wait_type.lower()
+        count = session.wait_count
+        event_name = None
+        for key, value in WAIT_EVENT_MAP.items():
+            if wait_type.startswith(key):
+                event_name = value
+                break
+        if not event_name:
+            for event in wait_event_counter.keys():
+                if wait_type in event.lower() or event.lower().startswith(wait_type):
+                    event_name = event
+                    break
+        if event_name and event_name in wait_event_details:
+            # Estimate time based on count (assuming 1ms per wait)
+            details = wait_event_details[event_name]
+            details['total_time'] += count * 1.0
+            details['count'] = max(details['count'], count)
+
+    for details in wait_event_details.values():
+        if details['count'] > 0:
+            details['avg_time'] = details['total_time'] / details['count']
+    total_wait_time = sum(details['total_time'] for details in wait_event_details.values())
+
+    chart = {"labels": [], "counts": [], "times": [], "avg_times": [], "percentages": []}
+    for event, count in wait_event_counter.most_common(10):
+        details = wait_event_details[event]
+        chart["labels"].append(event)
+        chart["counts"].append(count)
+        chart["times"].append(round(details['total_time'], 2))
+        chart["avg_times"].append(round(details['avg_time'], 2))
+        chart["percentages"].append(
+            round((details['total_time'] / total_wait_time) * 100, 2) if total_wait_time > 0 else 0
+        )
+    return chart
+
+
+@history_dataset('wait_trend')
+def wait_trend_chart(conn, database, since, until, points, tier):
+    """Waits over all events, and of the WAIT_TREND_SERIES busiest events, per run or rollup bucket."""
+    series = [("All wait events", trend(conn, database, 'wait_events_total', '', since, until, tier))]
+    for event in top_keys(conn, database, 'wait_event_count', since, until, WAIT_TREND_SERIES, tier):
+        series.append((event, trend(conn, database, 'wait_event_count', event, since, until, tier)))
+    return [downsampled(label, rows, points) for label, rows in series if rows]
+
+
+@dataset('blocking_sessions', ['blocking'])
+def blocking_chart(snapshot):
+    blocking_counter = Counter()
+    for session in snapshot.blocking_sessions or ():
+        if session.blocked_count is not None:
+            blocking_counter[session.sid] += session.blocked_count
+    most_common_blocking = blocking_counter.most_common(10)
+    return {
+        "labels": [sid for sid, _ in most_common_blocking],
+        "counts": [count for _, count in most_common_blocking],
+    }
+
+
+def _vis_graph(edges):
+    nodes = sorted(set(int(n) for pair in edges for n in pair))
+    return {
+        "nodes": [{"id": n, "label": f"SID {n}"} for n in nodes],
+        "edges": sorted(({"from": int(f), "to": int(t)} for f, t in edges), key=lambda e: (e["from"], e["to"])),
+    }
+
+
+@dataset('session_network', ['blocking', 'lock_edges'])
+def session_network(snapshot):
+    """vis-network graph of blocking_sessions.csv, or of sessions_locks.csv when that has none."""
+    edges = snapshot.blocking_edges if snapshot.has_file(BLOCKING_SESSIONS_FILE) else None
+    if not edges and snapshot.has_file("sessions_locks.csv"):
+        edges = snapshot.lock_edges
+    return _vis_graph(edges or ())
+
+
+@dataset('fragmented_tables', ['fragmented_tables'])
+def fragmented_table_list(snapshot):
+    tables = sorted(snapshot.fragmented_tables, key=lambda x: x.approx_unused_mb, reverse=True)
+    return {
+        "owners": [rec.owner for rec in tables],
+        "table_names": [rec.table_name for rec in tables],
+        "unused_mb": [rec.approx_unused_mb for rec in tables],
+        "num_rows": [rec.num_of_rows for rec in tables],
+    }
+
+
+# The SQL charts only show ids and figures; the text stays in the page's tables.
+@dataset('cpu_sql', ['cpu_sql'])
+def cpu_sql_chart(snapshot):
+    return [
+        {"SQL_ID": rec.sql_id, "OWNER": rec.owner, "CPU_TIME": rec.cpu_time, "ELAPSED_TIME": rec.elapsed_time}
+        for rec in snapshot.cpu_sql.ranking('cpu_time')
+    ]
+
+
+@dataset('io_sql', ['io_sql'])
+def io_sql_chart(snapshot):
+    return [
+        {
+            "SQL_ID": rec.sql_id,
+            "OWNER": rec.owner,
+            "EXECUTIONS": rec.executions,
+            "DISK_READS": rec.disk_reads,
+            "BUFFER_GETS": rec.buffer_gets,
+        }
+        for rec in snapshot.io_sql.ranking('disk_reads')
+    ]
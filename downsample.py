@@ -0,0 +1,45 @@
+"""
+Largest-Triangle-Three-Buckets downsampling of chart series.
+
+A trend over months of collection runs holds thousands of points per
+series, far more than a chart is wide. lttb() keeps the first and last
+point and, from each of threshold - 2 equal buckets in between, the point
+forming the largest triangle with the point kept from the previous bucket
+and the average of the next bucket. Peaks and dips survive, unlike with
+plain averaging or striding. (Steinarsson, "Downsampling Time Series for
+Visual Representation", 2013.)
+"""
+
+
+def lttb(xs, ys, threshold):
+    """(xs, ys) reduced to at most threshold points; xs must be ascending."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    every = (n - 2) / (threshold - 2)
+    kept_x = [xs[0]]
+    kept_y = [ys[0]]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket (the last point for the last bucket)
+        start = int((i + 1) * every) + 1
+        end = min(int((i + 2) * every) + 1, n)
+        if start >= end:
+            start, end = n - 1, n
+        avg_x = sum(xs[start:end]) / (end - start)
+        avg_y = sum(ys[start:end]) / (end - start)
+
+        ax, ay = xs[a], ys[a]
+        best = -1.0
+        chosen = a
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                chosen = j
+        kept_x.append(xs[chosen])
+        kept_y.append(ys[chosen])
+        a = chosen
+    kept_x.append(xs[-1])
+    kept_y.append(ys[-1])
+    return kept_x, kept_y
@@ -0,0 +1,282 @@
+"""
+Fleet mode: one dashboard over the collection runs of many databases.
+
+Every subdirectory <name>/ of FLEET_DIR (output_csv/ by default) that holds
+spool files is one database. Its pages are served under /db/<name>/ by the
+same views as the single-database pages. /db/ is the fleet overview, which
+ranks every database by its section scores.
+
+The overview never parses in the request. Fleet.refresh() stats every
+database's spool files on the ingest thread pool and re-ingests the
+databases whose files changed on a pool of FLEET_INGEST_PROCESSES
+processes. Each process maps the database's compiled snapshot.bin when it
+is current. Otherwise it parses the spool files and compiles snapshot.bin
+(see binary_snapshot.py), so the database's own pages map it instead of
+parsing again. It returns the section scores. Requests are served from the
+last complete refresh, and the next refresh runs in the background once
+that one is FLEET_REFRESH_INTERVAL old. The database pages read their
+fingerprints from the same refresh (adatabase_fingerprint()) rather than
+each running a snapshot watcher.
+
+Each database's pages are cached in their own partition of the report
+cache (cache_partition()), so a busy database cannot evict the pages of
+the others.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from binary_snapshot import default_path, read_snapshot, write_snapshot
+from parse_cache import file_fingerprint
+from records import FleetDatabase
+from scores import display_score, section_scores
+from snapshot import CSV_DIR, SOURCE_FILES, Snapshot, directory_fingerprint, ingest_map
+
+logger = logging.getLogger(__name__)
+
+# Database names are URL path segments (see urls.py).
+NAME_RE = re.compile(r"[-a-zA-Z0-9_]+")
+
+_fleets = {}
+_fleets_lock = threading.Lock()
+# {name: cache} per thread, like the connections of django.core.cache.caches
+_partitions = Local()
+
+
+def fleet_dir():
+    return getattr(settings, 'FLEET_DIR', None) or CSV_DIR
+
+
+def is_collection_dir(path):
+    """True if path is a directory holding at least one spool file."""
+    return any(os.path.isfile(os.path.join(path, filename)) for filename in SOURCE_FILES)
+
+
+def discover(root):
+    """{name: collection directory} of the databases under root, by name."""
+    try:
+        entries = sorted(os.scandir(root), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return {}
+    return {
+        entry.name: entry.path for entry in entries
+        if entry.is_dir() and NAME_RE.fullmatch(entry.name) and is_collection_dir(entry.path)
+    }
+
+
+def database_dir(name):
+    """Collection directory of database name, or None if the fleet has no such database."""
+    if not NAME_RE.fullmatch(name):
+        return None
+    path = get_fleet().directories.get(name)
+    if path is None:
+        # Not there at the last refresh; it may have been added since.
+        path = os.path.join(fleet_dir(), name)
+        if not is_collection_dir(path):
+            return None
+    return path
+
+
+async def adatabase_fingerprint(name, csv_dir):
+    """Fingerprint of database name's spool files in csv_dir, as of the last fleet refresh.
+
+    The fleet refresh already stats every database, so the database's pages
+    read their snapshot and validators from it instead of running a
+    snapshot watcher (a thread and an inotify descriptor) per database.
+    Reading it starts the next refresh in the background once that is due.
+    Before the first refresh, or for a database added since, the files are
+    stat'ed.
+    """
+    fleet = get_fleet()
+    if fleet.state is not None:
+        database = fleet.current()[1].get(name)
+        if database is not None:
+            return database.fingerprint
+    return await asyncio.to_thread(directory_fingerprint, csv_dir)
+
+
+def cache_partition(name):
+    """Database name's partition of the report cache.
+
+    A cache built from the REPORT_CACHE_ALIAS settings with its own key
+    prefix and, with the in-memory backend, its own store and MAX_ENTRIES.
+    settings.CACHES is left alone.
+    """
+    partitions = getattr(_partitions, 'caches', None)
+    if partitions is None:
+        partitions = _partitions.caches = {}
+    cache = partitions.get(name)
+    if cache is None:
+        params = dict(caches.settings[settings.REPORT_CACHE_ALIAS])
+        backend = params.pop('BACKEND')
+        location = params.pop('LOCATION', '')
+        params['KEY_PREFIX'] = f"{params.get('KEY_PREFIX', '')}db-{name}"
+        if backend.endswith('.LocMemCache'):
+            location = f"{location}:{name}"
+        cache = partitions[name] = import_string(backend)(location, params)
+    return cache
+
+
+def ingest_database(name, csv_dir):
+    """FleetDatabase of csv_dir; compiles its snapshot.bin unless that is current."""
+    fingerprint = tuple(file_fingerprint(os.path.join(csv_dir, filename)) for filename in SOURCE_FILES)
+    path = default_path(csv_dir)
+    snapshot = None
+    if os.path.exists(path):
+        try:
+            snapshot = read_snapshot(path, csv_dir, fingerprint, lazy=True)
+        except (OSError, ValueError, KeyError):
+            snapshot = None
+    if snapshot is None:
+        snapshot = Snapshot(csv_dir, fingerprint)
+        try:
+            write_snapshot(snapshot, path)
+        except OSError as e:
+            logger.warning("Could not compile %s: %s", path, e)
+    scores = section_scores(snapshot)
+    score, emoji = display_score(scores)
+    summary = {item.label: item.value for item in snapshot.summary}
+    mtimes = [fp[1] for fp in fingerprint if fp is not None]
+    return FleetDatabase(
+        name, summary.get("Db Name", "NA"), fingerprint, scores, score, emoji,
+        max(mtimes) if mtimes else None, len(snapshot.errors),
+    )
+
+
+def _try_ingest(job):
+    name, csv_dir = job
+    try:
+        return ingest_database(name, csv_dir)
+    except Exception:
+        logger.exception("Could not ingest %s", csv_dir)
+        return None
+
+
+def _init_ingest_process():
+    import django
+    django.setup()
+
+
+class Fleet:
+    """The databases under one fleet directory, as of the last refresh."""
+
+    def __init__(self, root, interval=None, processes=None):
+        self.root = root
+        self.interval = interval if interval is not None else getattr(settings, 'FLEET_REFRESH_INTERVAL', 30.0)
+        self.processes = processes or getattr(settings, 'FLEET_INGEST_PROCESSES', None) or os.cpu_count() or 1
+        self.directories = {}
+        # (version, databases by name); version changes with any database's spool files
+        self.state = None
+        self.refreshed_at = None
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def refresh(self):
+        """Re-discover the databases and re-ingest those whose spool files changed."""
+        with self._lock:
+            previous = self.state[1] if self.state is not None else {}
+            directories = discover(self.root)
+            stats = ingest_map(file_fingerprint, [
+                os.path.join(path, filename) for path in directories.values() for filename in SOURCE_FILES
+            ])
+            count = len(SOURCE_FILES)
+            fingerprints = {
+                name: tuple(stats[i * count:(i + 1) * count]) for i, name in enumerate(directories)
+            }
+            changed = [
+                name for name in directories
+                if name not in previous or previous[name].fingerprint != fingerprints[name]
+            ]
+            started = time.perf_counter()
+            ingested = self._ingest([(name, directories[name]) for name in changed])
+            databases = {}
+            for name in directories:
+                database = ingested.get(name) or previous.get(name)
+                if database is not None:
+                    databases[name] = database
+            if changed:
+                logger.info("Ingested %d of %d databases under %s in %.1f s", len(ingested),
+                            len(directories), self.root, time.perf_counter() - started)
+            version = hashlib.sha1(repr([
+                (name, database.fingerprint) for name, database in databases.items()
+            ]).encode()).hexdigest()[:16]
+            self.directories = directories
+            self.state = (version, databases)
+            self.refreshed_at = time.monotonic()
+            return self.state
+
+    def _ingest(self, jobs):
+        """{name: FleetDatabase} of the (name, csv_dir) jobs that could be ingested."""
+        processes = min(len(jobs), self.processes)
+        if processes <= 1:
+            results = map(_try_ingest, jobs)
+        else:
+            # Spawned rather than forked: the server's threads (and their
+            # locks) would otherwise be copied into every ingest process.
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_ingest_process) as pool:
+                results = list(pool.map(_try_ingest, jobs, chunksize=max(1, len(jobs) // (4 * processes))))
+        return {name: database for (name, _), database in zip(jobs, results) if database is not None}
+
+    def current(self):
+        """(version, databases by name) as of the last refresh.
+
+        Only the first call waits for a refresh. Later ones start one in the
+        background once the last is older than the refresh interval.
+        """
+        state = self.state
+        if state is None:
+            with self._refreshing:
+                state = self.state or self.refresh()
+        elif time.monotonic() - self.refreshed_at >= self.interval and self._refreshing.acquire(blocking=False):
+            threading.Thread(target=self._refresh_in_background, name="fleet-refresh", daemon=True).start()
+        return state
+
+    async def acurrent(self):
+        """current() for async views; the first refresh runs in a worker thread."""
+        if self.state is not None:
+            return self.current()
+        return await asyncio.to_thread(self.current)
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Could not refresh the fleet under %s", self.root)
+        finally:
+            self._refreshing.release()
+
+
+def get_fleet(root=None):
+    root = root or fleet_dir()
+    fleet = _fleets.get(root)
+    if fleet is None:
+        with _fleets_lock:
+            fleet = _fleets.get(root)
+            if fleet is None:
+                fleet = _fleets[root] = Fleet(root)
+    return fleet
+
+
+def _reset_fleets():
+    # A refresh thread in the parent may have held these locks at fork().
+    global _fleets_lock
+    _fleets_lock = threading.Lock()
+    for fleet in _fleets.values():
+        fleet._lock = threading.Lock()
+        fleet._refreshing = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_fleets)
@@ -0,0 +1,588 @@
+"""
+History of the collection runs, appended to a SQLite store.
+
+Each collection run overwrites output_csv/, so the snapshot only knows the
+latest run. ingest_run() appends a run's metrics to HISTORY_DB (a
+dedicated file, history.sqlite3 by default) so that the pages can chart
+them over weeks:
+
+    runs      one row per (database, run_at): when the run was collected
+              and the fingerprint of the spool files it was read from
+    samples   (database, metric, key, run_at) -> value; key names the
+              tablespace, disk group, wait event or statement, and is ''
+              for metrics of the whole run
+    sql_text  the latest owner and text of every statement sampled
+
+samples is a WITHOUT ROWID table clustered on its primary key, so the
+history of one metric of one database is a single range scan of
+contiguous pages however many runs and databases the store holds. run_at
+is the collection time in Unix seconds: the newest mtime of the run's
+spool files unless the caller knows better.
+
+A run is written in one transaction with executemany(), and is skipped
+if (database, run_at) is already in the store. The same transaction folds
+its samples into the hourly and daily rollups (count, total, min and max
+per bucket), so the rollups never need recomputing from raw samples.
+maintain() prunes each tier to its HISTORY_RETENTION and VACUUMs the
+file every HISTORY_VACUUM_INTERVAL days; ingest_history runs it after
+every ingest. Trend reads name a tier, and select_tier() picks the
+coarsest one that still has enough points for the chart, so a month-long
+view reads hourly rollups instead of every raw sample.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from snapshot import ATTRIBUTE_FILES, CACHE_RATIO_FILES, SUMMARY_FILES
+from spool_parsers import clean_and_read_value, iter_dbstructure, iter_disk_io_contention, iter_io_usage_sql
+
+# metric -> what it samples; the key of each sample in parentheses
+METRICS = {
+    'tablespace_free_mb': "Free MB of each tablespace (tablespace)",
+    'tablespace_physical_reads': "Physical reads summed over each tablespace's datafiles (tablespace)",
+    'tablespace_physical_writes': "Physical writes summed over each tablespace's datafiles (tablespace)",
+    'asm_usage_pct': "Used % of each ASM disk group (disk group)",
+    'cache_hit_ratio': "Buffer and library cache hit ratios (ratio label)",
+    'wait_event_count': "Waits of each wait event (event)",
+    'wait_events_total': "Waits summed over every wait event ('')",
+    'blocking_sessions': "Sessions blocking others ('')",
+    'blocked_sessions': "Sessions blocked, summed over the blockers ('')",
+    'lock_edges': "Blocker/waiter pairs in sessions_locks.csv ('')",
+    'waiting_locks': "1 if waiting_blocking_locks.csv lists waiters, else 0 ('')",
+    'cpu_sql.cpu_time': "CPU time of each top statement (sql_id)",
+    'cpu_sql.elapsed_time': "Elapsed time of each top statement (sql_id)",
+    'cpu_sql.total_cpu_time': "CPU time summed over every statement ('')",
+    'cpu_sql.total_elapsed_time': "Elapsed time summed over every statement ('')",
+    'io_sql.disk_reads': "Disk reads of each top statement (sql_id)",
+    'io_sql.buffer_gets': "Buffer gets of each top statement (sql_id)",
+    'io_sql.executions': "Executions of each top statement (sql_id)",
+    'io_sql.total_disk_reads': "Disk reads summed over every statement ('')",
+    'io_sql.total_buffer_gets': "Buffer gets summed over every statement ('')",
+    'user_sql_disk_reads': "Disk reads of the io_usage_sql.csv statements, summed per parsing user (user)",
+}
+
+# Multi-line spool files too large for the snapshot, streamed a record at a
+# time by streamed_samples()
+STREAMED_FILES = ('dbstructure.csv', 'disk_io_contention.csv', 'io_usage_sql.csv')
+
+# Top-SQL metrics sampled per statement, by snapshot attribute
+SQL_METRICS = {
+    'cpu_sql': ('cpu_time', 'elapsed_time'),
+    'io_sql': ('disk_reads', 'buffer_gets', 'executions'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    database TEXT NOT NULL,
+    run_at INTEGER NOT NULL,
+    ingested_at INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (database, run_at)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS samples (
+    database TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    run_at INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (database, metric, key, run_at)
+) WITHOUT ROWID;
+
+-- Every metric of one run or one time range, e.g. to drop old runs.
+CREATE INDEX IF NOT EXISTS samples_by_run ON samples (database, run_at);
+
+-- Rollups: samples folded into hourly and daily buckets (bucket is the
+-- bucket's first second); avg = total / count.
+CREATE TABLE IF NOT EXISTS samples_hourly (
+    database TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    PRIMARY KEY (database, metric, key, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_hourly_by_bucket ON samples_hourly (database, bucket);
+
+CREATE TABLE IF NOT EXISTS samples_daily (
+    database TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    PRIMARY KEY (database, metric, key, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_daily_by_bucket ON samples_daily (database, bucket);
+
+-- When each maintenance task (see maintain()) last ran
+CREATE TABLE IF NOT EXISTS maintenance (
+    task TEXT PRIMARY KEY,
+    done_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sql_text (
+    database TEXT NOT NULL,
+    sql_id TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    sql_text TEXT NOT NULL,
+    last_seen INTEGER NOT NULL,
+    PRIMARY KEY (database, sql_id)
+) WITHOUT ROWID;
+"""
+
+# tier -> (table, bucket seconds), finest first; raw samples have no buckets
+TIERS = {
+    'raw': ('samples', None),
+    'hourly': ('samples_hourly', 3600),
+    'daily': ('samples_daily', 86400),
+}
+# Runs reach the store a little after they are collected, and are pruned
+# after that; a window may start this much before a tier's retention.
+PRUNE_SLACK = 3600
+
+# What a rollup tier's trend reads for each statistic
+ROLLUP_STATS = {'avg': "total / count", 'min': "min_value", 'max': "max_value"}
+
+ROLLUP_SQL = (
+    "INSERT INTO {table} (database, metric, key, bucket, count, total, min_value, max_value) "
+    "VALUES (?, ?, ?, ?, 1, ?, ?, ?) "
+    "ON CONFLICT (database, metric, key, bucket) DO UPDATE SET "
+    "count = count + 1, total = total + excluded.total, "
+    "min_value = min(min_value, excluded.min_value), max_value = max(max_value, excluded.max_value)"
+)
+
+# ?window= of the trend datasets: a number of hours, days or weeks
+WINDOW_RE = re.compile(r"(\d+)([hdw])")
+WINDOW_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+_local = threading.local()
+
+
+def history_path():
+    return getattr(settings, 'HISTORY_DB', None) or os.path.join(settings.BASE_DIR, "history.sqlite3")
+
+
+def connect(path=None):
+    """A new connection to the history store at path, creating its tables if needed."""
+    conn = sqlite3.connect(path or history_path(), timeout=30)
+    # Readers never block the ingest, nor the ingest readers.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_connection(path=None):
+    """This thread's connection to the history store at path (default: HISTORY_DB)."""
+    path = str(path or history_path())
+    connections = getattr(_local, 'connections', None)
+    if connections is None or getattr(_local, 'pid', None) != os.getpid():
+        # sqlite3 connections must not be used across fork().
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+    conn = connections.get(path)
+    if conn is None:
+        conn = connections[path] = connect(path)
+    return conn
+
+
+def database_name(snapshot):
+    """Name a single-database run is stored under: its V_DB_NAME, or its directory's name."""
+    for item in snapshot.summary:
+        if item.label == "Db Name" and item.value != "NA":
+            return item.value
+    return os.path.basename(snapshot.csv_dir.rstrip(os.sep))
+
+
+def directory_database_name(csv_dir):
+    """database_name() of the run in csv_dir, reading only its V_DB_NAME.csv."""
+    value = clean_and_read_value(os.path.join(csv_dir, SUMMARY_FILES["Db Name"]))
+    return value if value != "NA" else os.path.basename(csv_dir.rstrip(os.sep))
+
+
+def parse_window(window):
+    """Seconds in a window such as '24h', '7d' or '12w'; ValueError if it is not one."""
+    match = WINDOW_RE.fullmatch(window)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"invalid window {window!r}")
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def run_time(fingerprint):
+    """Collection time of a run in Unix seconds: the newest mtime in the fingerprint of its spool files."""
+    mtimes = [fp[1] for fp in fingerprint if fp is not None]
+    return max(mtimes) // 1_000_000_000 if mtimes else int(time.time())
+
+
+def run_samples(snapshot):
+    """[(metric, key, value)] of every metric of snapshot that could be read."""
+    samples = [('tablespace_free_mb', ts.name, ts.free_mb) for ts in snapshot.tablespaces]
+    samples += [
+        ('asm_usage_pct', group.name, group.usage)
+        for group in snapshot.asm_groups if not group.error and group.usage is not None
+    ]
+    samples += [
+        ('cache_hit_ratio', label, snapshot.cache_ratios[label])
+        for label in CACHE_RATIO_FILES if snapshot.cache_ratios.get(label) is not None
+    ]
+    samples += [('wait_event_count', event.name, event.count) for event in snapshot.wait_events]
+    if snapshot.wait_events:
+        samples.append(('wait_events_total', '', sum(event.count for event in snapshot.wait_events)))
+
+    if snapshot.blocking_sessions is not None:
+        samples.append(('blocking_sessions', '', len(snapshot.blocking_sessions)))
+        samples.append(('blocked_sessions', '', sum(
+            session.blocked_count for session in snapshot.blocking_sessions if session.blocked_count is not None
+        )))
+    samples.append(('lock_edges', '', len(snapshot.lock_edges)))
+    samples.append(('waiting_locks', '', 1 if snapshot.has_waiting_locks else 0))
+
+    for attr, metrics in SQL_METRICS.items():
+        top_sql = getattr(snapshot, attr)
+        if not top_sql.statements:
+            continue
+        for name in top_sql.totals:
+            samples.append((f'{attr}.total_{name}', '', top_sql.total(name)))
+        for statement in top_statements(top_sql):
+            for name in metrics:
+                value = getattr(statement, name)
+                if value is not None:
+                    samples.append((f'{attr}.{name}', statement.sql_id, value))
+    samples += streamed_samples(snapshot.csv_dir)
+    return samples
+
+
+def _stream(csv_dir, filename, parser):
+    """parser's records of filename in csv_dir; none if the file is missing."""
+    path = os.path.join(csv_dir, filename)
+    return parser(path) if os.path.exists(path) else ()
+
+
+def streamed_samples(csv_dir):
+    """[(metric, key, value)] of the STREAMED_FILES in csv_dir.
+
+    Datafile I/O is summed per tablespace, through the datafile to
+    tablespace map of dbstructure.csv; statement disk reads per user.
+    """
+    tablespaces = {
+        datafile.name: datafile.tablespace
+        for datafile in _stream(csv_dir, 'dbstructure.csv', iter_dbstructure)
+        if datafile.kind == 'datafile' and datafile.tablespace
+    }
+    reads = Counter()
+    writes = Counter()
+    for datafile in _stream(csv_dir, 'disk_io_contention.csv', iter_disk_io_contention):
+        tablespace = tablespaces.get(datafile.name)
+        if tablespace is None:
+            continue
+        reads[tablespace] += datafile.phys_reads or 0
+        writes[tablespace] += datafile.phys_writes or 0
+    user_reads = Counter()
+    for statement in _stream(csv_dir, 'io_usage_sql.csv', iter_io_usage_sql):
+        if statement.username and statement.disk_reads is not None:
+            user_reads[statement.username] += statement.disk_reads
+    samples = [('tablespace_physical_reads', name, value) for name, value in reads.items()]
+    samples += [('tablespace_physical_writes', name, value) for name, value in writes.items()]
+    samples += [('user_sql_disk_reads', name, value) for name, value in user_reads.items()]
+    return samples
+
+
+def top_statements(top_sql):
+    """The statements of any of top_sql's rankings, each once, by sql_id."""
+    statements = {}
+    for ranking in top_sql.top.values():
+        for statement in ranking:
+            statements.setdefault(statement.sql_id, statement)
+    return list(statements.values())
+
+
+def ingest_run(conn, database, snapshot, run_at=None):
+    """Append snapshot's metrics to the store as the run of database at run_at.
+
+    Returns the number of samples written, or None if that run is already
+    in the store.
+    """
+    run_at = run_time(snapshot.fingerprint) if run_at is None else int(run_at)
+    # The last sample of a (metric, key) wins, in the rollups as in samples.
+    samples = {(metric, key): value for metric, key, value in run_samples(snapshot)}
+    statements = [
+        (database, statement.sql_id, statement.owner or '', statement.sql_text or '', run_at)
+        for attr in SQL_METRICS for statement in top_statements(getattr(snapshot, attr))
+    ]
+    with conn:
+        if not _insert_run(conn, database, run_at, snapshot.version(*ATTRIBUTE_FILES), samples):
+            return None
+        conn.executemany(
+            "INSERT INTO sql_text (database, sql_id, owner, sql_text, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (database, sql_id) DO UPDATE SET "
+            "owner = excluded.owner, sql_text = excluded.sql_text, last_seen = excluded.last_seen "
+            "WHERE excluded.last_seen >= sql_text.last_seen",
+            statements,
+        )
+    return len(samples)
+
+
+def repeat_run(conn, database, run_at):
+    """Record a run of database whose spool files have the same content as its newest run.
+
+    The newest run's samples are copied to run_at without reading the
+    spool files, so the trends show the collection run instead of a gap.
+    Returns the number of samples written, or None if there is no newer
+    run_at to copy them to or their raw samples are pruned; the run must
+    then be ingested.
+    """
+    run_at = int(run_at)
+    with conn:
+        previous = conn.execute(
+            "SELECT run_at, fingerprint FROM runs WHERE database = ? ORDER BY run_at DESC LIMIT 1", (database,)
+        ).fetchone()
+        if previous is None or previous[0] >= run_at:
+            return None
+        samples = {
+            (metric, key): value for metric, key, value in conn.execute(
+                "SELECT metric, key, value FROM samples WHERE database = ? AND run_at = ?", (database, previous[0])
+            )
+        }
+        if not samples or not _insert_run(conn, database, run_at, previous[1], samples):
+            return None
+        conn.execute(
+            "UPDATE sql_text SET last_seen = ? WHERE database = ? AND last_seen = ?", (run_at, database, previous[0])
+        )
+    return len(samples)
+
+
+def has_run(conn, database, run_at):
+    """True if the run of database at run_at is in the store."""
+    return conn.execute(
+        "SELECT 1 FROM runs WHERE database = ? AND run_at = ?", (database, int(run_at))
+    ).fetchone() is not None
+
+
+def _insert_run(conn, database, run_at, fingerprint, samples):
+    """Add a run and its {(metric, key): value} samples, rollups included; False if the run is already there.
+
+    Runs inside the caller's transaction.
+    """
+    inserted = conn.execute(
+        "INSERT OR IGNORE INTO runs (database, run_at, ingested_at, fingerprint) VALUES (?, ?, ?, ?)",
+        (database, run_at, int(time.time()), fingerprint),
+    ).rowcount
+    if not inserted:
+        return False
+    conn.executemany(
+        "INSERT OR REPLACE INTO samples (database, metric, key, run_at, value) VALUES (?, ?, ?, ?, ?)",
+        [(database, metric, key, run_at, value) for (metric, key), value in samples.items()],
+    )
+    for table, bucket in TIERS.values():
+        if bucket is not None:
+            start = run_at - run_at % bucket
+            conn.executemany(ROLLUP_SQL.format(table=table), [
+                (database, metric, key, start, value, value, value) for (metric, key), value in samples.items()
+            ])
+    return True
+
+
+def rebuild_rollups(conn):
+    """Recompute every rollup tier from the raw samples still in the store."""
+    for table, bucket in TIERS.values():
+        if bucket is None:
+            continue
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"INSERT INTO {table} (database, metric, key, bucket, count, total, min_value, max_value) "
+            f"SELECT database, metric, key, run_at - run_at % {bucket}, COUNT(*), SUM(value), MIN(value), MAX(value) "
+            f"FROM samples GROUP BY database, metric, key, run_at - run_at % {bucket}"
+        )
+
+
+def select_tier(since, until, points, pruned_at=None):
+    """Coarsest tier that still holds since and has at least points buckets between since and until.
+
+    When none has that many, the finest tier that still holds since. A
+    tier holds since if the last prune (at pruned_at; None: never) left
+    its rows from since on, give or take PRUNE_SLACK.
+    """
+    retention = settings.HISTORY_RETENTION
+    holding = [
+        tier for tier in TIERS
+        if pruned_at is None or retention.get(tier) is None
+        or since >= pruned_at - retention[tier] * 86400 - PRUNE_SLACK
+    ]
+    for tier in reversed(holding):
+        bucket = TIERS[tier][1]
+        if bucket is None or (until - since) / bucket >= points:
+            return tier
+    return holding[0] if holding else list(TIERS)[-1]
+
+
+def _series_columns(tier, stat):
+    """(table, time column, value expression) of a trend read from tier."""
+    table, bucket = TIERS[tier]
+    if bucket is None:
+        return table, "run_at", "value"
+    return table, "bucket", ROLLUP_STATS[stat]
+
+
+def trend(conn, database, metric, key='', since=None, until=None, tier='raw', stat='avg'):
+    """[(time, value)] of one metric of database, oldest first, between since and until (Unix seconds).
+
+    From a rollup tier, time is the bucket's first second and value its
+    stat: 'avg', 'min' or 'max'.
+    """
+    table, column, value = _series_columns(tier, stat)
+    return conn.execute(
+        f"SELECT {column}, {value} FROM {table} "
+        f"WHERE database = ? AND metric = ? AND key = ? AND {column} >= ? AND {column} <= ? ORDER BY {column}",
+        (database, metric, key, since or 0, until if until is not None else 2 ** 62),
+    ).fetchall()
+
+
+def trends(conn, database, metric, since=None, until=None, tier='raw', stat='avg'):
+    """{key: [(time, value)]} of every key of one metric of database, oldest first."""
+    table, column, value = _series_columns(tier, stat)
+    series = {}
+    for key, at, v in conn.execute(
+        f"SELECT key, {column}, {value} FROM {table} "
+        f"WHERE database = ? AND metric = ? AND {column} >= ? AND {column} <= ? ORDER BY key, {column}",
+        (database, metric, since or 0, until if until is not None else 2 ** 62),
+    ):
+        series.setdefault(key, []).append((at, v))
+    return series
+
+
+def runs(conn, database=None):
+    """[(database, run_at)] of the runs in the store, oldest first."""
+    if database is None:
+        return conn.execute("SELECT database, run_at FROM runs ORDER BY run_at, database").fetchall()
+    return conn.execute(
+        "SELECT database, run_at FROM runs WHERE database = ? ORDER BY run_at", (database,)
+    ).fetchall()
+
+
+def store_state(conn, database):
+    """(runs, newest run_at, newest ingested_at, last prune) of database; changes whenever its history does."""
+    return conn.execute(
+        "SELECT COUNT(*), MAX(run_at), MAX(ingested_at), "
+        "(SELECT done_at FROM maintenance WHERE task = 'prune') FROM runs WHERE database = ?",
+        (database,),
+    ).fetchone()
+
+
+def top_keys(conn, database, metric, since, until, limit, tier='raw'):
+    """Keys of metric with the largest sums between since and until, largest first."""
+    table, column, _ = _series_columns(tier, 'avg')
+    total = "value" if column == "run_at" else "total"
+    return [key for key, in conn.execute(
+        f"SELECT key FROM {table} WHERE database = ? AND metric = ? AND {column} >= ? AND {column} <= ? "
+        f"GROUP BY key ORDER BY SUM({total}) DESC, key LIMIT ?",
+        (database, metric, since, until, limit),
+    )]
+
+
+def mark_done(conn, task, at=None):
+    conn.execute(
+        "INSERT OR REPLACE INTO maintenance (task, done_at) VALUES (?, ?)",
+        (task, int(time.time() if at is None else at)),
+    )
+
+
+def last_done(conn, task):
+    row = conn.execute("SELECT done_at FROM maintenance WHERE task = ?", (task,)).fetchone()
+    return row[0] if row else None
+
+
+def _databases(conn, table):
+    """The databases in table, one index seek each rather than a scan of the table."""
+    return [database for database, in conn.execute(
+        f"WITH RECURSIVE databases(database) AS ("
+        f"SELECT MIN(database) FROM {table} UNION ALL "
+        f"SELECT (SELECT MIN(database) FROM {table} WHERE database > databases.database) "
+        f"FROM databases WHERE database IS NOT NULL"
+        f") SELECT database FROM databases WHERE database IS NOT NULL"
+    )]
+
+
+def prune(conn, now=None):
+    """Delete what the store holds beyond HISTORY_RETENTION; returns {tier or table: rows deleted}.
+
+    Each tier is cut at its own retention. runs follow the raw samples,
+    except that a database's newest run is kept: the trend windows end at
+    it. A statement's sql_text goes once no sample of any tier is keyed on
+    it.
+    """
+    now = int(time.time() if now is None else now)
+    deleted = {}
+    with conn:
+        for tier, (table, bucket) in TIERS.items():
+            days = settings.HISTORY_RETENTION.get(tier)
+            if days is None:
+                continue
+            column = "run_at" if bucket is None else "bucket"
+            cutoff = now - days * 86400
+            # One database at a time, so each delete is a range of its by-time index.
+            deleted[tier] = sum(
+                conn.execute(f"DELETE FROM {table} WHERE database = ? AND {column} < ?", (database, cutoff)).rowcount
+                for database in _databases(conn, table)
+            )
+        days = settings.HISTORY_RETENTION.get('raw')
+        if days is not None:
+            cutoff = now - days * 86400
+            deleted['runs'] = sum(
+                conn.execute(
+                    "DELETE FROM runs WHERE database = ? AND run_at < ? "
+                    "AND run_at < (SELECT MAX(run_at) FROM runs WHERE database = ?)",
+                    (database, cutoff, database),
+                ).rowcount
+                for database in _databases(conn, 'runs')
+            )
+        referenced = " OR ".join(
+            f"EXISTS (SELECT 1 FROM {table} WHERE database = sql_text.database "
+            f"AND metric = '{attr}.{name}' AND key = sql_text.sql_id)"
+            for table, _ in TIERS.values() for attr, metrics in SQL_METRICS.items() for name in metrics
+        )
+        deleted['sql_text'] = conn.execute(f"DELETE FROM sql_text WHERE NOT ({referenced})").rowcount
+        mark_done(conn, 'prune', now)
+    return deleted
+
+
+def maintain(conn, now=None, vacuum=None):
+    """Prune every tier, and VACUUM if vacuum is true or (None) HISTORY_VACUUM_INTERVAL days have passed.
+
+    The first maintenance of a store written before the rollups existed
+    builds them from its raw samples.
+
+    Returns ({tier or table: rows deleted}, whether the file was vacuumed).
+    """
+    now = int(time.time() if now is None else now)
+    if last_done(conn, 'rollups') is None:
+        # A store written before the rollups existed: fold its raw samples in once.
+        with conn:
+            rebuild_rollups(conn)
+            mark_done(conn, 'rollups', now)
+    deleted = prune(conn, now)
+    if vacuum is None:
+        last = last_done(conn, 'vacuum')
+        if last is None:
+            # Count the interval from the first maintenance.
+            with conn:
+                mark_done(conn, 'vacuum', now)
+            vacuum = False
+        else:
+            vacuum = now - last >= settings.HISTORY_VACUUM_INTERVAL * 86400
+    if vacuum:
+        # Returns the pages freed by pruning to the file system; not inside a transaction.
+        conn.execute("VACUUM")
+        with conn:
+            mark_done(conn, 'vacuum', now)
+    return deleted, bool(vacuum)
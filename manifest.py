@@ -0,0 +1,141 @@
+"""
+Content-hash manifest of a collection directory.
+
+Each collection run rewrites every spool file in output_csv/, although
+most of them (charset, dbservices, dbprofile, createtime, ...) come out
+identical to the last run. manifest.json beside the spool files records the
+SHA-256, size and mtime of every .csv file, and which hashes each step of
+the pipeline (the derive scripts, ingest_history, ...) last processed, so
+a step can skip the files that did not change for it:
+
+    manifest = Manifest(csv_dir)
+    manifest.scan()
+    for filename in manifest.changed('my_step'):
+        ...
+    manifest.processed('my_step')
+    manifest.save()
+
+scan() only hashes the files whose size or mtime differ from the manifest.
+A file rewritten with the same content is not reported as changed; the
+manifest takes its new mtime and leaves the file alone. The report pages
+key on (path, mtime_ns, size), not on these hashes, so such a rewrite
+still invalidates their caches. write_if_changed() does not rewrite a
+derived file whose content is unchanged, so its mtime (and whatever is
+keyed on it) stays as it was.
+
+No Django here: the derive scripts run on their own.
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = "manifest.json"
+HASH_CHUNK = 1 << 20
+
+
+def content_hash(path):
+    """Hex SHA-256 of the file at path."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _replace(path, content):
+    """Write content (bytes) to path atomically."""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path, content):
+    """Write content (str or bytes) to path unless it already holds it; True if it was written.
+
+    An unchanged file keeps its mtime, so nothing keyed on it is invalidated.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    _replace(path, content)
+    return True
+
+
+class Manifest:
+    """The manifest of csv_dir.
+
+    files maps a .csv file name to its sha256, size and mtime_ns; seen maps
+    a pipeline step to {file name: sha256} as that step last processed them.
+    """
+
+    def __init__(self, csv_dir):
+        self.csv_dir = csv_dir
+        self.path = os.path.join(csv_dir, MANIFEST_FILE)
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.files = data.get('files', {})
+        self.seen = data.get('seen', {})
+
+    def scan(self):
+        """Bring files up to date with csv_dir; returns the names whose content changed."""
+        files = {}
+        changed = set()
+        with os.scandir(self.csv_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.csv') or not entry.is_file():
+                    continue
+                st = entry.stat()
+                old = self.files.get(entry.name)
+                if old is not None and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                    files[entry.name] = old
+                    continue
+                sha256 = content_hash(entry.path)
+                files[entry.name] = {'sha256': sha256, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+                if old is None or old['sha256'] != sha256:
+                    changed.add(entry.name)
+        changed.update(set(self.files) - set(files))
+        self.files = files
+        return changed
+
+    def changed(self, step, filenames=None):
+        """Names (of filenames, default: every file) whose content differs from what step last processed.
+
+        Files added or removed since then count as changed.
+        """
+        seen = self.seen.get(step, {})
+        if filenames is None:
+            filenames = set(self.files) | set(seen)
+        return {
+            filename for filename in filenames
+            if (self.files[filename]['sha256'] if filename in self.files else None) != seen.get(filename)
+        }
+
+    def processed(self, step, filenames=None):
+        """Record that step has processed the current content of filenames (default: every file)."""
+        seen = self.seen.setdefault(step, {})
+        if filenames is None:
+            filenames = set(self.files) | set(seen)
+        for filename in filenames:
+            if filename in self.files:
+                seen[filename] = self.files[filename]['sha256']
+            else:
+                seen.pop(filename, None)
+
+    def save(self):
+        _replace(self.path, json.dumps({'files': self.files, 'seen': self.seen}, indent=1, sort_keys=True).encode())
@@ -7,19 +7,32 @@ It reads your real Oracle monitoring data and creates the files with the expecte
 """
 
 import os
-import shutil
-import pandas as pd
 from pathlib import Path
 
+from manifest import Manifest, write_if_changed
+
+# Pipeline step name in the manifest (see manifest.py)
+MANIFEST_STEP = "map_csv_files"
+
 def create_mapped_csv_files(source_dir="output_csv"):
     """
     Maps existing CSV files to the expected format for the Django application
+
+    A mapping is skipped when its source file has the same content as the
+    last time this ran (see manifest.py) and its target exists; targets are
+    only rewritten when their content changes.
     """
     
     print(f"Mapping CSV files from {source_dir}...")
-    
+    manifest = Manifest(source_dir)
+    manifest.scan()
+    changed = manifest.changed(MANIFEST_STEP)
+
+    def needed(source, target):
+        return source in changed or not os.path.exists(os.path.join(source_dir, target))
+
     # Database name mapping
-    if os.path.exists(os.path.join(source_dir, "dbname_id.csv")):
+    if os.path.exists(os.path.join(source_dir, "dbname_id.csv")) and needed("dbname_id.csv", "V_DB_NAME.csv"):
         with open(os.path.join(source_dir, "dbname_id.csv"), 'r') as f:
             content = f.read().strip()
             if ',' in content:
@@ -27,12 +40,11 @@ def create_mapped_csv_files(source_dir="output_csv"):
             else:
                 db_name = content
         
-        with open(os.path.join(source_dir, "V_DB_NAME.csv"), 'w') as f:
-            f.write(db_name)
-        print("✓ Created V_DB_NAME.csv")
+        if write_if_changed(os.path.join(source_dir, "V_DB_NAME.csv"), db_name):
+            print("✓ Created V_DB_NAME.csv")
     
     # Version mapping
-    if os.path.exists(os.path.join(source_dir, "dbversion.csv")):
+    if os.path.exists(os.path.join(source_dir, "dbversion.csv")) and needed("dbversion.csv", "V_VERSION.csv"):
         with open(os.path.join(source_dir, "dbversion.csv"), 'r') as f:
             lines = f.readlines()
             # Extract version from the lines - look for "Version X.X.X.X.X" pattern
@@ -46,26 +58,25 @@ def create_mapped_csv_files(source_dir="output_csv"):
                             break
                     break
         
-        with open(os.path.join(source_dir, "V_VERSION.csv"), 'w') as f:
-            f.write(version)
-        print("✓ Created V_VERSION.csv")
+        if write_if_changed(os.path.join(source_dir, "V_VERSION.csv"), version):
+            print("✓ Created V_VERSION.csv")
     
     # SGA mapping (already in MB)
-    if os.path.exists(os.path.join(source_dir, "sga_info.csv")):
-        shutil.copy(os.path.join(source_dir, "sga_info.csv"), 
-                   os.path.join(source_dir, "V_SGA_MB.csv"))
-        print("✓ Created V_SGA_MB.csv")
+    if os.path.exists(os.path.join(source_dir, "sga_info.csv")) and needed("sga_info.csv", "V_SGA_MB.csv"):
+        with open(os.path.join(source_dir, "sga_info.csv"), 'rb') as f:
+            content = f.read()
+        if write_if_changed(os.path.join(source_dir, "V_SGA_MB.csv"), content):
+            print("✓ Created V_SGA_MB.csv")
     
     # PGA mapping
-    if os.path.exists(os.path.join(source_dir, "pga_info.csv")):
+    if os.path.exists(os.path.join(source_dir, "pga_info.csv")) and needed("pga_info.csv", "V_PGA_MB.csv"):
         with open(os.path.join(source_dir, "pga_info.csv"), 'r') as f:
             content = f.read().strip()
             if not content:
                 content = "1024"  # default value
         
-        with open(os.path.join(source_dir, "V_PGA_MB.csv"), 'w') as f:
-            f.write(content)
-        print("✓ Created V_PGA_MB.csv")
+        if write_if_changed(os.path.join(source_dir, "V_PGA_MB.csv"), content):
+            print("✓ Created V_PGA_MB.csv")
     
     # Create default values for missing files
     default_files = {
@@ -95,24 +106,29 @@ def create_mapped_csv_files(source_dir="output_csv"):
             print(f"✓ Created {filename} with default value")
     
     # Fix tablespace.csv format if needed
-    if os.path.exists(os.path.join(source_dir, "tablespace.csv")):
+    if os.path.exists(os.path.join(source_dir, "tablespace.csv")) and "tablespace.csv" in changed:
         try:
             # Read existing tablespace file and reformat
             with open(os.path.join(source_dir, "tablespace.csv"), 'r') as f:
                 lines = f.readlines()
             
-            # Rewrite in expected format (space-separated)
-            with open(os.path.join(source_dir, "tablespace.csv"), 'w') as f:
-                for line in lines:
-                    if line.strip():
-                        parts = [p.strip() for p in line.split(',')]
-                        if len(parts) >= 3:
-                            # Format: name used_mb free_mb
-                            name = parts[0].strip()
-                            used_mb = parts[1].strip()
-                            free_mb = parts[2].strip()
-                            f.write(f"{name} {used_mb} {free_mb}\n")
-            print("✓ Reformatted tablespace.csv")
+            # Rewrite in expected format (space-separated); lines already
+            # in that format are kept, so running this twice is harmless
+            reformatted = []
+            for line in lines:
+                if line.strip():
+                    if ',' not in line:
+                        reformatted.append(line.rstrip('\n') + "\n")
+                        continue
+                    parts = [p.strip() for p in line.split(',')]
+                    if len(parts) >= 3:
+                        # Format: name used_mb free_mb
+                        name = parts[0].strip()
+                        used_mb = parts[1].strip()
+                        free_mb = parts[2].strip()
+                        reformatted.append(f"{name} {used_mb} {free_mb}\n")
+            if write_if_changed(os.path.join(source_dir, "tablespace.csv"), "".join(reformatted)):
+                print("✓ Reformatted tablespace.csv")
         except Exception as e:
             print(f"Warning: Could not reformat tablespace.csv: {e}")
     
@@ -162,6 +178,11 @@ another.remote.com
             f.write(sample_dblinks)
         print("✓ Created dblinks.csv")
     
+    # Record what was mapped, derived files included, for the next run
+    manifest.scan()
+    manifest.processed(MANIFEST_STEP)
+    manifest.save()
+    
     print(f"\n🎉 CSV file mapping completed!")
     print(f"All required files are now available for the Django application.")
     print(f"You can now access all features of your Oracle monitoring dashboard.")
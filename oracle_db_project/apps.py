@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class OracleDbProjectConfig(AppConfig):
+    name = 'oracle_db_project'
+
+    def ready(self):
+        from vendor_assets import check_vendor_assets
+        checks.register(check_vendor_assets, checks.Tags.staticfiles)
@@ -0,0 +1,18 @@
+"""
+ASGI config for report project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The report views are async, so under an ASGI server one process can keep
+serving while other requests wait on a slow output_csv/ mount.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oracle_db_project.settings')
+
+application = get_asgi_application()
@@ -0,0 +1,60 @@
+import os
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from vendor_assets import VENDOR_ASSETS, referenced_files
+
+
+class Command(BaseCommand):
+    # It is what clears the vendor warning (report.W001), so need not report it.
+    requires_system_checks = []
+
+    help = (
+        "Download the pinned third-party browser libraries (chart.js, "
+        "vis-network, font-awesome) into static/vendor/ so the report pages "
+        "do not depend on a CDN. Run collectstatic afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*',
+                            help=f"Libraries to fetch: {', '.join(sorted(VENDOR_ASSETS))} (default: all).")
+        parser.add_argument('--force', action='store_true',
+                            help="Download files that are already present again.")
+        parser.add_argument('--timeout', type=float, default=30.0,
+                            help="Seconds to wait for each download (default: 30).")
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(VENDOR_ASSETS)
+        if unknown:
+            raise CommandError(f"Unknown libraries: {', '.join(sorted(unknown))}")
+        static_dir = settings.STATICFILES_DIRS[0]
+        for name in options['names'] or sorted(VENDOR_ASSETS):
+            asset = VENDOR_ASSETS[name]
+            pending = [asset.entry]
+            seen = set(pending)
+            while pending:
+                filename = pending.pop()
+                path = os.path.join(static_dir, asset.static_path(filename))
+                if os.path.exists(path) and not options['force']:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                else:
+                    content = self.download(asset.base_url + filename, options['timeout'])
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(content)
+                    self.stdout.write(f"{asset.static_path(filename)} ({len(content):,} bytes)")
+                for ref in referenced_files(filename, content):
+                    if ref not in seen:
+                        seen.add(ref)
+                        pending.append(ref)
+            self.stdout.write(self.style.SUCCESS(f"{name}: {len(seen)} files in {static_dir}"))
+
+    def download(self, url, timeout):
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return response.read()
+        except OSError as e:
+            raise CommandError(f"Could not download {url}: {e}")
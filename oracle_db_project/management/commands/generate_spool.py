@@ -0,0 +1,53 @@
+import os
+import time
+from dataclasses import fields, replace
+
+from django.core.management.base import BaseCommand, CommandError
+
+from synthetic_spool import Scale, write_collection
+
+
+class Command(BaseCommand):
+    # Does not serve the pages, so skips the vendor warning (report.W001).
+    requires_system_checks = []
+
+    help = (
+        "Write a synthetic collection run, every spool file the reports read "
+        "and the large datafile and SQL spools, at a configurable scale. "
+        "Point ORACLE_REPORT_CSV_DIR at the directory to serve it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_dir', help="Directory to write the spool files to (created if missing).")
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help="Multiply the default counts by this factor (default: 1).")
+        defaults = Scale()
+        for field in fields(Scale):
+            scaled = "" if field.name == 'archival_days' else " times --scale"
+            parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, dest=field.name,
+                                help=f"Number of {field.name.replace('_', ' ')} "
+                                     f"(default: {getattr(defaults, field.name)}{scaled}).")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Random seed; the same seed writes the same files (default: 0).")
+        parser.add_argument('--db-name', default="SYNTHDB", help="Database name to report (default: SYNTHDB).")
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError("--scale must be positive")
+        counts = {field.name: options[field.name] for field in fields(Scale) if options[field.name] is not None}
+        if any(count < 1 for count in counts.values()):
+            raise CommandError("counts must be at least 1")
+        scale = replace(Scale().times(options['scale']), **counts)
+        csv_dir = os.path.abspath(options['csv_dir'])
+        if os.path.exists(csv_dir) and not os.path.isdir(csv_dir):
+            raise CommandError(f"{csv_dir} is not a directory")
+
+        started = time.perf_counter()
+        written = write_collection(csv_dir, scale, seed=options['seed'], db_name=options['db_name'])
+        elapsed = time.perf_counter() - started
+        size = sum(os.path.getsize(os.path.join(csv_dir, filename)) for filename in written)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(written)} spool files to {csv_dir} ({size:,} bytes) in {elapsed:.1f} s"
+        ))
+        self.stdout.write(", ".join(f"{field.name} {getattr(scale, field.name)}" for field in fields(Scale)))
@@ -0,0 +1,118 @@
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fleet import discover, fleet_dir
+from history import (
+    STREAMED_FILES, connect, directory_database_name, has_run, history_path, ingest_run, maintain, repeat_run,
+    run_time,
+)
+from manifest import Manifest
+from snapshot import CSV_DIR, SOURCE_FILES, directory_fingerprint, load_snapshot
+
+# Every file a run's samples are read from
+INGESTED_FILES = SOURCE_FILES + STREAMED_FILES
+
+
+class Command(BaseCommand):
+    # Does not serve the pages, so skips the vendor warning (report.W001).
+    requires_system_checks = []
+
+    help = (
+        "Append the collection run in an output_csv/ directory to the history "
+        "store (HISTORY_DB), one transaction per run. Run it after every "
+        "collection run; a run already in the store is skipped. A run whose "
+        "spool files have the same content as at the last ingest (see "
+        "manifest.py) is recorded with the previous run's samples, without "
+        "parsing it. Afterwards the store is pruned to HISTORY_RETENTION, "
+        "and VACUUMed when that is due."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv-dir', default=CSV_DIR,
+                            help="Collection directory to ingest (default: output_csv/).")
+        parser.add_argument('--database',
+                            help="Name to store the run under (default: the run's V_DB_NAME, "
+                                 "or the directory name when that is missing).")
+        parser.add_argument('--fleet', action='store_true',
+                            help="Ingest every database under FLEET_DIR instead, each under its fleet name.")
+        parser.add_argument('--run-at',
+                            help="Collection time, ISO 8601 or Unix seconds "
+                                 "(default: the newest spool file's mtime).")
+        parser.add_argument('--history-db', help="History store to write (default: HISTORY_DB).")
+        parser.add_argument('--force', action='store_true',
+                            help="Parse and ingest the run even if its spool files did not change since the last ingest.")
+        parser.add_argument('--no-maintenance', action='store_true',
+                            help="Skip pruning and VACUUM, e.g. while back-filling many runs.")
+
+    def handle(self, *args, **options):
+        run_at = self.parse_run_at(options['run_at'])
+        if options['fleet']:
+            if options['database']:
+                raise CommandError("--database cannot be combined with --fleet")
+            jobs = list(discover(fleet_dir()).items())
+            if not jobs:
+                raise CommandError(f"no collection directories under {fleet_dir()}")
+        else:
+            csv_dir = os.path.abspath(options['csv_dir'])
+            if not os.path.isdir(csv_dir):
+                raise CommandError(f"{csv_dir} is not a directory")
+            jobs = [(options['database'], csv_dir)]
+
+        path = options['history_db'] or history_path()
+        # What this store last ingested from each directory
+        step = f"ingest_history:{os.path.abspath(path)}"
+        conn = connect(path)
+        try:
+            for database, csv_dir in jobs:
+                started = time.perf_counter()
+                database = database or directory_database_name(csv_dir)
+                at = run_at if run_at is not None else run_time(directory_fingerprint(csv_dir))
+                if has_run(conn, database, at):
+                    self.stdout.write(f"{database}: run already in {path}, skipped")
+                    continue
+                manifest = Manifest(csv_dir)
+                manifest.scan()
+                written = None
+                if not options['force'] and not manifest.changed(step, INGESTED_FILES):
+                    written = repeat_run(conn, database, at)
+                    how = "copied from the previous run (spool files unchanged)"
+                if written is None:
+                    written = ingest_run(conn, database, load_snapshot(csv_dir), at)
+                    how = "written"
+                manifest.processed(step, INGESTED_FILES)
+                manifest.save()
+                elapsed = 1000 * (time.perf_counter() - started)
+                if written is None:
+                    self.stdout.write(f"{database}: run already in {path}, skipped")
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{database}: {written:,} samples {how} to {path} in {elapsed:.1f} ms"
+                    ))
+            if not options['no_maintenance']:
+                report_maintenance(self.stdout, *maintain(conn))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def parse_run_at(value):
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return int(datetime.fromisoformat(value).timestamp())
+        except ValueError:
+            raise CommandError(f"--run-at {value!r} is neither ISO 8601 nor Unix seconds")
+
+
+def report_maintenance(stdout, deleted, vacuumed):
+    pruned = ", ".join(f"{rows:,} {tier}" for tier, rows in deleted.items() if rows)
+    if pruned:
+        stdout.write(f"Pruned rows past retention: {pruned}")
+    if vacuumed:
+        stdout.write("Vacuumed the history store")
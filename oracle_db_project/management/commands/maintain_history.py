@@ -0,0 +1,38 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from history import connect, history_path, maintain
+from oracle_db_project.management.commands.ingest_history import report_maintenance
+
+
+class Command(BaseCommand):
+    # Does not serve the pages, so skips the vendor warning (report.W001).
+    requires_system_checks = []
+
+    help = (
+        "Prune the history store to HISTORY_RETENTION and VACUUM it when "
+        "HISTORY_VACUUM_INTERVAL has passed. ingest_history does this after "
+        "every ingest; schedule this command when runs are ingested rarely."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vacuum', action='store_true', help="VACUUM now, whether it is due or not.")
+        parser.add_argument('--history-db', help="History store to maintain (default: HISTORY_DB).")
+
+    def handle(self, *args, **options):
+        path = options['history_db'] or history_path()
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist; ingest a run first")
+        before = os.path.getsize(path)
+        started = time.perf_counter()
+        conn = connect(path)
+        try:
+            report_maintenance(self.stdout, *maintain(conn, vacuum=True if options['vacuum'] else None))
+        finally:
+            conn.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Maintained {path} in {time.perf_counter() - started:.1f} s "
+            f"({before:,} -> {os.path.getsize(path):,} bytes)"
+        ))
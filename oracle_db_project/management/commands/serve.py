@@ -0,0 +1,64 @@
+import logging
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from prefork import PreforkServer
+from snapshot import CSV_DIR
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the reports with pre-forked worker processes that share the "
+        "snapshot of output_csv/ loaded before forking. New workers replace "
+        "the old ones when a collection run lands or on SIGHUP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('addrport', nargs='?', default='127.0.0.1:8007',
+                            help="Address and port to listen on (default: 127.0.0.1:8007).")
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'SERVE_WORKERS', None),
+                            help="Worker processes (default: SERVE_WORKERS, else one per CPU).")
+        parser.add_argument('--threads', type=int, default=getattr(settings, 'SERVE_THREADS', 8),
+                            help="Request threads per worker (default: SERVE_THREADS, else 8).")
+        parser.add_argument('--no-watch', action='store_true',
+                            help="Do not watch the collection directory; reload only on SIGHUP.")
+        parser.add_argument('--stop-timeout', type=float, default=30.0,
+                            help="Seconds a worker may take to finish its requests before it is killed (default: 30).")
+
+    def handle(self, *args, **options):
+        if not hasattr(os, 'fork'):
+            raise CommandError("serve needs os.fork(); use runserver or an ASGI server on this platform")
+        host, sep, port = options['addrport'].rpartition(':')
+        if not sep:
+            host, port = '127.0.0.1', options['addrport']
+        if not port.isdigit():
+            raise CommandError(f"{options['addrport']!r} is not a valid port or address:port")
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        if options['threads'] < 1:
+            raise CommandError("--threads must be at least 1")
+        if not os.path.isdir(CSV_DIR):
+            raise CommandError(f"{CSV_DIR} is not a directory")
+
+        # Django logs its own errors; only the server's loggers need a handler.
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(process)d] %(levelname)s %(message)s"))
+        for name in ('prefork', 'snapshot_watcher', 'shared_snapshot'):
+            logger = logging.getLogger(name)
+            logger.addHandler(handler)
+            logger.setLevel(logging.DEBUG if options['verbosity'] > 1 else logging.INFO)
+        from oracle_db_project.wsgi import application
+
+        server = PreforkServer(
+            application, (host.strip('[]') or '0.0.0.0', int(port)),
+            workers=options['workers'],
+            threads=options['threads'],
+            watch=not options['no_watch'],
+            stop_timeout=options['stop_timeout'],
+        )
+        try:
+            server.run()
+        except OSError as e:
+            raise CommandError(f"Could not serve on {options['addrport']}: {e}")
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'oracle_db_project',
 ]
 
 MIDDLEWARE = [
@@ -69,6 +71,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'oracle_db_project.wsgi.application'
+ASGI_APPLICATION = 'oracle_db_project.asgi.application'
 
 
 # Database
@@ -117,6 +120,102 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+# `python app.py collectstatic` copies static/ here with content-hashed
+# names and a .gz beside each compressible file; views.static_file serves
+# them with long-lived caching headers.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'oracle_db_project.storage.PrecompressedManifestStaticFilesStorage',
+    },
+}
+
+# Collection directory the reports are built from. ORACLE_REPORT_CSV_DIR
+# overrides it, e.g. to point a benchmark or load test at generated data.
+CSV_DIR = os.environ.get('ORACLE_REPORT_CSV_DIR') or str(BASE_DIR / 'output_csv')
+
+# Parsed output_csv files are cached in-process until the file changes.
+# See parse_cache.py.
+CSV_PARSE_CACHE_MAX_ENTRIES = 512
+CSV_PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Threads used to stat and parse spool files concurrently when a snapshot
+# is (re)built. 0 or 1 reads them one after another.
+CSV_INGEST_WORKERS = 8
+
+# Background refresh of the parsed snapshot when spool files change
+# (see snapshot_watcher.py). 'auto' uses inotify and falls back to polling;
+# use 'poll' when output_csv/ is on NFS. None re-checks on every request.
+SNAPSHOT_WATCHER = 'auto'
+SNAPSHOT_WATCHER_DEBOUNCE = 2.0
+SNAPSHOT_WATCHER_MAX_DELAY = 30.0
+SNAPSHOT_WATCHER_POLL_INTERVAL = 5.0
+
+# With several worker processes, parse each collection run in one of them
+# and share it with the others through memory-mapped segments in
+# SNAPSHOT_SHARED_DIR (None: /dev/shm). See shared_snapshot.py.
+SNAPSHOT_SHARED = False
+SNAPSHOT_SHARED_DIR = None
+
+# `python app.py serve` (see prefork.py): worker processes forked from the
+# warmed snapshot (None: one per CPU) and request threads in each.
+SERVE_WORKERS = None
+SERVE_THREADS = 8
+
+# Fleet mode (see fleet.py): each subdirectory of FLEET_DIR (default: CSV_DIR;
+# ORACLE_REPORT_FLEET_DIR overrides it) is one database, served under
+# /db/<name>/ and ranked on /db/. Changed databases are re-ingested on
+# FLEET_INGEST_PROCESSES processes (None: one per CPU) at most every
+# FLEET_REFRESH_INTERVAL seconds.
+FLEET_DIR = os.environ.get('ORACLE_REPORT_FLEET_DIR') or None
+FLEET_INGEST_PROCESSES = None
+FLEET_REFRESH_INTERVAL = 30.0
+# Parsed snapshots each process keeps of the databases it last served; the
+# rest are mapped from their snapshot.bin again when requested. 0: no limit.
+SNAPSHOT_CACHE_MAX_DIRS = 16
+
+# History store (see history.py): `python app.py ingest_history` appends
+# each collection run's metrics to this SQLite file (ORACLE_REPORT_HISTORY_DB
+# overrides it), kept apart from db.sqlite3.
+HISTORY_DB = os.environ.get('ORACLE_REPORT_HISTORY_DB') or BASE_DIR / 'history.sqlite3'
+# Trend charts read it: the window shown unless ?window= asks for another
+# ('24h', '7d', '12w'), and the points each series is downsampled to.
+HISTORY_TREND_WINDOW = '24h'
+HISTORY_TREND_POINTS = 300
+# Days each tier of the store is kept (None: forever): raw samples, and the
+# hourly and daily min/avg/max rollups built as runs are ingested. The file
+# is VACUUMed every HISTORY_VACUUM_INTERVAL days.
+HISTORY_RETENTION = {'raw': 7, 'hourly': 90, 'daily': None}
+HISTORY_VACUUM_INTERVAL = 7
+
+# The 'reports' cache holds what views.py builds from a collection run:
+# rendered pages (cached_render), composite scores, the chart datasets'
+# JSON bodies and the top-10 tables rendered through {% report_cache %}
+# (fragment_context). Entries are keyed by the fingerprints of the spool
+# files behind them, so a new collection run simply stops hitting the old
+# ones; fleet databases get their own partitions (fleet.cache_partition).
+# Use a shared backend (memcached, redis) to share renders between worker
+# processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reports': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'reports',
+        'TIMEOUT': 6 * 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 500},
+    },
+}
+REPORT_CACHE_ALIAS = 'reports'
+
+# Compiled snapshot written by `python app.py compile_snapshot` into the
+# collection directory; used instead of the spool files while it is current.
+SNAPSHOT_BINARY_NAME = 'snapshot.bin'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -0,0 +1,37 @@
+"""
+Static files storage: content-hashed names plus a gzipped copy of each
+compressible file, written once by collectstatic.
+
+Hashed names never change content, so views.static_file serves them with a
+one-year immutable Cache-Control. It sends the .gz copy to clients that
+accept gzip, so nothing is compressed per request.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg', '.txt', '.ttf', '.eot')
+MIN_COMPRESS_SIZE = 256
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.write_gzipped(name)
+
+    def write_gzipped(self, name):
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        # mtime=0 so re-running collectstatic leaves unchanged files byte-identical
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < len(content):
+            with open(self.path(name) + '.gz', 'wb') as f:
+                f.write(compressed)
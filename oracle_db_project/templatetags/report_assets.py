@@ -0,0 +1,8 @@
+from django import template
+
+from vendor_assets import vendor_url
+
+register = template.Library()
+
+# {% vendor_url 'chart.js' %}: see vendor_assets.py
+register.simple_tag(vendor_url, name='vendor_url')
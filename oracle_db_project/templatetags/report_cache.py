@@ -0,0 +1,41 @@
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+from django.templatetags.cache import CacheNode
+
+register = template.Library()
+
+
+class ReportCacheNode(CacheNode):
+    """{% cache %} into the cache object in the context's fragment_cache.
+
+    {% cache ... using= %} only takes an alias from settings.CACHES, which
+    the per-database partitions of the report cache are not (see
+    fleet.cache_partition()).
+    """
+
+    def render(self, context):
+        cache = context['fragment_cache']
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        cache_key = make_template_fragment_key(self.fragment_name, vary_on)
+        value = cache.get(cache_key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(cache_key, value, int(self.expire_time_var.resolve(context)))
+        return value
+
+
+@register.tag('report_cache')
+def do_report_cache(parser, token):
+    """{% report_cache timeout fragment_name [vary_on ...] %} ... {% endreport_cache %}"""
+    nodelist = parser.parse(('endreport_cache',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 3:
+        raise template.TemplateSyntaxError(f"'{tokens[0]}' tag requires at least 2 arguments.")
+    return ReportCacheNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        [parser.compile_filter(token) for token in tokens[3:]],
+        None,
+    )
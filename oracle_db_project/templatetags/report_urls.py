@@ -0,0 +1,13 @@
+from django import template
+from django.urls import reverse
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def report_url(context, name, *args):
+    """{% report_url 'health_check' %}: the URL of a report page, under /db/<name>/ on a fleet database's pages."""
+    db = context.get('fleet_db')
+    if db:
+        return reverse(f'db_{name}', args=[db, *args])
+    return reverse(name, args=args)
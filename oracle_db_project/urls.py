@@ -14,6 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 import sys
@@ -33,4 +34,14 @@ urlpatterns = [
     path('health/', views.health_check, name='health_check'),
     path('wait_event_summary/', views.wait_event_summary, name='wait_event_summary'),
     path('top-10/', views.top_10_checklists, name='top_10_checklists'),
+    path('api/<slug:name>/', views.report_dataset, name='report_dataset'),
+    # Fleet mode: the same pages for each database under FLEET_DIR (see fleet.py)
+    path('db/', views.fleet_overview, name='fleet_overview'),
+    path('db/<slug:db>/', views.summary_report, name='db_summary_report'),
+    path('db/<slug:db>/health/', views.health_check, name='db_health_check'),
+    path('db/<slug:db>/wait_event_summary/', views.wait_event_summary, name='db_wait_event_summary'),
+    path('db/<slug:db>/top-10/', views.top_10_checklists, name='db_top_10_checklists'),
+    path('db/<slug:db>/api/<slug:name>/', views.report_dataset, name='db_report_dataset'),
+    # runserver serves static/ itself under DEBUG; this covers ASGI servers
+    path(settings.STATIC_URL.lstrip('/') + '<path:path>', views.static_file, name='static_file'),
 ]
\ No newline at end of file
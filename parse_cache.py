@@ -0,0 +1,151 @@
+"""
+Process-wide cache of parsed output_csv spool files.
+
+The collection job only rewrites the spool files once per run, so every
+parsed structure is remembered together with the (path, mtime_ns, size)
+fingerprint of the file it came from. A lookup whose fingerprint still
+matches returns the stored structure without opening the file; anything
+else is re-parsed and replaces the old entry.
+
+Entries are evicted least-recently-used first once either the entry count
+or the estimated memory budget is exceeded. Cached values are shared by
+every request, so callers must treat them as read-only.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from records import Record
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def file_fingerprint(filepath):
+    """Return (path, mtime_ns, size) for filepath, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (filepath, st.st_mtime_ns, st.st_size)
+
+
+def _slot_values(obj):
+    """Values of obj's __slots__ fields, those of its base classes included."""
+    if isinstance(obj, Record):
+        return obj._fields(obj)
+    names = []
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return [getattr(obj, name) for name in names if hasattr(obj, name)]
+
+
+def estimate_size(value):
+    """Rough deep size in bytes of a parsed structure (containers, records, scalars).
+
+    The fields of __slots__ records are walked like container items, and an
+    object reachable twice (a shared owner string, say) is counted once.
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(type(obj), '__slots__'):
+            stack.extend(_slot_values(obj))
+    return size
+
+
+class ParseCache:
+    """LRU map of (parser, path) -> (fingerprint, parsed value, estimated bytes)."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, filepath, parser):
+        fingerprint = file_fingerprint(filepath)
+        if fingerprint is None:
+            # Missing or unreadable files are cheap to "parse" and have no
+            # stable identity, so let the parser produce its default.
+            return parser(filepath)
+
+        key = (parser.__module__, parser.__qualname__, filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = parser(filepath)
+        cost = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if cost <= self.max_bytes:
+                self._entries[key] = (fingerprint, value, cost)
+                self._bytes += cost
+                self._evict()
+        return value
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, _, cost) = self._entries.popitem(last=False)
+            self._bytes -= cost
+
+    def reset_lock(self):
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+parse_cache = ParseCache(
+    max_entries=getattr(settings, "CSV_PARSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+    max_bytes=getattr(settings, "CSV_PARSE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+)
+
+if hasattr(os, 'register_at_fork'):
+    # The entries are inherited; a lock held by a parent thread is not released.
+    os.register_at_fork(after_in_child=parse_cache.reset_lock)
+
+
+def cached_parse(filepath, parser):
+    """Return parser(filepath), reusing the previous result while the file is unchanged."""
+    return parse_cache.get(filepath, parser)
@@ -0,0 +1,249 @@
+"""
+Pre-forking HTTP server behind ``python app.py serve``.
+
+The master process loads the snapshot of output_csv/ before it forks its
+workers, so every worker starts with the parsed collection in memory and
+shares those pages with the master copy-on-write. Each worker serves the
+WSGI application from oracle_db_project.wsgi on the listening socket it
+inherited, using a bounded number of request threads.
+
+Workers keep the snapshot they were forked with. The master watches
+output_csv/ (see snapshot_watcher.py). When a new collection run has been
+parsed, or on SIGHUP, it forks a fresh generation of workers from the
+updated snapshot. It then sends the old workers SIGTERM, and they finish
+their in-flight requests before exiting. Both generations accept on the
+same socket, so no connection is refused during a reload. SIGTERM or
+SIGINT stop the whole server the same way.
+"""
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django import db
+
+import snapshot as snapshots
+from snapshot_watcher import hold_snapshot, start_watcher
+
+logger = logging.getLogger(__name__)
+
+# A worker that exits sooner than this after being forked is restarted
+# only after the same delay, so a broken deployment does not fork-loop.
+MIN_WORKER_LIFETIME = 1.0
+
+
+class RequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class WorkerServer(socketserver.ThreadingMixIn, WSGIServer):
+    """WSGI server of one worker, accepting on the listening socket inherited from the master."""
+
+    # server_close() then waits for the requests still being handled.
+    daemon_threads = False
+
+    def __init__(self, listener, app, threads):
+        super().__init__(listener.getsockname()[:2], RequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listener
+        host, port = listener.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.set_app(app)
+        self._slots = threading.BoundedSemaphore(threads)
+
+    def get_request(self):
+        # The listening socket is non-blocking, since every worker waits on
+        # it and only one of them wins each connection.
+        conn, addr = self.socket.accept()
+        conn.setblocking(True)
+        return conn, addr
+
+    def process_request(self, request, client_address):
+        # With all threads busy, stop accepting and leave the connection to
+        # another worker.
+        self._slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
+class PreforkServer:
+    def __init__(self, app, address, csv_dir=snapshots.CSV_DIR, workers=None, threads=8,
+                 watch=True, stop_timeout=30.0):
+        self.app = app
+        self.address = address
+        self.csv_dir = csv_dir
+        self.worker_count = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.watch = watch
+        self.stop_timeout = stop_timeout
+        self.listener = None
+        self.workers = {}   # pid -> fork time, current generation
+        self.retiring = {}  # pid -> time it was asked to stop
+        self._wakeup = threading.Event()
+        self._reload = False
+        self._stopping = False
+
+    # --- master ---
+
+    def run(self):
+        self.listener = socket.create_server(self.address, backlog=1024)
+        self.listener.setblocking(False)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        if self.watch:
+            start_watcher(self.csv_dir, on_refresh=self._snapshot_refreshed)
+        self.warm()
+        logger.info("Listening on http://%s:%s with %d workers x %d threads",
+                    *self.listener.getsockname()[:2], self.worker_count, self.threads)
+        self.spawn_workers()
+        try:
+            while not self._stopping:
+                self._wakeup.wait(1.0)
+                self._wakeup.clear()
+                self.reap_workers()
+                if self._reload and not self._stopping:
+                    self._reload = False
+                    self.reload()
+                self.kill_stragglers()
+        finally:
+            self.stop()
+
+    def warm(self):
+        started = time.perf_counter()
+        snapshot = snapshots.get_snapshot(self.csv_dir)
+        logger.info("Loaded snapshot of %s (%d spool files) in %.1f ms", self.csv_dir,
+                    len(snapshot.present), 1000 * (time.perf_counter() - started))
+
+    def reload(self):
+        """Replace every worker with one forked from the current snapshot."""
+        self.warm()
+        old = self.workers
+        self.workers = {}
+        self.spawn_workers()
+        now = time.monotonic()
+        for pid in old:
+            self._signal(pid, signal.SIGTERM)
+            self.retiring[pid] = now
+        logger.info("Reloaded: %d new workers, %d retiring", len(self.workers), len(old))
+
+    def spawn_workers(self):
+        while len(self.workers) < self.worker_count:
+            self.workers[self.fork_worker()] = time.monotonic()
+
+    def fork_worker(self):
+        # Connections are per process and must not be shared with children.
+        db.connections.close_all()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self.run_worker()
+                status = 0
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+            finally:
+                os._exit(status)
+        return pid
+
+    def reap_workers(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.retiring.pop(pid, None)
+            forked = self.workers.pop(pid, None)
+            if forked is None or self._stopping:
+                continue
+            logger.warning("Worker %d exited unexpectedly (status %d); restarting", pid, status)
+            if time.monotonic() - forked < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self.spawn_workers()
+
+    def kill_stragglers(self):
+        now = time.monotonic()
+        for pid, since in list(self.retiring.items()):
+            if now - since > self.stop_timeout:
+                logger.warning("Worker %d did not stop within %.0fs; killing it", pid, self.stop_timeout)
+                self._signal(pid, signal.SIGKILL)
+                self.retiring[pid] = float('inf')
+
+    def stop(self):
+        self._stopping = True
+        now = time.monotonic()
+        for pid in self.workers:
+            self._signal(pid, signal.SIGTERM)
+            self.retiring[pid] = now
+        self.workers = {}
+        deadline = now + self.stop_timeout
+        while self.retiring and time.monotonic() < deadline:
+            self.reap_workers()
+            time.sleep(0.1)
+        for pid in self.retiring:
+            self._signal(pid, signal.SIGKILL)
+        self.reap_workers()
+        self.listener.close()
+        watcher = snapshots._watchers.get(self.csv_dir)
+        if watcher is not None:
+            watcher.stop()
+
+    def _signal(self, pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+        self._wakeup.set()
+
+    def _handle_reload(self, signum, frame):
+        self._reload = True
+        self._wakeup.set()
+
+    def _snapshot_refreshed(self, snapshot):
+        # Called on the watcher thread; the main loop does the forking.
+        self._reload = True
+        self._wakeup.set()
+
+    # --- worker ---
+
+    def run_worker(self):
+        # The master decides when workers stop: SIGINT from a terminal
+        # reaches the whole process group, so leave it to the master.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        hold_snapshot(self.csv_dir)
+        server = WorkerServer(self.listener, self.app, self.threads)
+
+        def shutdown(signum, frame):
+            # shutdown() waits for serve_forever() to return, so it cannot
+            # run on the thread that is inside it.
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            server.serve_forever(poll_interval=0.5)
+        finally:
+            server.server_close()
@@ -0,0 +1,286 @@
+"""
+Typed rows parsed from the output_csv spool files.
+
+Every record uses __slots__ so a snapshot holding thousands of SQL
+statements or datafiles does not pay for a per-row __dict__.
+"""
+from operator import attrgetter
+
+
+class Record:
+    """Base of the record types.
+
+    Each subclass spells out its own __init__: parsers build records by the
+    million during lock storms, and assigning the slots directly is about
+    three times faster than the setattr loop here.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__slots__:
+            getter = attrgetter(*cls.__slots__)
+            cls._fields = staticmethod(getter if len(cls.__slots__) > 1 else lambda record: (getter(record),))
+
+    @staticmethod
+    def _fields(record):
+        return tuple(getattr(record, name) for name in record.__slots__)
+
+    def __iter__(self):
+        return iter(self._fields(self))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._fields(self) == other._fields(other)
+
+    def __hash__(self):
+        return hash(self._fields(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self):
+        return self._fields(self)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class SummaryValue(Record):
+    __slots__ = ('label', 'value')
+
+    def __init__(self, label, value):
+        self.label = label
+        self.value = value
+
+
+class Tablespace(Record):
+    __slots__ = ('name', 'free_mb')
+
+    def __init__(self, name, free_mb):
+        self.name = name
+        self.free_mb = free_mb
+
+
+class AsmGroup(Record):
+    """usage is None when error ("Invalid number" / "Missing value") is set."""
+    __slots__ = ('name', 'usage', 'error')
+
+    def __init__(self, name, usage, error):
+        self.name = name
+        self.usage = usage
+        self.error = error
+
+
+class ModifiedTable(Record):
+    """counts is (insert, update, delete, total); name is None for malformed rows."""
+    __slots__ = ('name', 'counts')
+
+    def __init__(self, name, counts):
+        self.name = name
+        self.counts = counts
+
+
+class ManagerStatus(Record):
+    __slots__ = ('label', 'status')
+
+    def __init__(self, label, status):
+        self.label = label
+        self.status = status
+
+
+class WaitEvent(Record):
+    __slots__ = ('name', 'count')
+
+    def __init__(self, name, count):
+        self.name = name
+        self.count = count
+
+
+class BlockingSession(Record):
+    """One row of blocking_sessions.csv.
+
+    wait_type/wait_count come from columns 5 and 7 and blocked_count from
+    column 8; either count is None when the row is too short or not numeric.
+    """
+    __slots__ = ('sid', 'wait_type', 'wait_count', 'blocked_count')
+
+    def __init__(self, sid, wait_type, wait_count, blocked_count):
+        self.sid = sid
+        self.wait_type = wait_type
+        self.wait_count = wait_count
+        self.blocked_count = blocked_count
+
+
+class BlockingEdge(Record):
+    __slots__ = ('blocker', 'blocked')
+
+    def __init__(self, blocker, blocked):
+        self.blocker = blocker
+        self.blocked = blocked
+
+
+class CpuSql(Record):
+    __slots__ = ('sql_id', 'owner', 'cpu_time', 'elapsed_time', 'rows_processed', 'sql_text')
+
+    def __init__(self, sql_id, owner, cpu_time, elapsed_time, rows_processed, sql_text):
+        self.sql_id = sql_id
+        self.owner = owner
+        self.cpu_time = cpu_time
+        self.elapsed_time = elapsed_time
+        self.rows_processed = rows_processed
+        self.sql_text = sql_text
+
+    def as_dict(self):
+        return {
+            "SQL_ID": self.sql_id,
+            "OWNER": self.owner,
+            "CPU_TIME": self.cpu_time,
+            "ELAPSED_TIME": self.elapsed_time,
+            "ROWS_PROCESSED": self.rows_processed,
+            "SQL_TEXT": self.sql_text,
+        }
+
+
+class IoSql(Record):
+    __slots__ = ('sql_id', 'owner', 'executions', 'disk_reads', 'buffer_gets',
+                 'read_per_exec', 'gets_per_exec', 'sql_text')
+
+    def __init__(self, sql_id, owner, executions, disk_reads, buffer_gets, read_per_exec,
+                 gets_per_exec, sql_text):
+        self.sql_id = sql_id
+        self.owner = owner
+        self.executions = executions
+        self.disk_reads = disk_reads
+        self.buffer_gets = buffer_gets
+        self.read_per_exec = read_per_exec
+        self.gets_per_exec = gets_per_exec
+        self.sql_text = sql_text
+
+    def as_dict(self):
+        return {
+            "SQL_ID": self.sql_id,
+            "OWNER": self.owner,
+            "EXECUTIONS": self.executions,
+            "DISK_READS": self.disk_reads,
+            "BUFFER_GETS": self.buffer_gets,
+            "READ_PER_EXEC": self.read_per_exec,
+            "GETS_PER_EXEC": self.gets_per_exec,
+            "SQL_TEXT": self.sql_text,
+        }
+
+
+class FragmentedTable(Record):
+    __slots__ = ('owner', 'table_name', 'blocks', 'num_of_rows', 'avg_row_len', 'approx_unused_mb')
+
+    def __init__(self, owner, table_name, blocks, num_of_rows, avg_row_len, approx_unused_mb):
+        self.owner = owner
+        self.table_name = table_name
+        self.blocks = blocks
+        self.num_of_rows = num_of_rows
+        self.avg_row_len = avg_row_len
+        self.approx_unused_mb = approx_unused_mb
+
+
+class DbLink(Record):
+    __slots__ = ('owner', 'dblink', 'username', 'host', 'created', 'hidden',
+                 'shared_interval', 'valid', 'intra_cdb')
+
+    def __init__(self, owner, dblink, username, host, created, hidden, shared_interval, valid,
+                 intra_cdb):
+        self.owner = owner
+        self.dblink = dblink
+        self.username = username
+        self.host = host
+        self.created = created
+        self.hidden = hidden
+        self.shared_interval = shared_interval
+        self.valid = valid
+        self.intra_cdb = intra_cdb
+
+
+class DatafileIo(Record):
+    """disk_io_contention.csv: reads/writes per datafile and total block I/Os."""
+    __slots__ = ('name', 'phys_reads', 'read_pct', 'phys_writes', 'write_pct', 'block_ios')
+
+    def __init__(self, name, phys_reads, read_pct, phys_writes, write_pct, block_ios):
+        self.name = name
+        self.phys_reads = phys_reads
+        self.read_pct = read_pct
+        self.phys_writes = phys_writes
+        self.write_pct = write_pct
+        self.block_ios = block_ios
+
+
+class DbStructureFile(Record):
+    """dbstructure.csv entry; kind is 'controlfile', 'logfile' or 'datafile'.
+
+    number is the log group# for log files and the file id for datafiles.
+    """
+    __slots__ = ('kind', 'number', 'name', 'size_mb', 'status', 'tablespace')
+
+    def __init__(self, kind, number, name, size_mb, status, tablespace):
+        self.kind = kind
+        self.number = number
+        self.name = name
+        self.size_mb = size_mb
+        self.status = status
+        self.tablespace = tablespace
+
+
+class IoUsageSql(Record):
+    """io_usage_sql.csv statement, reassembled from its v$sqltext pieces."""
+    __slots__ = ('sql_text', 'disk_reads', 'executions', 'ratio', 'username')
+
+    def __init__(self, sql_text, disk_reads, executions, ratio, username):
+        self.sql_text = sql_text
+        self.disk_reads = disk_reads
+        self.executions = executions
+        self.ratio = ratio
+        self.username = username
+
+
+class TopSql(Record):
+    """Statements of a top-SQL spool file ranked while it was parsed.
+
+    top maps a metric (a record attribute such as 'cpu_time') to its
+    highest-ranked records, largest first; totals maps a metric to its sum
+    over every statement in the file, ranked or not.
+    """
+    __slots__ = ('statements', 'totals', 'top')
+
+    def __init__(self, statements, totals, top):
+        self.statements = statements
+        self.totals = totals
+        self.top = top
+
+    def ranking(self, metric):
+        return self.top.get(metric, ())
+
+    def total(self, metric):
+        return self.totals.get(metric, 0)
+
+
+class FleetDatabase(Record):
+    """One database of the fleet overview (see fleet.py).
+
+    scores maps a section name to its score; score and emoji are the
+    composite shown on its pages. collected_at is the newest spool file's
+    mtime in ns, None when the directory holds none of them.
+    """
+    __slots__ = ('name', 'db_name', 'fingerprint', 'scores', 'score', 'emoji', 'collected_at', 'errors')
+
+    def __init__(self, name, db_name, fingerprint, scores, score, emoji, collected_at, errors):
+        self.name = name
+        self.db_name = db_name
+        self.fingerprint = fingerprint
+        self.scores = scores
+        self.score = score
+        self.emoji = emoji
+        self.collected_at = collected_at
+        self.errors = errors
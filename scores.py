@@ -0,0 +1,263 @@
+"""
+Section scores of the four report pages.
+
+Each section scores the snapshot attributes it lists, and the page shows a
+composite of all four sections. Everything here is a pure function of one
+snapshot, so the composite is the same for every user and needs no
+session state. views.py caches it per snapshot version.
+"""
+from snapshot import (
+    CACHE_RATIO_FILES, OBJECT_COUNT_FILES, UNUSABLE_INDEX_FILES, BLOCKING_SESSIONS_FILE,
+)
+
+# name -> (snapshot attributes, section(snapshot) -> (score, template context))
+SECTIONS = {}
+
+
+def section(name, attrs):
+    def register(build):
+        SECTIONS[name] = (tuple(attrs), build)
+        return build
+    return register
+
+
+def score_attrs():
+    """Snapshot attributes the composite score depends on."""
+    return sorted(set(attr for attrs, _ in SECTIONS.values() for attr in attrs))
+
+
+def section_scores(snapshot):
+    return {name: build(snapshot)[0] for name, (_, build) in SECTIONS.items()}
+
+
+def display_score(scores):
+    """Composite percentage shown on every page, and its thumbs up/down emoji."""
+    total_score = sum(scores.values())
+    if total_score == 0:
+        display = 0
+    elif total_score < 1000:
+        display = round((total_score / 1000) * 100, 2)
+    else:
+        display = round((total_score / 10000) * 100, 2)
+    return display, "\U0001F44E" if display < 50 else "\U0001F44D"
+
+
+def _count(value):
+    """int of a count spool file's value; None when it is missing ("NA") or not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@section('summary', ['summary'])
+def summary_section(snapshot):
+    v_score = 0
+    summary_data = []
+    for item in snapshot.summary:
+        summary_data.append(item)
+        v_score += 1
+    return v_score, {"summary_data": summary_data}
+
+
+@section('health', [
+    'cache_ratios', 'object_counts', 'unusable_indexes', 'asm_groups',
+    'modified_tables', 'manager_statuses', 'tablespaces', 'archivals',
+])
+def health_section(snapshot):
+    v_score = 0
+    pass_items = []
+    warn_items = []
+
+    # Cache ratios
+    for label in CACHE_RATIO_FILES:
+        value = snapshot.cache_ratios[label]
+        if value is None:
+            warn_items.append((label, "Invalid or missing"))
+        elif value < 90:
+            warn_items.append((label, f"{value:.2f}%"))
+        else:
+            pass_items.append((label, f"{value:.2f}%"))
+            v_score += 5
+
+    for label in OBJECT_COUNT_FILES:
+        value = snapshot.object_counts[label]
+        if _count(value) is None:
+            warn_items.append((label, "Invalid or missing"))
+        elif int(value) > 1000:
+            warn_items.append((label, value))
+        else:
+            pass_items.append((label, value))
+            v_score += 5
+
+    for label in UNUSABLE_INDEX_FILES:
+        value = snapshot.unusable_indexes[label]
+        if _count(value) is None:
+            warn_items.append((label, "Invalid or missing"))
+        elif int(value) > 0:
+            warn_items.append((label, value))
+        else:
+            pass_items.append((label, value))
+            v_score += 5
+
+    # ASM Disk Group
+    label = "ASM Disk Groups"
+    if "asm_diskgroup_usage.csv" in snapshot.errors:
+        warn_items.append((label, f"Error: {snapshot.errors['asm_diskgroup_usage.csv']}"))
+    for group in snapshot.asm_groups:
+        if group.error:
+            warn_items.append((f"{label} - {group.name}", group.error))
+        elif group.usage > 90:
+            warn_items.append((f"{label} - {group.name}", f"{group.usage:.2f}%"))
+        else:
+            pass_items.append((f"{label} - {group.name}", f"{group.usage:.2f}%"))
+            v_score += 6
+
+    # Most Modified Table
+    if "most_modified_table.csv" in snapshot.errors:
+        warn_items.append(("Modification Alert", f"Error reading most_modified_table.csv: {snapshot.errors['most_modified_table.csv']}"))
+    for table in snapshot.modified_tables:
+        if table.name is None:
+            warn_items.append(("Modification Alert", "Invalid row format in most_modified_table.csv"))
+        elif table.counts is None:
+            warn_items.append(("Modification Alert", f"Invalid number format for {table.name}"))
+        else:
+            insert, update, delete, total = table.counts
+            summary = (
+                f"Most Modified Table: {table.name} "
+                f"(Insert: {insert:,} , Update: {update:,} , Delete: {delete:,} , Total: {total:,})"
+            )
+            warn_items.append(("Modification Alert", summary))
+
+    # Transaction Manager Status Check
+    if "cost_inv_managers.csv" in snapshot.errors:
+        warn_items.append(("Transaction Manager Status", f"Error: {snapshot.errors['cost_inv_managers.csv']}"))
+    for manager in snapshot.manager_statuses:
+        if manager.status == "inactive":
+            warn_items.append((manager.label, "Inactive"))
+        elif manager.status == "active":
+            pass_items.append((manager.label, "Active"))
+            v_score += 1
+        else:
+            warn_items.append((manager.label, f"Unknown status: {manager.status}"))
+
+    # Tablespaces (charted from /api/tablespaces/)
+    for tablespace in snapshot.tablespaces:
+        free = tablespace.free_mb
+        if free <=10:
+            v_score += 2
+        elif free <= 30:
+            v_score += 5
+        elif free >= 90:
+            v_score += 10   
+        else:
+            v_score += 20
+
+    # Archival generation (charted from /api/archivals/)
+    archival_score = 0
+    for date, values in snapshot.archivals.items():
+        if len(values) < 24:
+            continue
+        total = sum(values)
+        if total < 100:
+            archival_score += 20
+        elif total < 300:
+            archival_score += 10
+        elif total < 1000:
+            archival_score += 15
+        else:
+            archival_score += 5
+    v_score += archival_score
+    return v_score, {"pass_items": pass_items, "warn_items": warn_items}
+
+
+@section('wait', ['wait_events', 'has_waiting_locks', 'blocking', 'lock_edges'])
+def wait_section(snapshot):
+    v_score = 0
+    # The charts and the blocking network are fetched from /api/ (see
+    # datasets.py); the page only decides which of them to show. The wait
+    # trend comes from the history store and is always shown.
+    generate_blocking_graph = False
+    has_blocking_graph = False
+    has_locking_graph = False
+
+    if not snapshot.has_file("waiting_blocking_locks.csv"):
+        v_score += 5
+    # blocking_sessions.csv feeds both the blocking chart and the blocking graph
+    if snapshot.has_file(BLOCKING_SESSIONS_FILE):
+        generate_blocking_graph = snapshot.blocking_sessions is not None
+        has_blocking_graph = bool(snapshot.blocking_edges)
+    else:
+        # No blocking chart and no blocking graph
+        v_score += 10
+    # Locking Sessions Graph (sessions_locks.csv)
+    if snapshot.has_file("sessions_locks.csv"):
+        has_locking_graph = bool(snapshot.lock_edges)
+    else:
+        v_score += 5
+    return v_score, {
+        "has_wait_events": bool(snapshot.wait_events),
+        "generate_blocking_graph": generate_blocking_graph,
+        "has_blocking_graph": has_blocking_graph,
+        "has_locking_graph": has_locking_graph,
+    }
+
+
+@section('checklist', ['fragmented_tables', 'cpu_sql', 'io_sql', 'dblinks'])
+def checklist_section(snapshot):
+    v_score = 0
+    v_frag_pct = 0
+    v_total_frag_score = 0
+    v_total_cpu_time = 0
+    v_total_disk_reads = 0
+    # Fragmented tables - exactly as in trail.py (listed from /api/fragmented_tables/)
+    for rec in snapshot.fragmented_tables:
+        if rec.blocks > 0:
+            v_frag_pct = ((rec.approx_unused_mb*1024*1024) / (rec.blocks * 8192))*100
+            if v_frag_pct < 10:
+                v_total_frag_score = v_total_frag_score + 1.5
+            elif v_frag_pct < 30:
+                v_total_frag_score = v_total_frag_score + 1.0
+            else:
+                v_total_frag_score = v_total_frag_score + 0.5
+    
+    if v_total_frag_score > 15:
+        v_score += 15
+
+
+
+    # Top 10 CPU consuming queries - exactly as in trail.py
+    # Ranked and totalled while the file was parsed (see topk.py); the CPU
+    # score covers every statement in the file, not just the top ten.
+    cpu_queries = [rec.as_dict() for rec in snapshot.cpu_sql.ranking('cpu_time')]
+    v_total_cpu_time = snapshot.cpu_sql.total('cpu_time') + snapshot.cpu_sql.total('elapsed_time')
+    if v_total_cpu_time < 100:
+        v_score += 20
+    elif v_total_cpu_time < 1000:
+        v_score += 10
+    elif v_total_cpu_time < 10000:
+        v_score += 15
+    else:
+        v_score += 5
+
+    # Top 10 IO consuming queries - exactly as in trail.py
+    io_queries = [rec.as_dict() for rec in snapshot.io_sql.ranking('disk_reads')]
+    for rec in io_queries:
+        v_total_disk_reads += rec['DISK_READS'] + rec['BUFFER_GETS']
+    if v_total_disk_reads < 100000:
+        v_score += 20
+    elif v_total_disk_reads < 1000000:
+        v_score += 15
+    elif v_total_disk_reads < 10000000:
+        v_score += 10
+    else:
+        v_score += 5
+
+    # DB Links - exactly as in trail.py
+    cleaned_data = snapshot.dblinks
+    v_score += len(cleaned_data)
+    return v_score, {
+        "cpu_queries": cpu_queries,  # Pass as Python list for template iteration
+        "io_queries": io_queries,  # Pass as Python list for template iteration
+        "dblinks": cleaned_data,
+    }
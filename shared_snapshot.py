@@ -0,0 +1,229 @@
+"""
+One parsed snapshot in shared memory for every worker process on the host.
+
+Without it, each worker process (uvicorn/gunicorn --workers, or the
+workers of ``app.py serve`` after a reload) parses output_csv/ itself and
+keeps its own copy of every record. With SNAPSHOT_SHARED, one process, the
+publisher, parses each collection run and writes it in the compiled format
+of binary_snapshot.py to a segment in SNAPSHOT_SHARED_DIR (/dev/shm, i.e.
+memory, by default). The other processes, followers, memory-map the
+segment and decode records from it only when a view reads them
+(MappedRecords). The parsed data then exists once in RAM, however many
+workers there are, and a new run is parsed once.
+
+A control segment holds the generation of the current segment. The
+publisher bumps it after writing a new one. Followers compare it with the
+generation they have mapped on each get_snapshot(), which is one read from
+shared memory. A replaced segment is unlinked at once and its memory is
+freed when the last follower unmaps it.
+
+The publisher is whichever process holds an flock on <prefix>.publisher,
+and it runs the snapshot watcher (see snapshot_watcher.py). If it exits,
+the lock is released and the next follower to retry takes over.
+"""
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from django.conf import settings
+
+import snapshot as snapshots
+from binary_snapshot import read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+GENERATION = struct.Struct('<Q')
+# How often a follower checks whether the publisher is still running.
+PUBLISHER_RETRY_INTERVAL = 5.0
+# How long a follower waits for the first segment before parsing on its own.
+FIRST_PUBLISH_TIMEOUT = 30.0
+
+_segments = {}
+
+
+def shared_dir():
+    directory = getattr(settings, 'SNAPSHOT_SHARED_DIR', None)
+    if directory:
+        return directory
+    return '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class SharedSegment:
+    """Control counter and published segments of one collection directory."""
+
+    def __init__(self, csv_dir, directory=None):
+        self.csv_dir = csv_dir
+        key = hashlib.sha1(os.path.abspath(csv_dir).encode()).hexdigest()[:12]
+        self.prefix = os.path.join(directory or shared_dir(), f"oracle-report-{key}")
+        fd = os.open(f"{self.prefix}.ctl", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < GENERATION.size:
+                os.ftruncate(fd, GENERATION.size)
+            self._control = mmap.mmap(fd, GENERATION.size)
+        finally:
+            os.close(fd)
+        self._publisher_fd = None
+
+    def generation(self):
+        """Generation of the current segment; 0 until one is published."""
+        return GENERATION.unpack_from(self._control)[0]
+
+    def segment_path(self, generation):
+        return f"{self.prefix}.{generation}.bin"
+
+    @property
+    def is_publisher(self):
+        return self._publisher_fd is not None
+
+    def claim_publisher(self):
+        """Become the publisher unless another process is; True if this process now is."""
+        if self._publisher_fd is not None:
+            return True
+        fd = os.open(f"{self.prefix}.publisher", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._publisher_fd = fd
+        return True
+
+    def release_publisher(self):
+        if self._publisher_fd is not None:
+            os.close(self._publisher_fd)
+            self._publisher_fd = None
+
+    def publish(self, snapshot):
+        """Write snapshot as the next generation and return it mapped from there."""
+        previous = self.generation()
+        generation = previous + 1
+        path = write_snapshot(snapshot, self.segment_path(generation))
+        GENERATION.pack_into(self._control, 0, generation)
+        if previous:
+            try:
+                os.unlink(self.segment_path(previous))
+            except FileNotFoundError:
+                pass
+        logger.info("Published snapshot of %s as generation %d (%d bytes)",
+                    self.csv_dir, generation, os.path.getsize(path))
+        return read_snapshot(path, self.csv_dir, lazy=True)
+
+    def attach(self, fingerprint=None):
+        """(generation, mapped snapshot) currently published, or (0, None) if there is none.
+
+        With fingerprint, a published snapshot of other spool files counts
+        as none.
+        """
+        while True:
+            generation = self.generation()
+            if not generation:
+                return 0, None
+            try:
+                snapshot = read_snapshot(self.segment_path(generation), self.csv_dir, fingerprint, lazy=True)
+            except FileNotFoundError:
+                if self.generation() != generation:
+                    continue  # replaced while we opened it
+                raise
+            return (generation, snapshot) if snapshot is not None else (0, None)
+
+
+class SnapshotFollower:
+    """Stands in for a watcher in a process that maps the snapshot another process publishes."""
+
+    def __init__(self, segment):
+        self.segment = segment
+        self.csv_dir = segment.csv_dir
+        self._mapped = (0, None)
+        self._next_claim = time.monotonic() + PUBLISHER_RETRY_INTERVAL
+
+    def is_alive(self):
+        return True
+
+    def stop(self):
+        pass
+
+    def current(self):
+        """The published snapshot, remapped when its generation has changed."""
+        now = time.monotonic()
+        if now >= self._next_claim:
+            self._next_claim = now + PUBLISHER_RETRY_INTERVAL
+            if self.segment.claim_publisher():
+                logger.warning("Snapshot publisher for %s has gone; taking over", self.csv_dir)
+                return _start_publishing(self.segment)
+        generation, snapshot = self._mapped
+        if generation != self.segment.generation():
+            try:
+                self._mapped = generation, snapshot = self.segment.attach()
+            except (OSError, ValueError, KeyError):
+                logger.exception("Could not map the published snapshot of %s", self.csv_dir)
+        return snapshot
+
+
+def _segment(csv_dir):
+    segment = _segments.get(csv_dir)
+    if segment is None:
+        segment = _segments[csv_dir] = SharedSegment(csv_dir)
+    return segment
+
+
+def _start_publishing(segment):
+    """Make this process csv_dir's publisher: watch the spool files and publish every refresh."""
+    from snapshot_watcher import start_watcher
+
+    csv_dir = segment.csv_dir
+    with snapshots._snapshots_lock:
+        snapshots._publishers[csv_dir] = segment.publish
+        if isinstance(snapshots._watchers.get(csv_dir), SnapshotFollower):
+            del snapshots._watchers[csv_dir]
+    start_watcher(csv_dir)
+
+    fingerprint = snapshots.directory_fingerprint(csv_dir)
+    with snapshots._snapshots_lock:
+        try:
+            _, snapshot = segment.attach(fingerprint)
+        except (OSError, ValueError, KeyError):
+            snapshot = None
+        if snapshot is None:
+            # Not published yet, or published from older spool files (e.g.
+            # before a restart): this run is parsed here, once.
+            snapshot = segment.publish(snapshots.load_snapshot(csv_dir, fingerprint))
+        snapshots._keep_snapshot(csv_dir, snapshot)
+    return snapshot
+
+
+def shared_snapshot(csv_dir):
+    """Publish or follow csv_dir's shared snapshot from now on; returns the current snapshot."""
+    segment = _segment(csv_dir)
+    if segment.claim_publisher():
+        return _start_publishing(segment)
+    with snapshots._snapshots_lock:
+        follower = snapshots._watchers.get(csv_dir)
+        if not isinstance(follower, SnapshotFollower):
+            follower = snapshots._watchers[csv_dir] = SnapshotFollower(segment)
+    deadline = time.monotonic() + FIRST_PUBLISH_TIMEOUT
+    snapshot = follower.current()
+    while snapshot is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+        snapshot = follower.current()
+    if snapshot is None:
+        logger.warning("Nothing published for %s yet; parsing it in this process", csv_dir)
+        snapshot = snapshots.load_snapshot(csv_dir)
+    return snapshot
+
+
+def _release_inherited():
+    # A forked child shares its parent's publisher lock; the parent stays
+    # the publisher and the child follows it.
+    for csv_dir, segment in _segments.items():
+        if segment.is_publisher:
+            segment.release_publisher()
+            snapshots._publishers.pop(csv_dir, None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_release_inherited)
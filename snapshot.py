@@ -0,0 +1,421 @@
+"""
+One collection run of output_csv/ parsed into typed record collections.
+
+All four report views read from the same Snapshot instead of opening the
+spool files themselves. A snapshot is rebuilt only when the fingerprint of
+its source files changes, and the rebuild goes through parse_cache, so only
+the files that were actually rewritten are parsed again. With a watcher
+running (snapshot_watcher.py) the rebuild happens in the background and
+requests never touch the files at all.
+
+Files are stat'ed and parsed on a small thread pool (CSV_INGEST_WORKERS)
+and assembled in their fixed order afterwards, so on an NFS-mounted
+output_csv/ a rebuild costs roughly the slowest file rather than the sum
+of all of them.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+
+from parse_cache import cached_parse, file_fingerprint
+from records import SummaryValue, TopSql
+from spool_parsers import (
+    clean_and_read_value, extract_ratio_value, parse_asm_diskgroups,
+    parse_most_modified_tables, parse_manager_statuses, parse_tablespaces,
+    parse_archivals, parse_wait_events, has_content, parse_blocking_sessions,
+    parse_session_lock_edges, parse_fragmented_tables, parse_cpu_queries,
+    parse_io_queries, parse_dblinks,
+)
+
+CSV_DIR = getattr(settings, 'CSV_DIR', None) or os.path.join(settings.BASE_DIR, "output_csv")
+
+SUMMARY_FILES = {
+    "Db Name": "V_DB_NAME.csv",
+    "Version": "V_VERSION.csv",
+    "Nodes": "V_NODES.csv",
+    "Db Status": "V_DB_status.csv",
+    "Db Role": "V_DB_ROLE.csv",
+    "Db Archival Status": "v_db_archival_status.csv",
+    "Total Active Sessions": "v_total_active_sessions.csv",
+    "Pdb Size Gb": "V_PDB_SIZE_GB.csv",
+    "Cdb Size Gb": "V_CDB_SIZE_GB.csv",
+    "Location": "V_LOCATION.csv",
+    "Timezone": "V_TIMEZONE.csv",
+    "Last Reboot": "V_LAST_REBOOT.csv",
+    "Sga Mb": "V_SGA_MB.csv",
+    "Pga Mb": "V_PGA_MB.csv",
+    "Last Gather Run": "v_last_gather_run.csv"
+}
+CACHE_RATIO_FILES = {
+    "Buffer Cache Hit Ratio": "buff_cache_hit_ratio.csv",
+    "Library Cache Hit Ratio": "lib_hit_ratio.csv"
+}
+OBJECT_COUNT_FILES = {
+    "Invalid Objects": "invalid_object_count.csv",
+    "Stale Tables": "stale_table_count.csv"
+}
+UNUSABLE_INDEX_FILES = {
+    "Unusable Indexes": "unusable_indexes.csv"
+}
+
+# attribute -> (spool file, parser, value used when the file cannot be read)
+RECORD_SOURCES = {
+    'asm_groups': ("asm_diskgroup_usage.csv", parse_asm_diskgroups, ()),
+    'modified_tables': ("most_modified_table.csv", parse_most_modified_tables, ()),
+    'manager_statuses': ("cost_inv_managers.csv", parse_manager_statuses, ()),
+    'tablespaces': ("tablespace.csv", parse_tablespaces, ()),
+    'archivals': ("archivals_for_last_2days_per_hour.csv", parse_archivals, {}),
+    'wait_events': ("wait_events.csv", parse_wait_events, ()),
+    'has_waiting_locks': ("waiting_blocking_locks.csv", has_content, False),
+    'lock_edges': ("sessions_locks.csv", parse_session_lock_edges, ()),
+    'fragmented_tables': ("top_10_fragmented_tables.csv", parse_fragmented_tables, ()),
+    'cpu_sql': ("top_10_cpu_consuming_queries.csv", parse_cpu_queries, TopSql(0, {}, {})),
+    'io_sql': ("top_10_io_consuming_queries.csv", parse_io_queries, TopSql(0, {}, {})),
+    'dblinks': ("dblinks.csv", parse_dblinks, ()),
+}
+BLOCKING_SESSIONS_FILE = "blocking_sessions.csv"
+
+# attribute -> spool files it is built from
+ATTRIBUTE_FILES = {
+    'summary': tuple(SUMMARY_FILES.values()),
+    'cache_ratios': tuple(CACHE_RATIO_FILES.values()),
+    'object_counts': tuple(OBJECT_COUNT_FILES.values()),
+    'unusable_indexes': tuple(UNUSABLE_INDEX_FILES.values()),
+    'blocking': (BLOCKING_SESSIONS_FILE,),
+}
+ATTRIBUTE_FILES.update(
+    (attr, (filename,)) for attr, (filename, _, _) in RECORD_SOURCES.items()
+)
+
+SOURCE_FILES = tuple(sorted(set(
+    filename for filenames in ATTRIBUTE_FILES.values() for filename in filenames
+)))
+
+
+_ingest_pool = None
+_ingest_pool_lock = threading.Lock()
+
+
+def _get_ingest_pool():
+    global _ingest_pool
+    workers = getattr(settings, 'CSV_INGEST_WORKERS', 8)
+    if not workers or workers <= 1:
+        return None
+    if _ingest_pool is None:
+        with _ingest_pool_lock:
+            if _ingest_pool is None:
+                _ingest_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="csv-ingest")
+    return _ingest_pool
+
+
+def _reset_ingest_pool():
+    # Worker threads do not survive fork(); a child builds its own pool.
+    global _ingest_pool, _ingest_pool_lock
+    _ingest_pool = None
+    _ingest_pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_ingest_pool)
+
+
+def ingest_map(func, items):
+    """[func(item) for item in items], spread over the ingest pool; results keep items' order."""
+    items = list(items)
+    pool = _get_ingest_pool()
+    if pool is None or len(items) <= 1:
+        return [func(item) for item in items]
+    return list(pool.map(func, items))
+
+
+def directory_fingerprint(csv_dir):
+    """(path, mtime_ns, size) of every source file; None entries for missing files."""
+    return tuple(ingest_map(file_fingerprint, (os.path.join(csv_dir, filename) for filename in SOURCE_FILES)))
+
+
+class Snapshot:
+    """Every spool file the report views use, parsed once per collection run.
+
+    ``errors`` maps a spool file name to the exception raised while parsing
+    it; the matching attribute then holds its empty default. Record
+    collections are shared between requests and must not be mutated.
+    """
+    __slots__ = (
+        'csv_dir', 'fingerprint', 'loaded_at', 'present', 'errors',
+        'summary', 'cache_ratios', 'object_counts', 'unusable_indexes',
+        'blocking_sessions', 'blocking_edges',
+    ) + tuple(RECORD_SOURCES)
+
+    def __init__(self, csv_dir=CSV_DIR, fingerprint=None):
+        if fingerprint is None:
+            fingerprint = directory_fingerprint(csv_dir)
+        self.csv_dir = csv_dir
+        self._set_fingerprint(fingerprint)
+        self.errors = {}
+        self._load(ATTRIBUTE_FILES)
+
+    def updated(self, changed):
+        """Return a copy with only the attributes fed by the changed file names re-parsed.
+
+        Collections built from unchanged files are shared with this snapshot.
+        """
+        changed = set(changed)
+        snapshot = Snapshot.__new__(Snapshot)
+        for attr in Snapshot.__slots__:
+            setattr(snapshot, attr, getattr(self, attr))
+        snapshot.errors = {
+            filename: e for filename, e in self.errors.items() if filename not in changed
+        }
+        snapshot._set_fingerprint(tuple(
+            file_fingerprint(os.path.join(self.csv_dir, filename)) if filename in changed else fp
+            for filename, fp in zip(SOURCE_FILES, self.fingerprint)
+        ))
+        snapshot._load([
+            attr for attr, filenames in ATTRIBUTE_FILES.items() if changed.intersection(filenames)
+        ])
+        return snapshot
+
+    def _set_fingerprint(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.loaded_at = datetime.now()
+        self.present = frozenset(
+            filename for filename, fp in zip(SOURCE_FILES, fingerprint) if fp is not None
+        )
+
+    def _load(self, attrs):
+        """Parse the files behind attrs concurrently, then set the attributes in order."""
+        jobs = [(attr, source) for attr in attrs for source in self._sources(attr)]
+        results = ingest_map(self._parse, [source for _, source in jobs])
+        values = {attr: [] for attr in attrs}
+        for (attr, (filename, _, _)), (value, error) in zip(jobs, results):
+            if error is not None:
+                self.errors[filename] = error
+            values[attr].append(value)
+        for attr in attrs:
+            self._assemble(attr, values[attr])
+
+    @staticmethod
+    def _sources(attr):
+        """(spool file, parser, default) for every file attr is built from."""
+        if attr == 'summary':
+            return [(filename, clean_and_read_value, "NA") for filename in SUMMARY_FILES.values()]
+        if attr == 'cache_ratios':
+            return [(filename, extract_ratio_value, None) for filename in CACHE_RATIO_FILES.values()]
+        if attr == 'object_counts':
+            return [(filename, clean_and_read_value, "NA") for filename in OBJECT_COUNT_FILES.values()]
+        if attr == 'unusable_indexes':
+            return [(filename, clean_and_read_value, "NA") for filename in UNUSABLE_INDEX_FILES.values()]
+        if attr == 'blocking':
+            return [(BLOCKING_SESSIONS_FILE, parse_blocking_sessions, (None, None))]
+        return [RECORD_SOURCES[attr]]
+
+    def _assemble(self, attr, values):
+        if attr == 'summary':
+            self.summary = tuple(
+                SummaryValue(label, value) for label, value in zip(SUMMARY_FILES, values)
+            )
+        elif attr == 'cache_ratios':
+            self.cache_ratios = dict(zip(CACHE_RATIO_FILES, values))
+        elif attr == 'object_counts':
+            self.object_counts = dict(zip(OBJECT_COUNT_FILES, values))
+        elif attr == 'unusable_indexes':
+            self.unusable_indexes = dict(zip(UNUSABLE_INDEX_FILES, values))
+        elif attr == 'blocking':
+            self.blocking_sessions, self.blocking_edges = values[0]
+        else:
+            setattr(self, attr, values[0])
+
+    def _parse(self, source):
+        """(parsed value, None), or (default, exception) if the parser raised."""
+        filename, parser, default = source
+        try:
+            return cached_parse(os.path.join(self.csv_dir, filename), parser), None
+        except Exception as e:
+            return default, e
+
+    def has_file(self, filename):
+        return filename in self.present
+
+    def version(self, *attrs):
+        """Short digest of csv_dir and the fingerprints of the files behind attrs.
+
+        Render caches key on it, so an entry stops matching as soon as one
+        of its spool files is rewritten.
+        """
+        wanted = set(source_files(attrs))
+        stats = [
+            (filename, None if fp is None else fp[1:])
+            for filename, fp in zip(SOURCE_FILES, self.fingerprint) if filename in wanted
+        ]
+        return hashlib.sha1(repr((self.csv_dir, stats)).encode()).hexdigest()[:16]
+
+
+# csv_dir -> Snapshot, least recently used first. Only the directories
+# served without a watcher or publisher (fleet databases) are evicted, so
+# that at most SNAPSHOT_CACHE_MAX_DIRS of them stay parsed in each process.
+_snapshots = OrderedDict()
+_watchers = {}
+# csv_dir -> function publishing a new snapshot to other processes and
+# returning the copy to serve (see shared_snapshot.py)
+_publishers = {}
+_snapshots_lock = threading.Lock()
+# Guards the order of _snapshots only; never held while parsing.
+_recent_lock = threading.Lock()
+
+
+def _reset_snapshots_lock():
+    # A watcher thread in the parent may have held it when fork() ran.
+    global _snapshots_lock, _recent_lock
+    _snapshots_lock = threading.Lock()
+    _recent_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_snapshots_lock)
+
+
+def get_snapshot(csv_dir=CSV_DIR, fingerprint=None):
+    """Return the current Snapshot for csv_dir.
+
+    While a snapshot watcher runs for csv_dir it keeps the snapshot current
+    in the background, so this is a dict lookup. Without one, each call
+    compares the source files' fingerprints and rebuilds on change.
+
+    A caller that already knows the fingerprint of csv_dir's source files
+    (fleet mode, see fleet.py) passes it: then no watcher or shared
+    snapshot is started and nothing is stat'ed.
+    """
+    if fingerprint is None:
+        snapshot = _watched_snapshot(csv_dir)
+        if snapshot is not None:
+            return snapshot
+        if getattr(settings, 'SNAPSHOT_SHARED', False):
+            from shared_snapshot import shared_snapshot
+            return shared_snapshot(csv_dir)
+        if getattr(settings, 'SNAPSHOT_WATCHER', None):
+            from snapshot_watcher import start_watcher
+            start_watcher(csv_dir)
+        fingerprint = directory_fingerprint(csv_dir)
+
+    snapshot = _recent_snapshot(csv_dir, fingerprint)
+    if snapshot is not None:
+        return snapshot
+    with _snapshots_lock:
+        snapshot = _recent_snapshot(csv_dir, fingerprint)
+        if snapshot is None:
+            snapshot = load_snapshot(csv_dir, fingerprint)
+            _keep_snapshot(csv_dir, snapshot)
+    return snapshot
+
+
+async def aget_snapshot(csv_dir=CSV_DIR, fingerprint=None):
+    """get_snapshot() for async views.
+
+    The fingerprint check and any re-parse run in a worker thread, so a
+    slow NFS mount does not stall the event loop; a watched snapshot, or
+    one that matches the given fingerprint, is returned directly.
+    """
+    if fingerprint is None:
+        snapshot = _watched_snapshot(csv_dir)
+    else:
+        snapshot = _recent_snapshot(csv_dir, fingerprint)
+    if snapshot is not None:
+        return snapshot
+    return await asyncio.to_thread(get_snapshot, csv_dir, fingerprint)
+
+
+def _recent_snapshot(csv_dir, fingerprint):
+    """csv_dir's kept snapshot if it has this fingerprint, marked most recently used; else None."""
+    with _recent_lock:
+        snapshot = _snapshots.get(csv_dir)
+        if snapshot is None or snapshot.fingerprint != fingerprint:
+            return None
+        _snapshots.move_to_end(csv_dir)
+        return snapshot
+
+
+def _keep_snapshot(csv_dir, snapshot):
+    """Store csv_dir's snapshot, evicting the least recently used unwatched ones over the limit.
+
+    An evicted fleet database is loaded again from its snapshot.bin, which
+    is memory-mapped rather than parsed, when its pages are next requested.
+    """
+    limit = getattr(settings, 'SNAPSHOT_CACHE_MAX_DIRS', 16)
+    with _recent_lock:
+        _snapshots[csv_dir] = snapshot
+        _snapshots.move_to_end(csv_dir)
+        if not limit:
+            return
+        evictable = [d for d in _snapshots if d not in _watchers and d not in _publishers and d != csv_dir]
+        for other in evictable[:max(0, len(_snapshots) - limit)]:
+            del _snapshots[other]
+
+
+def _watched_snapshot(csv_dir):
+    """The current snapshot if a live watcher keeps it up to date, else None."""
+    watcher = _watchers.get(csv_dir)
+    if watcher is not None and watcher.is_alive():
+        return watcher.current()
+    return None
+
+
+def source_files(attrs):
+    """Sorted names of the spool files the given snapshot attributes are built from."""
+    return tuple(sorted(set(filename for attr in attrs for filename in ATTRIBUTE_FILES[attr])))
+
+
+def files_fingerprint(filenames, csv_dir=CSV_DIR, fingerprint=None):
+    """(filename, mtime_ns, size) per file, None for missing ones, without parsing anything.
+
+    While a watcher keeps csv_dir's snapshot current this reads the
+    snapshot's own fingerprint, so it describes exactly what a view would
+    render. Given the fingerprint of csv_dir's source files it reads that;
+    otherwise the files are stat'ed.
+    """
+    if fingerprint is None:
+        snapshot = _watched_snapshot(csv_dir)
+        if snapshot is not None:
+            fingerprint = snapshot.fingerprint
+    if fingerprint is not None:
+        fingerprint = dict(zip(SOURCE_FILES, fingerprint))
+        stats = [fingerprint.get(filename) for filename in filenames]
+    else:
+        stats = ingest_map(file_fingerprint, [os.path.join(csv_dir, filename) for filename in filenames])
+    return tuple(
+        (filename, None, None) if fp is None else (filename, fp[1], fp[2])
+        for filename, fp in zip(filenames, stats)
+    )
+
+
+async def afiles_fingerprint(filenames, csv_dir=CSV_DIR, fingerprint=None):
+    """files_fingerprint() for async views; stat calls run in a worker thread."""
+    if fingerprint is not None or _watched_snapshot(csv_dir) is not None:
+        return files_fingerprint(filenames, csv_dir, fingerprint)
+    return await asyncio.to_thread(files_fingerprint, filenames, csv_dir)
+
+
+def load_snapshot(csv_dir=CSV_DIR, fingerprint=None):
+    """Build a Snapshot, mapping the compiled snapshot.bin when it matches the spool files."""
+    from binary_snapshot import load_snapshot
+    return load_snapshot(csv_dir, fingerprint)
+
+
+def refresh_snapshot(csv_dir=CSV_DIR, changed=None):
+    """Re-parse the changed spool files (all of them if changed is None) into a new current snapshot."""
+    with _snapshots_lock:
+        current = _snapshots.get(csv_dir)
+        if current is None or changed is None:
+            snapshot = load_snapshot(csv_dir)
+        else:
+            snapshot = current.updated(changed)
+        publish = _publishers.get(csv_dir)
+        if publish is not None:
+            snapshot = publish(snapshot)
+        _keep_snapshot(csv_dir, snapshot)
+    return snapshot
@@ -0,0 +1,202 @@
+"""
+Background refresh of the parsed snapshot when spool files land.
+
+The SQL*Plus job rewrites its spool files one after another, so a watcher
+collects the names of changed files until nothing has changed for
+``debounce`` seconds (or ``max_delay`` seconds have passed since the first
+change) and then re-parses only those files into a new snapshot. Requests
+keep reading the previous snapshot until the new one is swapped in.
+
+Changes are picked up with inotify on Linux. Where inotify is unavailable,
+or when output_csv/ is on NFS (inotify does not see writes made by other
+hosts), the watcher polls the source files' fingerprints instead.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+import snapshot as snapshots
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class InotifyBackend:
+    def __init__(self, csv_dir):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(csv_dir), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {csv_dir}")
+
+    def wait(self, timeout):
+        """Names of files touched within timeout seconds (empty set on timeout)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    def __init__(self, csv_dir, interval, stop_event):
+        self.csv_dir = csv_dir
+        self.interval = interval
+        self.stop_event = stop_event
+        self.fingerprint = snapshots.directory_fingerprint(csv_dir)
+
+    def wait(self, timeout):
+        self.stop_event.wait(min(timeout, self.interval))
+        fingerprint = snapshots.directory_fingerprint(self.csv_dir)
+        changed = {
+            filename
+            for filename, old, new in zip(snapshots.SOURCE_FILES, self.fingerprint, fingerprint)
+            if old != new
+        }
+        self.fingerprint = fingerprint
+        return changed
+
+    def close(self):
+        pass
+
+
+class SnapshotWatcher(threading.Thread):
+    def __init__(self, csv_dir, backend='auto', debounce=2.0, max_delay=30.0,
+                 poll_interval=5.0, on_refresh=None):
+        super().__init__(name=f"snapshot-watcher:{csv_dir}", daemon=True)
+        self.csv_dir = csv_dir
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.on_refresh = on_refresh
+        self._stop_event = threading.Event()
+        # Open the backend before the first snapshot is built so no change
+        # can slip in between building it and starting to watch.
+        self.backend = self._open_backend(backend)
+
+    def _open_backend(self, backend):
+        if backend in ('auto', 'inotify'):
+            try:
+                return InotifyBackend(self.csv_dir)
+            except (OSError, AttributeError, TypeError) as e:
+                if backend == 'inotify':
+                    raise
+                logger.info("inotify unavailable for %s (%s); polling instead", self.csv_dir, e)
+        return PollingBackend(self.csv_dir, self.poll_interval, self._stop_event)
+
+    def run(self):
+        watched = set(snapshots.SOURCE_FILES)
+        pending = set()
+        first_change = last_change = 0.0
+        try:
+            while not self._stop_event.is_set():
+                if pending:
+                    timeout = max(0.0, self.debounce - (time.monotonic() - last_change))
+                else:
+                    timeout = 1.0
+                names = self.backend.wait(timeout) & watched
+                now = time.monotonic()
+                if names:
+                    if not pending:
+                        first_change = now
+                    pending |= names
+                    last_change = now
+                if pending and (now - last_change >= self.debounce or now - first_change >= self.max_delay):
+                    self._refresh(pending)
+                    pending = set()
+        finally:
+            self.backend.close()
+
+    def _refresh(self, changed):
+        try:
+            snapshot = snapshots.refresh_snapshot(self.csv_dir, changed)
+        except Exception:
+            logger.exception("Failed to refresh snapshot for %s", self.csv_dir)
+            return
+        logger.info("Refreshed snapshot for %s: %s", self.csv_dir, ", ".join(sorted(changed)))
+        if self.on_refresh is not None:
+            self.on_refresh(snapshot)
+
+    def current(self):
+        return snapshots._snapshots.get(self.csv_dir)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class HeldSnapshot:
+    """Stands in for a watcher in a process that must keep the snapshot it has.
+
+    Pre-forked workers (see prefork.py) serve the snapshot they were forked
+    with. The master process watches csv_dir and replaces them when a new
+    collection run lands, so they never stat or re-parse the spool files.
+    """
+
+    def __init__(self, csv_dir):
+        self.csv_dir = csv_dir
+
+    def is_alive(self):
+        return True
+
+    def current(self):
+        return snapshots._snapshots.get(self.csv_dir)
+
+    def stop(self):
+        pass
+
+
+def hold_snapshot(csv_dir):
+    """Serve csv_dir's current snapshot as-is from now on in this process."""
+    with snapshots._snapshots_lock:
+        snapshots._watchers[csv_dir] = HeldSnapshot(csv_dir)
+
+
+def start_watcher(csv_dir, **options):
+    """Start (once) the watcher keeping csv_dir's snapshot current; settings supply defaults."""
+    with snapshots._snapshots_lock:
+        watcher = snapshots._watchers.get(csv_dir)
+        if watcher is not None and watcher.is_alive():
+            return watcher
+        backend = getattr(settings, 'SNAPSHOT_WATCHER', 'auto') or 'auto'
+        options.setdefault('backend', backend)
+        options.setdefault('debounce', getattr(settings, 'SNAPSHOT_WATCHER_DEBOUNCE', 2.0))
+        options.setdefault('max_delay', getattr(settings, 'SNAPSHOT_WATCHER_MAX_DELAY', 30.0))
+        options.setdefault('poll_interval', getattr(settings, 'SNAPSHOT_WATCHER_POLL_INTERVAL', 5.0))
+        watcher = SnapshotWatcher(csv_dir, **options)
+        watcher.start()
+        snapshots._watchers[csv_dir] = watcher
+        return watcher
@@ -0,0 +1,530 @@
+import os
+import csv
+import re
+from collections import Counter
+
+from records import (
+    Tablespace, AsmGroup, ModifiedTable, ManagerStatus, WaitEvent,
+    BlockingSession, BlockingEdge, CpuSql, IoSql, FragmentedTable, DbLink,
+    DatafileIo, DbStructureFile, IoUsageSql,
+)
+from topk import rank_statements
+
+# Each parser takes the path of one spool file in output_csv/ and returns
+# records (see records.py) that views can read without touching the file
+# again. Results are shared through parse_cache, so they must not be mutated.
+
+# Every relationship line the blocking/locking queries write, as one
+# alternation so a single search per line (or a single finditer over a
+# chunk) finds whichever kind is present:
+#   SID 101 is blocking status ACTIVE blocking 5     -> blocking_status
+#   SID 101 is blocking the sessions 201             -> blocks_session
+#   enq: TX - row lock contention - SID 101 waiting  -> waiting
+SPOOL_PATTERNS = {
+    'relationship': re.compile(
+        r"SID (\d+) (?:is blocking (?:status (\w+) blocking|the sessions) (\d+)|waiting)"
+    ),
+}
+RELATIONSHIP_RE = SPOOL_PATTERNS['relationship']
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+
+def iter_spool_lines(f):
+    """Stripped, non-blank lines of an open spool file, read one at a time."""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def iter_spool_blocks(f):
+    """Runs of non-blank lines separated by blank lines, as lists of right-stripped lines.
+
+    Only the current block is held in memory. Leading whitespace is kept
+    because wrapped SQL*Plus columns use it.
+    """
+    block = []
+    for line in f:
+        line = line.rstrip()
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def iter_spool_records(f, starts_record):
+    """Reassemble records that span several lines of an open spool file.
+
+    Yields lists of stripped, non-blank lines. A new record begins at every
+    line for which starts_record(line) is true; lines before the first such
+    line form a record of their own. Blank lines are ignored, so the
+    grouping does not depend on how SQL*Plus spaced the output, and only
+    one record is held in memory at a time.
+    """
+    record = []
+    for line in iter_spool_lines(f):
+        if record and starts_record(line):
+            yield record
+            record = []
+        record.append(line)
+    if record:
+        yield record
+
+
+def iter_spool_chunks(f, size=SCAN_CHUNK_SIZE):
+    """Text of an open spool file in pieces of about size characters that end on a line break."""
+    tail = ""
+    while True:
+        data = f.read(size)
+        if not data:
+            break
+        cut = data.rfind("\n") + 1
+        if not cut:
+            tail += data
+            continue
+        yield tail + data[:cut]
+        tail = data[cut:]
+    if tail:
+        yield tail
+
+
+def clean_and_read_value(filepath):
+    try:
+        if not os.path.exists(filepath):
+            return "NA"
+        with open(filepath, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            for row in reader:
+                if not row:
+                    continue
+                cell = row[0].strip()
+                if cell and cell.lower() not in {"name", "column_name", "value", ""}:
+                    return cell
+        return "NA"
+    except Exception as e:
+        return "NA"
+
+def extract_ratio_value(filepath):
+    try:
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in iter_spool_lines(f):
+                if not line.lower().startswith(("name", "column")):
+                    try:
+                        return float(line)
+                    except ValueError:
+                        continue
+        return None
+    except:
+        return None
+
+# --- health_check ---
+
+def parse_asm_diskgroups(filepath):
+    groups = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) >= 2:
+                group = parts[0].strip()
+                try:
+                    groups.append(AsmGroup(group, float(parts[1].strip()), None))
+                except ValueError:
+                    groups.append(AsmGroup(group, None, "Invalid number"))
+            else:
+                groups.append(AsmGroup(line, None, "Missing value"))
+    return tuple(groups)
+
+def parse_most_modified_tables(filepath):
+    tables = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) >= 6:
+                full_table = f"{parts[0].strip()}.{parts[1].strip()}"
+                try:
+                    counts = tuple(int(float(p.strip())) for p in parts[2:6])
+                except ValueError:
+                    counts = None
+                tables.append(ModifiedTable(full_table, counts))
+            else:
+                tables.append(ModifiedTable(None, None))
+    return tuple(tables)
+
+def parse_manager_statuses(filepath):
+    """Label and lower-cased status per line of cost_inv_managers.csv."""
+    statuses = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            label = " ".join(parts[:-2]) if len(parts) > 2 else parts[0]
+            statuses.append(ManagerStatus(label.strip(), parts[-1].strip().lower()))
+    return tuple(statuses)
+
+def parse_tablespaces(filepath):
+    """Tablespace (name, free MB) per row, in file order."""
+    tablespaces = []
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    parts = line.split()
+                    if len(parts) < 3:
+                        continue
+                    try:
+                        tablespaces.append(Tablespace(parts[0], float(parts[2].replace(',', ''))))
+                    except (ValueError, IndexError):
+                        continue
+    except Exception:
+        pass
+    return tuple(tablespaces)
+
+def parse_archivals(filepath):
+    """{date: [24 hourly archive counts]} from archivals_for_last_2days_per_hour.csv."""
+    daily_data = {}
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.strip().split()
+                    if not parts or not parts[0][:4].isdigit():
+                        continue
+                    try:
+                        daily_data[parts[0]] = list(map(int, parts[1:25]))
+                    except (ValueError, IndexError):
+                        continue
+    except Exception:
+        pass
+    return daily_data
+
+# --- wait_event_summary ---
+
+def parse_wait_events(filepath):
+    """WaitEvent per distinct event name (one event per line), in first-seen order."""
+    counter = Counter()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            counter[line] += 1
+    return tuple(WaitEvent(name, count) for name, count in counter.items())
+
+def has_content(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return bool(f.read().strip())
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_blocking_sessions(filepath):
+    """Single pass over blocking_sessions.csv.
+
+    Returns (sessions, status_edges): a BlockingSession for every row with at
+    least four columns, and the BlockingEdge set from rows written as
+    "SID x is blocking status S blocking y". Both are None when the file has
+    no usable rows.
+    """
+    sessions = []
+    pairs = set()
+    search = RELATIONSHIP_RE.search
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            columns = len(parts)
+            if columns >= 4:
+                sessions.append(BlockingSession(
+                    parts[1],
+                    parts[4] if columns >= 7 else None,
+                    _int_or_none(parts[6]) if columns >= 7 else None,
+                    _int_or_none(parts[7]) if columns >= 8 else None,
+                ))
+            if "SID " in line:
+                match = search(line)
+                if match is not None and match.group(2) is not None:
+                    pairs.add((match.group(1), match.group(3)))
+    if not sessions and not pairs:
+        return None, None
+    return tuple(sessions), frozenset(BlockingEdge(blocker, blocked) for blocker, blocked in pairs)
+
+def parse_session_lock_edges(filepath):
+    """BlockingEdge per "SID x is blocking the sessions y" line."""
+    edges = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for chunk in iter_spool_chunks(f):
+            for sid, status, other in RELATIONSHIP_RE.findall(chunk):
+                if other and not status:
+                    edges.append(BlockingEdge(sid, other))
+    return tuple(edges)
+
+# --- top_10_checklists ---
+
+TOP_SQL_LIMIT = 10
+CPU_SQL_METRICS = ('cpu_time',)
+IO_SQL_METRICS = ('disk_reads', 'buffer_gets', 'gets_per_exec')
+
+def parse_fragmented_tables(filepath):
+    fragmented_tables = []
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.strip().split()
+                    if len(parts) == 6:
+                        try:
+                            fragmented_tables.append(FragmentedTable(
+                                parts[0],
+                                parts[1],
+                                int(float(parts[2])),
+                                int(float(parts[3])),
+                                float(parts[4]),
+                                float(parts[5])
+                            ))
+                        except (ValueError, IndexError):
+                            continue
+    except Exception:
+        pass
+    return tuple(fragmented_tables)
+
+def _split_sql_text(line):
+    """Split "meta columns sql_text,SQL" into (meta parts, sql text)."""
+    if "sql_text," in line:
+        sql_text_start = line.find("sql_text,")
+        return line[:sql_text_start].strip().split(), line[sql_text_start + 9:].strip()
+    return line.split(), ""
+
+def iter_cpu_queries(filepath):
+    """CpuSql per statement of top_10_cpu_consuming_queries.csv, read lazily."""
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                for line in iter_spool_lines(f):
+                    if line.startswith('#'):
+                        continue
+                    # Format: SQL_ID OWNER CPU_TIME [ELAPSED_TIME ROWS] [sql_text,SQL_TEXT]
+                    parts, sql_line = _split_sql_text(line)
+                    if len(parts) < 3:
+                        continue
+                    try:
+                        cpu_time = float(parts[2])
+                        record = CpuSql(
+                            parts[0],
+                            parts[1],
+                            cpu_time,
+                            float(parts[3]) if len(parts) > 3 else cpu_time,
+                            int(float(parts[4])) if len(parts) > 4 else 0,
+                            sql_line if sql_line else "NA"
+                        )
+                    except (ValueError, IndexError):
+                        continue
+                    yield record
+    except Exception:
+        pass
+
+def parse_cpu_queries(filepath):
+    """Statements ranked by CPU time, with CPU and elapsed time summed over all of them."""
+    return rank_statements(
+        iter_cpu_queries(filepath), CPU_SQL_METRICS,
+        totals=('cpu_time', 'elapsed_time'), limit=TOP_SQL_LIMIT,
+    )
+
+def iter_io_queries(filepath):
+    """IoSql per statement of top_10_io_consuming_queries.csv, read lazily."""
+    pending = None
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                for line in iter_spool_lines(f):
+                    if line.startswith('#'):
+                        continue
+                    # Format: SQL_ID OWNER EXECUTIONS DISK_READS ... [sql_text,SQL_TEXT]
+                    # The statement may instead follow on its own line.
+                    parts, sql_line = _split_sql_text(line)
+                    try:
+                        if len(parts) < 3:
+                            raise ValueError(line)
+                        record = IoSql(
+                            parts[0],
+                            parts[1],
+                            float(parts[2]) if len(parts) > 2 else 0,
+                            float(parts[3]) if len(parts) > 3 else 0,
+                            float(parts[4]) if len(parts) > 4 else 0,
+                            float(parts[5]) if len(parts) > 5 else 0,
+                            float(parts[6]) if len(parts) > 6 else 0,
+                            sql_line.strip() if sql_line else "NA"
+                        )
+                    except (ValueError, IndexError):
+                        if pending is not None and pending.sql_text == "NA":
+                            pending.sql_text = line
+                        continue
+                    if pending is not None:
+                        yield pending
+                    pending = record
+    except Exception:
+        pass
+    if pending is not None:
+        yield pending
+
+def parse_io_queries(filepath):
+    """Statements ranked by disk reads, buffer gets and gets per execution."""
+    return rank_statements(
+        iter_io_queries(filepath), IO_SQL_METRICS,
+        totals=('disk_reads', 'buffer_gets'), limit=TOP_SQL_LIMIT,
+    )
+
+def parse_dblinks(filepath):
+    """dblinks.csv holds three lines per link: owner/link/user, host, flags."""
+    cleaned_data = []
+    try:
+        if os.path.exists(filepath):
+            with open(filepath, "r", encoding="utf-8") as f:
+                lines = iter_spool_lines(f)
+                for first, host, flags in zip(lines, lines, lines):
+                    try:
+                        part1 = first.split()
+                        if len(part1) < 3:
+                            continue
+                        owner, db_link, username = part1[0], part1[1], part1[2]
+
+                        part3 = flags.split()
+                        if len(part3) < 5:
+                            continue
+
+                        created, hidden, shared_interval, valid, intra_cdb = part3[0], part3[1], part3[2], part3[3], part3[4]
+
+                        cleaned_data.append(DbLink(
+                            owner, db_link, username, host, created,
+                            hidden, shared_interval, valid, intra_cdb
+                        ))
+                    except Exception:
+                        continue
+    except Exception:
+        pass
+    return tuple(cleaned_data)
+
+# --- multi-line datafile and SQL spools ---
+#
+# These files run to hundreds of MB on large databases, so they are read
+# as generators of records rather than parsed into a collection up front.
+# They are not part of the snapshot; history.py streams them at ingest.
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _metrics(line, count):
+    """First count comma-separated columns of line, padded with None."""
+    columns = [column.strip() or None for column in line.split(',')]
+    return (columns + [None] * count)[:count]
+
+
+def _iter_path_records(filepath):
+    """(path, metrics line) pairs of the files that print a datafile path above its metrics."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        for record in iter_spool_records(f, lambda line: ',' not in line):
+            if len(record) == 2 and ',' not in record[0]:
+                yield record[0], record[1]
+
+
+def iter_disk_io_contention(filepath):
+    """DatafileIo per datafile in disk_io_contention.csv."""
+    for name, line in _iter_path_records(filepath):
+        phys_reads, read_pct, phys_writes, write_pct, block_ios = _metrics(line, 5)
+        yield DatafileIo(
+            name, _int_or_none(phys_reads), _float_or_none(read_pct),
+            _int_or_none(phys_writes), _float_or_none(write_pct), _int_or_none(block_ios),
+        )
+
+
+def iter_dbstructure(filepath):
+    """DbStructureFile per control file, online log member and datafile in dbstructure.csv.
+
+    Log members and datafiles are preceded by their group#/file id, and
+    datafiles are followed by "mbytes,status,tablespace"; the control file
+    is printed on its own.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        for record in iter_spool_records(f, str.isdigit):
+            number = int(record[0]) if record[0].isdigit() else None
+            paths = record[1:] if number is not None else record
+            if not paths:
+                continue
+            if number is not None and len(paths) == 2 and ',' in paths[1]:
+                size_mb, status, tablespace = _metrics(paths[1], 3)
+                yield DbStructureFile('datafile', number, paths[0], _int_or_none(size_mb), status, tablespace)
+                continue
+            kind = 'logfile' if number is not None else 'controlfile'
+            for path in paths:
+                yield DbStructureFile(kind, number, path, None, None, None)
+
+
+# Width of a v$sqltext_with_newlines piece; only a statement's last is shorter
+SQL_PIECE_WIDTH = 64
+
+
+def iter_io_usage_sql(filepath):
+    """IoUsageSql per statement in io_usage_sql.csv.
+
+    The query prints one block per 64-character v$sqltext_with_newlines
+    piece: the piece (wrapped at its embedded newlines) with disk reads,
+    executions and reads/execution on its first line, then the parsing
+    user. Consecutive pieces with the same figures and user are joined
+    back into one statement. A piece can end in spaces that belong to the
+    statement ("... = :B2 " + "AND ..."), so every piece is kept at its full
+    width and only the end of the statement is stripped.
+    """
+    current = None
+    pieces = []
+    with open(filepath, "r", encoding="utf-8") as f:
+        for block in iter_spool_blocks(f):
+            if len(block) < 2:
+                continue
+            figures = None
+            text_lines = []
+            for line in block[:-1]:
+                # The statement column is fixed width, so any comma in the
+                # SQL itself sits before the last three columns.
+                text, *columns = line.rsplit(',', 3)
+                if figures is None and any(column.strip() for column in columns):
+                    disk_reads, executions, ratio = (columns + [None] * 3)[:3]
+                    figures = (_int_or_none(disk_reads), _int_or_none(executions), _float_or_none(ratio))
+                text_lines.append(text)
+            # The padding before an embedded newline is not SQL, but the end
+            # of the piece may be, so the piece keeps its full width.
+            piece = "\n".join([text.rstrip() for text in text_lines[:-1]] + text_lines[-1:])
+            key = (figures, block[-1].strip())
+            if figures is None and current is not None:
+                key = current
+            if pieces and key != current:
+                yield IoUsageSql("".join(pieces).rstrip(), *(current[0] or (None, None, None)), current[1])
+                pieces = []
+            current = key
+            pieces.append(piece[:SQL_PIECE_WIDTH].ljust(SQL_PIECE_WIDTH))
+    if pieces:
+        yield IoUsageSql("".join(pieces).rstrip(), *(current[0] or (None, None, None)), current[1])
@@ -0,0 +1,35 @@
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    sidebar.classList.toggle('open');
+}
+
+// Close sidebar when clicking outside on mobile
+document.addEventListener('click', function(event) {
+    const sidebar = document.getElementById('sidebar');
+    const toggleBtn = document.querySelector('.sidebar-toggle');
+
+    if (window.innerWidth <= 768 && 
+        !sidebar.contains(event.target) && 
+        !toggleBtn.contains(event.target)) {
+        sidebar.classList.remove('open');
+    }
+});
+
+// Handle window resize
+window.addEventListener('resize', function() {
+    const sidebar = document.getElementById('sidebar');
+    if (window.innerWidth > 768) {
+        sidebar.classList.remove('open');
+    }
+});
+
+// Chart data is served separately from the pages (/api/<name>/);
+// call this from a DOMContentLoaded handler.
+function fetchDataset(url) {
+    return fetch(url, {headers: {'Accept': 'application/json'}}).then(function(response) {
+        if (!response.ok) {
+            throw new Error(url + ' returned ' + response.status);
+        }
+        return response.json();
+    });
+}
@@ -0,0 +1,116 @@
+// Tablespace Chart
+function drawTablespaceChart(chart) {
+const tablespaceCtx = document.getElementById('tablespaceChart').getContext('2d');
+const tablespaces = chart.labels;
+const freemb = chart.free_mb;
+const pointColors = chart.colors;
+
+if (tablespaces.length > 0) {
+    new Chart(tablespaceCtx, {
+        type: 'bar',
+        data: {
+            labels: tablespaces,
+            datasets: [{
+                label: 'Free Space (MB)',
+                data: freemb,
+                backgroundColor: pointColors,
+                borderColor: pointColors,
+                borderWidth: 2,
+                borderRadius: 8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Free Space (MB)'
+                    }
+                },
+                x: {
+                    ticks: {
+                        maxRotation: 45,
+                        minRotation: 0
+                    }
+                }
+            }
+        }
+    });
+} else {
+    document.getElementById('tablespaceChart').parentElement.innerHTML = '<div class="no-data" style="padding: 40px; text-align: center; color: #666;">No tablespace data available</div>';
+}
+}
+
+// Archival Chart
+function drawArchivalChart(dailyData) {
+const archivalCtx = document.getElementById('archivalChart').getContext('2d');
+
+if (Object.keys(dailyData).length > 0) {
+    const dates = Object.keys(dailyData);
+    const datasets = dates.map((date, index) => {
+        const colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe'];
+        return {
+            label: date,
+            data: dailyData[date],
+            borderColor: colors[index % colors.length],
+            backgroundColor: colors[index % colors.length] + '20',
+            tension: 0.4
+        };
+    });
+
+    const hours = Array.from({length: 24}, (_, i) => String(i).padStart(2, '0') + ':00');
+
+    new Chart(archivalCtx, {
+        type: 'line',
+        data: {
+            labels: hours,
+            datasets: datasets
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'top'
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Archivals per Hour'
+                    }
+                },
+                x: {
+                    title: {
+                        display: true,
+                        text: 'Hour of Day'
+                    }
+                }
+            }
+        }
+    });
+} else {
+    document.getElementById('archivalChart').parentElement.innerHTML = '<div class="no-data" style="padding: 40px; text-align: center; color: #666;">No archival data available</div>';
+}
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    fetchDataset(document.getElementById('tablespaceChart').dataset.dataset).then(drawTablespaceChart, function(error) {
+        console.error(error);
+        drawTablespaceChart({labels: [], free_mb: [], colors: []});
+    });
+    fetchDataset(document.getElementById('archivalChart').dataset.dataset).then(drawArchivalChart, function(error) {
+        console.error(error);
+        drawArchivalChart({});
+    });
+});
@@ -0,0 +1,108 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const ctx = document.getElementById('tablespaceChart').getContext('2d');
+
+    // Generate a color palette for the chart
+    function generateColors(count) {
+        const baseColors = [
+            'rgba(102, 126, 234, 0.8)',
+            'rgba(118, 75, 162, 0.8)',
+            'rgba(30, 60, 114, 0.8)',
+            'rgba(42, 82, 152, 0.8)',
+            'rgba(99, 102, 241, 0.8)',
+            'rgba(76, 175, 80, 0.8)',
+            'rgba(255, 152, 0, 0.8)',
+            'rgba(233, 30, 99, 0.8)',
+            'rgba(156, 39, 176, 0.8)',
+            'rgba(0, 188, 212, 0.8)'
+        ];
+
+        const borderColors = [
+            'rgba(102, 126, 234, 1)',
+            'rgba(118, 75, 162, 1)',
+            'rgba(30, 60, 114, 1)',
+            'rgba(42, 82, 152, 1)',
+            'rgba(99, 102, 241, 1)',
+            'rgba(76, 175, 80, 1)',
+            'rgba(255, 152, 0, 1)',
+            'rgba(233, 30, 99, 1)',
+            'rgba(156, 39, 176, 1)',
+            'rgba(0, 188, 212, 1)'
+        ];
+
+        // If we have more tablespaces than colors, cycle through the colors
+        const bgColors = [];
+        const bdColors = [];
+
+        for (let i = 0; i < count; i++) {
+            bgColors.push(baseColors[i % baseColors.length]);
+            bdColors.push(borderColors[i % borderColors.length]);
+        }
+
+        return { bgColors, bdColors };
+    }
+
+    // Get tablespace data from Django template variables
+    const tablespaces = [];
+    const freemb = [];
+
+    // Generate colors based on the number of tablespaces
+    const colors = generateColors(tablespaces.length);
+
+    const myChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: tablespaces,
+            datasets: [{
+                label: 'Free Space (MB)',
+                data: freemb,
+                backgroundColor: colors.bgColors,
+                borderColor: colors.bdColors,
+                borderWidth: 2,
+                borderRadius: 8,
+                barPercentage: 0.7,
+                categoryPercentage: 0.8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            return `Free Space: ${context.parsed.y} MB`;
+                        }
+                    }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    grid: {
+                        color: 'rgba(0,0,0,0.05)'
+                    },
+                    title: {
+                        display: true,
+                        text: 'Free Space (MB)'
+                    }
+                },
+                x: {
+                    grid: {
+                        display: false
+                    },
+                    ticks: {
+                        maxRotation: 45,
+                        minRotation: 0
+                    }
+                }
+            },
+            animation: {
+                duration: 1000,
+                easing: 'easeOutQuart'
+            }
+        }
+    });
+});
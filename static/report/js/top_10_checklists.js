@@ -0,0 +1,225 @@
+// Populate fragmented tables
+function populateFragmentedTables(tables) {
+    const tableNames = tables.table_names;
+    const unusedSpace = tables.unused_mb;
+    const owners = tables.owners;
+    const numRows = tables.num_rows;
+    const tbody = document.getElementById('fragmentedTablesBody');
+
+    if (tableNames && tableNames.length > 0) {
+        let html = '';
+        for (let i = 0; i < tableNames.length; i++) {
+            const owner = owners[i] || 'NA';
+            const tableName = tableNames[i] || 'NA';
+            const unused = unusedSpace[i] || 0;
+            const rows = numRows[i] || 0;
+            const priority = unused > 1000 ? 'high' : (unused > 100 ? 'medium' : 'low');
+
+            html += `<tr>
+                <td>${owner}</td>
+                <td><strong>${tableName}</strong></td>
+                <td>
+                    <span class="metric-badge metric-${priority}">
+                        ${unused.toFixed(2)} MB
+                    </span>
+                </td>
+                <td>${rows.toLocaleString()}</td>
+            </tr>`;
+        }
+        tbody.innerHTML = html;
+    } else {
+        tbody.innerHTML = '<tr><td colspan="4" style="text-align: center; color: #666; font-style: italic;">No fragmented table data available</td></tr>';
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    fetchDataset(document.getElementById('fragmentedTablesBody').dataset.dataset).then(populateFragmentedTables, function(error) {
+        console.error(error);
+        populateFragmentedTables({table_names: []});
+    });
+});
+
+// Performance Chart - Only show if real data exists
+function drawPerformanceChart(cpuData) {
+    const perfCtx = document.getElementById('performanceChart');
+    if (perfCtx) {
+        // Filter out entries with no real data (CPU_TIME = 0 or missing)
+        const validData = cpuData.filter(q => q && q.CPU_TIME && q.CPU_TIME > 0);
+
+        if (validData && validData.length > 0) {
+            // Sort by CPU_TIME descending and take top 5
+            const sortedData = validData.sort((a, b) => (b.CPU_TIME || 0) - (a.CPU_TIME || 0)).slice(0, 5);
+
+            new Chart(perfCtx.getContext('2d'), {
+                type: 'bar',
+                data: {
+                    labels: sortedData.map(q => {
+                        const sqlId = q.SQL_ID || 'N/A';
+                        return sqlId.length > 12 ? sqlId.substring(0, 12) + '...' : sqlId;
+                    }),
+                    datasets: [{
+                        label: 'CPU Time (ms)',
+                        data: sortedData.map(q => q.CPU_TIME || 0),
+                        backgroundColor: 'rgba(23, 162, 184, 0.8)',
+                        borderColor: '#17a2b8',
+                        borderWidth: 2,
+                        borderRadius: 8
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: true,
+                    plugins: {
+                        legend: {
+                            display: false
+                        },
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    const index = context.dataIndex;
+                                    const query = sortedData[index];
+                                    return [
+                                        `CPU Time: ${(query.CPU_TIME || 0).toFixed(2)} ms`,
+                                        `Elapsed: ${(query.ELAPSED_TIME || 0).toFixed(2)} ms`,
+                                        `Owner: ${query.OWNER || 'N/A'}`
+                                    ];
+                                }
+                            }
+                        }
+                    },
+                    scales: {
+                        y: {
+                            beginAtZero: true,
+                            title: {
+                                display: true,
+                                text: 'CPU Time (ms)'
+                            },
+                            ticks: {
+                                callback: function(value) {
+                                    return value.toLocaleString() + ' ms';
+                                }
+                            }
+                        },
+                        x: {
+                            ticks: {
+                                maxRotation: 45,
+                                minRotation: 0,
+                                font: {
+                                    size: 10
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+        } else {
+            // No valid data - show message
+            document.getElementById('performanceChartContainer').innerHTML = 
+                '<div class="no-data" style="padding: 40px; text-align: center; color: #666; font-style: italic;">No valid performance data available</div>';
+        }
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const perfCtx = document.getElementById('performanceChart');
+    if (!perfCtx) return;
+    fetchDataset(perfCtx.dataset.dataset).then(drawPerformanceChart, function(error) {
+        console.error(error);
+        drawPerformanceChart([]);
+    });
+});
+
+// I/O Chart - Only show if real data exists
+function drawIoChart(ioData) {
+    const ioCtx = document.getElementById('ioChart');
+    if (ioCtx) {
+        // Filter out entries with no real data (both DISK_READS and BUFFER_GETS = 0 or missing)
+        const validData = ioData.filter(q => q && ((q.DISK_READS && q.DISK_READS > 0) || (q.BUFFER_GETS && q.BUFFER_GETS > 0)));
+
+        if (validData && validData.length > 0) {
+            // Sort by DISK_READS descending and take top 10
+            const sortedData = validData.sort((a, b) => (b.DISK_READS || 0) - (a.DISK_READS || 0)).slice(0, 10);
+
+            new Chart(ioCtx.getContext('2d'), {
+                type: 'scatter',
+                data: {
+                    datasets: [{
+                        label: 'I/O Operations',
+                        data: sortedData.map(q => ({
+                            x: q.DISK_READS || 0,
+                            y: q.BUFFER_GETS || 0
+                        })),
+                        backgroundColor: 'rgba(111, 66, 193, 0.8)',
+                        borderColor: '#6f42c1',
+                        borderWidth: 2,
+                        pointRadius: 6,
+                        pointHoverRadius: 8
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: true,
+                    plugins: {
+                        legend: {
+                            display: false
+                        },
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    const index = context.dataIndex;
+                                    const query = sortedData[index];
+                                    return [
+                                        `SQL ID: ${query.SQL_ID || 'N/A'}`,
+                                        `Disk Reads: ${(query.DISK_READS || 0).toLocaleString()}`,
+                                        `Buffer Gets: ${(query.BUFFER_GETS || 0).toLocaleString()}`,
+                                        `Executions: ${(query.EXECUTIONS || 0).toLocaleString()}`,
+                                        `Owner: ${query.OWNER || 'N/A'}`
+                                    ];
+                                }
+                            }
+                        }
+                    },
+                    scales: {
+                        x: {
+                            type: 'linear',
+                            position: 'bottom',
+                            title: {
+                                display: true,
+                                text: 'Disk Reads'
+                            },
+                            ticks: {
+                                callback: function(value) {
+                                    return value.toLocaleString();
+                                }
+                            }
+                        },
+                        y: {
+                            title: {
+                                display: true,
+                                text: 'Buffer Gets'
+                            },
+                            ticks: {
+                                callback: function(value) {
+                                    return value.toLocaleString();
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+        } else {
+            // No valid data - show message
+            document.getElementById('ioChartContainer').innerHTML = 
+                '<div class="no-data" style="padding: 40px; text-align: center; color: #666; font-style: italic;">No valid I/O data available</div>';
+        }
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const ioCtx = document.getElementById('ioChart');
+    if (!ioCtx) return;
+    fetchDataset(ioCtx.dataset.dataset).then(drawIoChart, function(error) {
+        console.error(error);
+        drawIoChart([]);
+    });
+});
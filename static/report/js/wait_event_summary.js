@@ -0,0 +1,358 @@
+// Wait for DOM to be fully loaded
+document.addEventListener('DOMContentLoaded', function() {
+    // The page is painted; fetch the data behind each chart (see datasets.py)
+    const empty = {labels: [], counts: [], times: [], avg_times: [], percentages: []};
+    fetchDataset(document.getElementById('waitEventsTableBody').dataset.dataset).catch(function(error) {
+        console.error(error);
+        return empty;
+    }).then(function(chart) {
+        initWaitEventChart(chart);
+        populateWaitEventsTable(chart);
+    });
+    const trendWindow = document.getElementById('waitTrendWindow');
+    if (trendWindow) {
+        loadWaitTrend(trendWindow.value);
+        trendWindow.addEventListener('change', function() {
+            loadWaitTrend(trendWindow.value);
+        });
+    }
+    const blockingChart = document.getElementById('blockingChart');
+    if (blockingChart) {
+        fetchDataset(blockingChart.dataset.dataset).then(initBlockingChart, console.error);
+    }
+    const network = document.getElementById('blockingNetwork');
+    if (network) {
+        fetchDataset(network.dataset.dataset).catch(function(error) {
+            console.error(error);
+            return {nodes: [], edges: []};
+        }).then(initNetworkGraph);
+    }
+});
+
+function populateWaitEventsTable(chart) {
+    const waitEventLabels = chart.labels;
+    const waitEventCounts = chart.counts;
+    const waitEventTimes = chart.times;
+    const waitEventAvgTimes = chart.avg_times;
+    const waitEventPercentages = chart.percentages;
+    const tbody = document.getElementById('waitEventsTableBody');
+
+    if (!waitEventLabels || waitEventLabels.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="6" style="text-align: center; color: #666; font-style: italic;">No wait event data available</td></tr>';
+        return;
+    }
+
+    let html = '';
+    for (let i = 0; i < waitEventLabels.length; i++) {
+        const label = waitEventLabels[i] || 'NA';
+        const count = waitEventCounts[i] || 0;
+        const timeWaited = waitEventTimes && waitEventTimes[i] !== undefined && waitEventTimes[i] > 0 
+            ? waitEventTimes[i].toLocaleString() + ' ms' 
+            : 'NA';
+        const avgWait = waitEventAvgTimes && waitEventAvgTimes[i] !== undefined && waitEventAvgTimes[i] > 0
+            ? waitEventAvgTimes[i].toFixed(2) + ' ms'
+            : 'NA';
+        const percentage = waitEventPercentages && waitEventPercentages[i] !== undefined && waitEventPercentages[i] > 0
+            ? waitEventPercentages[i].toFixed(2) + '%'
+            : 'NA';
+        const priority = count > 100 ? 'high' : (count > 50 ? 'medium' : 'low');
+        const priorityText = count > 100 ? 'High' : (count > 50 ? 'Medium' : 'Low');
+
+        html += `<tr>
+            <td>${label}</td>
+            <td>${count.toLocaleString()}</td>
+            <td>${timeWaited}</td>
+            <td>${avgWait}</td>
+            <td>${percentage}</td>
+            <td class="priority-${priority}">${priorityText}</td>
+        </tr>`;
+    }
+    tbody.innerHTML = html;
+}
+
+
+function initWaitEventChart(chart) {
+    const ctx = document.getElementById('waitEventChart');
+    if (!ctx) return;
+
+    const waitEventLabels = chart.labels;
+    const waitEventCounts = chart.counts;
+
+    if (!waitEventLabels || waitEventLabels.length === 0) return;
+
+    // Calculate percentages
+    const total = waitEventCounts.reduce((a, b) => a + b, 0);
+    const percentages = waitEventCounts.map(count => total > 0 ? (count / total * 100).toFixed(1) : 0);
+
+    const data = {
+        labels: waitEventLabels,
+        datasets: [{
+            data: percentages,
+            backgroundColor: [
+                '#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#16a085', '#d35400', '#8e44ad', '#27ae60'
+            ],
+            borderWidth: 2,
+            borderColor: '#fff',
+            hoverOffset: 15
+        }]
+    };
+
+    new Chart(ctx, {
+        type: 'doughnut',
+        data: data,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                    labels: {
+                        padding: 20,
+                        usePointStyle: true,
+                        font: {
+                            size: 11
+                        }
+                    }
+                },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const label = context.label || '';
+                            const value = context.parsed;
+                            return `${label}: ${value}%`;
+                        }
+                    }
+                }
+            },
+            animation: {
+                animateRotate: true,
+                animateScale: true,
+                duration: 1000
+            }
+        }
+    });
+}
+
+// Wait events per collection run from the history store, over the
+// selected window; every series arrives downsampled (see datasets.py).
+const TREND_COLORS = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c'];
+let waitTrendChart = null;
+
+function loadWaitTrend(span) {
+    const ctx = document.getElementById('waitTrendChart');
+    const url = ctx.dataset.dataset + '?window=' + encodeURIComponent(span);
+    fetchDataset(url).then(initWaitTrendChart, console.error);
+}
+
+function formatRunTime(seconds, withDate) {
+    const date = new Date(seconds * 1000);
+    const time = date.toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
+    return withDate ? date.toLocaleDateString([], {month: 'short', day: 'numeric'}) + ' ' + time : time;
+}
+
+function initWaitTrendChart(chart) {
+    const ctx = document.getElementById('waitTrendChart');
+    if (!ctx) return;
+    if (waitTrendChart) {
+        waitTrendChart.destroy();
+        waitTrendChart = null;
+    }
+
+    const series = chart.series || [];
+    const empty = series.length === 0;
+    ctx.hidden = empty;
+    document.getElementById('waitTrendEmpty').hidden = !empty;
+    if (empty) return;
+
+    const multiDay = chart.until - chart.since > 86400;
+    const data = {
+        datasets: series.map(function(s, i) {
+            const color = TREND_COLORS[i % TREND_COLORS.length];
+            return {
+                label: s.label,
+                data: s.t.map(function(t, j) { return {x: t, y: s.counts[j]}; }),
+                borderColor: color,
+                backgroundColor: i === 0 ? 'rgba(231, 76, 60, 0.1)' : color,
+                borderWidth: i === 0 ? 2 : 1.5,
+                tension: 0.2,
+                fill: i === 0,
+                pointRadius: 0,
+                pointHoverRadius: 4
+            };
+        })
+    };
+
+    waitTrendChart = new Chart(ctx, {
+        type: 'line',
+        data: data,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            parsing: false,
+            plugins: {
+                legend: {
+                    display: series.length > 1,
+                    position: 'bottom',
+                    labels: {
+                        boxWidth: 12
+                    }
+                },
+                tooltip: {
+                    mode: 'nearest',
+                    intersect: false,
+                    callbacks: {
+                        title: function(items) {
+                            return items.length ? formatRunTime(items[0].parsed.x, true) : '';
+                        }
+                    }
+                }
+            },
+            scales: {
+                x: {
+                    type: 'linear',
+                    min: chart.since,
+                    max: chart.until,
+                    title: {
+                        display: true,
+                        text: 'Collection Run'
+                    },
+                    ticks: {
+                        maxTicksLimit: 8,
+                        callback: function(value) {
+                            return formatRunTime(value, multiDay);
+                        }
+                    },
+                    grid: {
+                        display: false
+                    }
+                },
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Number of Events'
+                    },
+                    grid: {
+                        color: 'rgba(0,0,0,0.1)'
+                    }
+                }
+            },
+            interaction: {
+                intersect: false,
+                mode: 'nearest'
+            },
+            animation: false
+        }
+    });
+}
+
+function initBlockingChart(chart) {
+    const ctx = document.getElementById('blockingChart');
+    if (!ctx) return;
+
+    const blockingLabels = chart.labels;
+    const blockingCounts = chart.counts;
+
+    if (!blockingLabels || blockingLabels.length === 0) return;
+
+    const data = {
+        labels: blockingLabels.map(label => 'Session ' + label),
+        datasets: [{
+            label: 'Blocking Count',
+            data: blockingCounts,
+            backgroundColor: 'rgba(231, 76, 60, 0.8)',
+            borderColor: '#e74c3c',
+            borderWidth: 2,
+            borderRadius: 8,
+            borderSkipped: false,
+        }]
+    };
+
+    new Chart(ctx, {
+        type: 'bar',
+        data: data,
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                x: {
+                    display: true,
+                    title: {
+                        display: true,
+                        text: 'Session ID'
+                    },
+                    grid: {
+                        display: false
+                    }
+                },
+                y: {
+                    beginAtZero: true,
+                    title: {
+                        display: true,
+                        text: 'Number of Blocks'
+                    },
+                    ticks: {
+                        stepSize: 2
+                    }
+                }
+            },
+            animation: {
+                duration: 1200,
+                easing: 'easeOutBounce'
+            }
+        }
+    });
+}
+
+function initNetworkGraph(graph) {
+    // Blocking sessions, or session locks when there are none
+    const nodes = graph.nodes || [];
+    const edges = graph.edges || [];
+
+    if (nodes.length === 0) {
+        document.getElementById('blockingNetwork').innerHTML = '<div class="no-data"><i class="fas fa-info-circle"></i><p>No blocking network data available</p></div>';
+        return;
+    }
+
+    const container = document.getElementById('blockingNetwork');
+    if (!container) return;
+
+    const nodesDataSet = new vis.DataSet(nodes);
+    const edgesDataSet = new vis.DataSet(edges);
+    const data = {nodes: nodesDataSet, edges: edgesDataSet};
+    const options = {
+        nodes: {
+            shape: 'dot',
+            size: 25,
+            font: {
+                size: 14,
+                face: 'Segoe UI'
+            },
+            borderWidth: 2,
+            shadow: true
+        },
+        edges: {
+            width: 2,
+            shadow: true,
+            smooth: {
+                enabled: true,
+                type: 'dynamic'
+            }
+        },
+        physics: {
+            enabled: true,
+            stabilization: {iterations: 100}
+        },
+        interaction: {
+            hover: true,
+            tooltipDelay: 200
+        }
+    };
+
+    new vis.Network(container, data, options);
+}
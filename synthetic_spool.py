@@ -0,0 +1,277 @@
+"""
+Synthetic output_csv/ directories at any scale, for benchmarks and load tests.
+
+write_collection() writes every spool file the report views read (see
+snapshot.SOURCE_FILES). It also writes the large multi-line datafile and
+SQL spools: dbstructure.csv, disk_io_contention.csv, datafile_io_pct.csv,
+datafile_archive.csv and io_usage_sql.csv. Each file uses the layout that
+the collection queries in reportquries.txt spool and spool_parsers.py
+reads. The values are random but consistent with each other: datafiles
+belong to tablespaces, blocking edges join existing sessions, and so on.
+The same seed writes the same files, dated relative to today, so runs can
+be compared. It needs neither Django nor the rest of the project.
+
+Volume is set by Scale. Its defaults are roughly one production database
+today; Scale.times(100) is the same database at 100 times the size.
+"""
+import os
+import random
+from dataclasses import dataclass, fields, replace
+from datetime import date, timedelta
+
+OWNERS = ("APPS", "HR", "FIN", "SALES", "APEX_PUBLIC_USER", "SCHEMA1", "SCHEMA2", "REPORTING")
+TABLE_WORDS = ("ORDERS", "CUSTOMERS", "INVOICES", "LEDGER", "AUDIT", "ITEMS", "PAYMENTS",
+               "SHIPMENTS", "SESSIONS", "EVENTS", "STOCK", "PRICES")
+WAIT_EVENTS = (
+    ("enq", "enq: TX - row lock contention"),
+    ("db", "db file sequential read"),
+    ("latch", "latch: cache buffers chains"),
+    ("buffer", "buffer busy waits"),
+    ("log", "log file sync"),
+    ("direct", "direct path read"),
+    ("gc", "gc buffer busy acquire"),
+)
+SQL_TEMPLATES = (
+    "SELECT {a}.ID, {a}.STATUS, {b}.NAME FROM {t1} {a} JOIN {t2} {b} ON {b}.ID = {a}.{t2}_ID "
+    "WHERE {a}.CREATED > SYSDATE - {n} AND {a}.STATUS = 'OPEN' ORDER BY {a}.CREATED DESC",
+    "UPDATE {t1} SET LAST_UPDATED = SYSDATE, STATUS = 'PROCESSED' WHERE BATCH_ID = :{n} AND STATUS = 'PENDING'",
+    "INSERT INTO {t1}_HIST (ID, PAYLOAD, CHANGED_ON) SELECT ID, PAYLOAD, SYSDATE FROM {t1} WHERE ID > :{n}",
+    "DELETE FROM {t1} WHERE CREATED < SYSDATE - {n} AND ARCHIVED = 'Y'",
+    "begin\n wwv_flow.accept(p_flow_id=>:1 ,\np_flow_step_id=>:{n} ,\np_request=>:3 );\n commit;\n end;",
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    """How much of everything to generate."""
+    tablespaces: int = 150
+    datafiles: int = 1600
+    sql_statements: int = 500
+    sessions: int = 200
+    blocking_edges: int = 20
+    archival_days: int = 2
+
+    def times(self, factor):
+        """This scale with every count but archival_days multiplied by factor."""
+        return replace(self, **{
+            f.name: max(1, round(getattr(self, f.name) * factor))
+            for f in fields(self) if f.name != 'archival_days'
+        })
+
+
+class _Collection:
+    """The objects of one synthetic database, shared by the files that describe them."""
+
+    def __init__(self, scale, rng, db_name):
+        self.scale = scale
+        self.rng = rng
+        self.db_name = db_name
+        self.tablespaces = ["SYSTEM", "SYSAUX", "UNDOTBS1", "TEMP", "USERS"]
+        while len(self.tablespaces) < scale.tablespaces:
+            self.tablespaces.append(f"{rng.choice(TABLE_WORDS)}_{len(self.tablespaces):04d}")
+        self.tablespaces = self.tablespaces[:scale.tablespaces]
+        pdb = "%032X" % rng.getrandbits(128)
+        self.datafiles = []  # (file id, path, size MB, tablespace)
+        for file_id in range(1, scale.datafiles + 1):
+            tablespace = self.tablespaces[(file_id - 1) % len(self.tablespaces)]
+            path = f"+DATA/{db_name}/{pdb}/DATAFILE/{tablespace.lower()}.{rng.randint(200, 2999)}.{1199680000 + file_id * 37}"
+            self.datafiles.append((file_id, path, rng.choice((50, 100, 1000, 1024, 4096, 32767)), tablespace))
+        self.sids = rng.sample(range(10, 10 * scale.sessions + 100), scale.sessions)
+        self.edges = set()
+        while len(self.edges) < min(scale.blocking_edges, len(self.sids) * (len(self.sids) - 1)):
+            blocker, blocked = rng.sample(self.sids, 2)
+            self.edges.add((blocker, blocked))
+        self.edges = sorted(self.edges)
+        self.statements = [self.sql_statement() for _ in range(scale.sql_statements)]
+        # (physical reads, physical writes) per datafile
+        self.io = [(rng.randint(0, 250000), rng.randint(0, 30000)) for _ in self.datafiles]
+
+    def sql_statement(self):
+        """(sql_id, owner, text) of a plausible statement."""
+        rng = self.rng
+        t1, t2 = rng.sample(TABLE_WORDS, 2)
+        text = rng.choice(SQL_TEMPLATES).format(a="A", b="B", t1=t1, t2=t2, n=rng.randint(1, 90))
+        sql_id = "".join(rng.choice("0123456789abcdfghjkmnpqrstuvwxyz") for _ in range(13))
+        return sql_id, rng.choice(OWNERS), text
+
+
+def _write(csv_dir, filename, lines):
+    with open(os.path.join(csv_dir, filename), 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+
+
+def _summary_files(c):
+    rng = c.rng
+    total_gb = sum(size for _, _, size, _ in c.datafiles) // 1024
+    return {
+        "V_DB_NAME.csv": c.db_name,
+        "V_VERSION.csv": "19.23.0.0.0",
+        "V_NODES.csv": str(rng.choice((1, 2, 4))),
+        "V_DB_status.csv": "OPEN",
+        "V_DB_ROLE.csv": "PRIMARY",
+        "v_db_archival_status.csv": "ARCHIVELOG",
+        "v_total_active_sessions.csv": str(len(c.sids)),
+        "V_PDB_SIZE_GB.csv": str(max(1, total_gb - total_gb // 10)),
+        "V_CDB_SIZE_GB.csv": str(max(1, total_gb)),
+        "V_LOCATION.csv": "Data Center",
+        "V_TIMEZONE.csv": "UTC",
+        "V_LAST_REBOOT.csv": (date.today() - timedelta(days=rng.randint(1, 90))).isoformat() + " 03:15:00",
+        "V_SGA_MB.csv": f"{rng.uniform(4096, 65536):.4f}",
+        "V_PGA_MB.csv": str(rng.choice((1024, 2048, 4096, 8192))),
+        "v_last_gather_run.csv": (date.today() - timedelta(days=1)).isoformat() + " 02:00:00",
+        "buff_cache_hit_ratio.csv": f"{rng.uniform(85, 99.9):.1f}",
+        "lib_hit_ratio.csv": f"{rng.uniform(85, 99.9):.1f}",
+        "invalid_object_count.csv": str(rng.randint(0, len(c.statements) // 5)),
+        "stale_table_count.csv": str(rng.randint(0, len(c.tablespaces) // 5)),
+        "unusable_indexes.csv": str(rng.randint(0, 3)),
+    }
+
+
+def _tablespace_lines(c):
+    for tablespace in c.tablespaces:
+        size = sum(mb for _, _, mb, ts in c.datafiles if ts == tablespace) or 100
+        free = round(size * c.rng.uniform(0.01, 0.6), 2)
+        pct_free = round(free * 100 / size)
+        yield f"{tablespace:<30} {size:>12.2f} {free:>12.2f} {pct_free:>4} {100 - pct_free:>4}"
+
+
+def _archival_lines(c):
+    today = date.today()
+    for days_ago in range(c.scale.archival_days - 1, -1, -1):
+        counts = " ".join(f"{c.rng.randint(0, 60):>3}" for _ in range(24))
+        yield f"{(today - timedelta(days=days_ago)).isoformat()} {counts}"
+
+
+def _blocking_session_lines(c):
+    rng = c.rng
+    blocked = {blocked for _, blocked in c.edges}
+    for row, sid in enumerate(c.sids, 1):
+        state = "WAITING" if sid in blocked or rng.random() < 0.2 else "WAITED"
+        wait_type = rng.choice(WAIT_EVENTS)[0]
+        yield f"{row} {sid} {rng.randint(10000, 65535)} ACTIVE {state} {wait_type} {sid} {rng.randint(1, 60)}"
+    for blocker, blocked in c.edges:
+        yield f"SID {blocker} is blocking status ACTIVE blocking {blocked}"
+
+
+def _io_usage_blocks(c):
+    """One block per 64-character piece of each statement, as v$sqltext_with_newlines splits it."""
+    rng = c.rng
+    for _, owner, text in c.statements:
+        disk_reads = rng.randint(100001, 9000000)
+        executions = rng.randint(1, 5000)
+        figures = f"{disk_reads:>10},{executions:>10},{disk_reads / executions:>10.2f}"
+        for start in range(0, len(text), 64):
+            piece_lines = text[start:start + 64].split("\n")
+            yield f"{piece_lines[0]:<64},{figures}"
+            for line in piece_lines[1:]:
+                yield f"{line:<64},{'':>10},{'':>10},{'':>10}"
+            yield owner
+            yield ""
+
+
+def _dbstructure_lines(c):
+    yield f"+RECO/{c.db_name}/CONTROLFILE/current.261.1174298133"
+    for group in range(1, 5):
+        yield f"{group:>10}"
+        yield f"+RECO/{c.db_name}/ONLINELOG/group_{group}.{2000 + group}.1199712463"
+        yield ""
+    for file_id, path, size, tablespace in sorted(c.datafiles, key=lambda d: d[3]):
+        yield f"{file_id:>10}"
+        yield path
+        yield f"{size:>10},OK       ,{tablespace}"
+        yield ""
+
+
+def _datafile_io_lines(c, precise):
+    """disk_io_contention.csv (precise=False) or datafile_io_pct.csv (precise=True) lines."""
+    total_reads = sum(reads for reads, _ in c.io) or 1
+    total_writes = sum(writes for _, writes in c.io) or 1
+    for (_, path, _, _), (reads, writes) in zip(c.datafiles, c.io):
+        yield path
+        if precise:
+            yield f"{reads:>10},{reads * 100 / total_reads:>10.6f},{writes:>10},{writes * 100 / total_writes:>10.6f}"
+        else:
+            block_ios = reads + writes + c.rng.randint(0, 7000000)
+            yield (f"{reads:>14},{reads * 100 / total_reads:>10.2f},{writes:>15},"
+                   f"{writes * 100 / total_writes:>10.2f},{block_ios:>16}")
+        yield ""
+
+
+def _datafile_archive_lines(c):
+    for _, path, size, _ in c.datafiles:
+        yield path
+        yield f"ONLINE ,Normal,READ WRITE,{size * 1024 * 1024},{0:>10},"
+        yield ""
+
+
+def _cpu_sql_lines(c):
+    for sql_id, owner, text in c.statements:
+        cpu = c.rng.uniform(1, 5000)
+        elapsed = cpu * c.rng.uniform(1, 3)
+        yield f"{sql_id} {owner} {cpu:.1f} {elapsed:.1f} {c.rng.randint(0, 10000000)} sql_text,{' '.join(text.split())}"
+
+
+def _io_sql_lines(c):
+    for sql_id, owner, text in c.statements:
+        executions = c.rng.randint(1, 5000)
+        disk_reads = c.rng.randint(0, 9000000)
+        buffer_gets = disk_reads + c.rng.randint(0, 90000000)
+        yield (f"{sql_id} {owner} {executions} {disk_reads} {buffer_gets} "
+               f"{disk_reads / executions:.1f} {buffer_gets / executions:.1f} sql_text,{' '.join(text.split())}")
+
+
+def _dblink_lines(c):
+    for i in range(max(2, c.scale.tablespaces // 50)):
+        created = date.today() - timedelta(days=c.rng.randint(30, 900))
+        yield f"{c.rng.choice(OWNERS)} LINK_{i:03d} REMOTE_{i:03d}"
+        yield f"remote{i}.example.com"
+        yield f"{created:%d-%b-%Y}".upper() + f" NO {c.rng.choice((0, 3600, 7200))} YES NO"
+
+
+def write_collection(csv_dir, scale=Scale(), seed=0, db_name="SYNTHDB"):
+    """Write a complete synthetic collection run into csv_dir; returns the file names written."""
+    os.makedirs(csv_dir, exist_ok=True)
+    rng = random.Random(seed)
+    c = _Collection(scale, rng, db_name)
+    written = []
+
+    def write(filename, lines):
+        _write(csv_dir, filename, lines)
+        written.append(filename)
+
+    for filename, value in _summary_files(c).items():
+        write(filename, [value])
+    write("asm_diskgroup_usage.csv", [f"{group:<30} {rng.uniform(20, 95):.2f}" for group in ("DATA", "RECO", "FRA")])
+    write("most_modified_table.csv", [
+        f"{rng.choice(OWNERS)} {rng.choice(TABLE_WORDS)}_{i} " + " ".join(str(rng.randint(0, 500000)) for _ in range(4))
+        for i in range(10)
+    ])
+    write("cost_inv_managers.csv", [
+        f"{label} Status1 Status2 {rng.choice(('ACTIVE', 'ACTIVE', 'ACTIVE', 'INACTIVE'))}"
+        for label in ("Transaction Manager", "Lock Manager", "Deadlock Detection", "Space Manager")
+    ])
+    write("tablespace.csv", _tablespace_lines(c))
+    write("archivals_for_last_2days_per_hour.csv", _archival_lines(c))
+    write("wait_events.csv", (rng.choice(WAIT_EVENTS)[1] for _ in c.sids))
+    write("waiting_blocking_locks.csv", (
+        f"{rng.choice(WAIT_EVENTS)[1]} - SID {blocked} waiting" for _, blocked in c.edges
+    ))
+    write("sessions_locks.csv", (f"SID {blocker} is blocking the sessions {blocked}" for blocker, blocked in c.edges))
+    write("blocking_sessions.csv", _blocking_session_lines(c))
+    write("top_10_fragmented_tables.csv", [
+        f"{rng.choice(OWNERS)} {rng.choice(TABLE_WORDS)}_{i} {rng.randint(1000, 900000)} "
+        f"{rng.randint(1000, 50000000)} {rng.randint(40, 400)} {rng.uniform(10, 5000):.2f}"
+        for i in range(10)
+    ])
+    write("top_10_cpu_consuming_queries.csv", _cpu_sql_lines(c))
+    write("top_10_io_consuming_queries.csv", _io_sql_lines(c))
+    write("dblinks.csv", _dblink_lines(c))
+
+    write("dbstructure.csv", _dbstructure_lines(c))
+    write("disk_io_contention.csv", _datafile_io_lines(c, precise=False))
+    write("datafile_io_pct.csv", _datafile_io_lines(c, precise=True))
+    write("datafile_archive.csv", _datafile_archive_lines(c))
+    write("io_usage_sql.csv", _io_usage_blocks(c))
+    return written
@@ -0,0 +1,9 @@
+import os
+import sys
+
+import django
+
+# The modules live at the top of the repository, beside app.py.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oracle_db_project.settings')
+django.setup()
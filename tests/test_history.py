@@ -0,0 +1,72 @@
+import os
+
+import pytest
+from django.test import override_settings
+
+import history
+from snapshot import Snapshot
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output_csv')
+RUN_AT = 1_700_000_000
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = history.connect(str(tmp_path / 'history.sqlite3'))
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope='module')
+def sample():
+    return Snapshot(CSV_DIR)
+
+
+def test_ingest_streams_the_multi_line_spools(conn, sample):
+    assert history.ingest_run(conn, 'DCDB', sample, RUN_AT)
+    reads = history.trends(conn, 'DCDB', 'tablespace_physical_reads')
+    writes = history.trends(conn, 'DCDB', 'tablespace_physical_writes')
+    assert len(reads) == len(writes) == 62
+    # ABMD's one datafile, abmd.478.1199695759
+    assert (reads['ABMD'], writes['ABMD']) == ([(RUN_AT, 16)], [(RUN_AT, 5)])
+    assert history.trend(conn, 'DCDB', 'user_sql_disk_reads', 'ITC') == [(RUN_AT, 12634472)]
+    assert set(history.trends(conn, 'DCDB', 'user_sql_disk_reads')) == {
+        'APEX_PUBLIC_USER', 'ITC', 'APEX_230200', 'APPS',
+    }
+
+
+def test_prune_drops_old_runs_and_unreferenced_sql_text(conn, sample):
+    day = 86400
+    for days_ago in (40, 30, 2, 1):
+        history.ingest_run(conn, 'DCDB', sample, RUN_AT - days_ago * day)
+    history.ingest_run(conn, 'GONE', sample, RUN_AT - 40 * day)
+    statements = conn.execute("SELECT COUNT(*) FROM sql_text WHERE database = 'DCDB'").fetchone()[0]
+    assert statements
+
+    with override_settings(HISTORY_RETENTION={'raw': 7, 'hourly': 20, 'daily': None}):
+        deleted = history.prune(conn, RUN_AT)
+    assert deleted['runs'] == 2
+    assert history.runs(conn, 'DCDB') == [('DCDB', RUN_AT - 2 * day), ('DCDB', RUN_AT - day)]
+    # The newest run of a database no longer collected anchors its trends.
+    assert history.runs(conn, 'GONE') == [('GONE', RUN_AT - 40 * day)]
+    # Daily rollups still refer to every statement.
+    assert deleted['sql_text'] == 0
+
+    with override_settings(HISTORY_RETENTION={'raw': 7, 'hourly': 20, 'daily': 20}):
+        deleted = history.prune(conn, RUN_AT)
+    assert deleted['sql_text'] == statements
+    assert conn.execute("SELECT database, COUNT(*) FROM sql_text GROUP BY database").fetchall() == [
+        ('DCDB', statements),
+    ]
+
+
+def test_repeat_run_copies_the_newest_run(conn, sample):
+    written = history.ingest_run(conn, 'DCDB', sample, RUN_AT)
+    assert history.repeat_run(conn, 'DCDB', RUN_AT + 900) == written
+    assert history.has_run(conn, 'DCDB', RUN_AT + 900)
+    [(first, total), (second, repeated)] = history.trend(conn, 'DCDB', 'wait_events_total')
+    assert (first, second) == (RUN_AT, RUN_AT + 900)
+    assert repeated == total
+    # Nothing newer to copy to, or nothing to copy
+    assert history.repeat_run(conn, 'DCDB', RUN_AT) is None
+    assert history.repeat_run(conn, 'OTHER', RUN_AT) is None
@@ -0,0 +1,25 @@
+import os
+
+from manifest import Manifest
+
+
+def test_scan_reports_content_changes_and_leaves_mtimes_alone(tmp_path):
+    path = tmp_path / 'charset.csv'
+    path.write_text("AL32UTF8\n")
+    manifest = Manifest(str(tmp_path))
+    assert manifest.scan() == {'charset.csv'}
+    manifest.processed('step')
+    manifest.save()
+
+    # Rewritten by the next collection run with the same content
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+    mtime = path.stat().st_mtime_ns
+    manifest = Manifest(str(tmp_path))
+    assert manifest.scan() == set()
+    assert manifest.changed('step') == set()
+    assert path.stat().st_mtime_ns == mtime
+    assert manifest.files['charset.csv']['mtime_ns'] == mtime
+
+    path.write_text("WE8ISO8859P1\n")
+    assert manifest.scan() == {'charset.csv'}
+    assert manifest.changed('step') == {'charset.csv'}
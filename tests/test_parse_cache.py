@@ -0,0 +1,40 @@
+from parse_cache import ParseCache, estimate_size
+from records import Tablespace
+
+ROWS = 1000
+
+
+def tablespaces(filepath):
+    # Every record holds its own 1 KB name, so the records outweigh the tuple.
+    return tuple(Tablespace(f"{i:04d}" + "x" * 1020, float(i)) for i in range(ROWS))
+
+
+def test_estimate_size_counts_record_fields():
+    value = tablespaces(None)
+    pointers = estimate_size(tuple(object() for _ in range(ROWS)))
+    assert estimate_size(value) > ROWS * 1024 > pointers
+
+
+def test_estimate_size_counts_shared_objects_once():
+    name = "x" * 4096
+    assert estimate_size(tuple(Tablespace(name, float(i)) for i in range(ROWS))) < ROWS * 4096
+
+
+def test_records_over_the_budget_are_not_cached(tmp_path):
+    path = tmp_path / 'tablespace.csv'
+    path.write_text("spool\n")
+    cache = ParseCache(max_entries=10, max_bytes=ROWS * 512)
+    cache.get(str(path), tablespaces)
+    cache.get(str(path), tablespaces)
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 0, "misses": 2}
+
+
+def test_records_evict_to_the_budget(tmp_path):
+    cache = ParseCache(max_entries=10, max_bytes=ROWS * 1536)
+    paths = [tmp_path / f'{n}.csv' for n in range(2)]
+    for path in paths:
+        path.write_text("spool\n")
+        cache.get(str(path), tablespaces)
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert ROWS * 1024 < stats["bytes"] <= ROWS * 1536
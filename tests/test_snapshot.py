@@ -0,0 +1,22 @@
+from django.test import override_settings
+
+import snapshot as snapshots
+
+
+@override_settings(SNAPSHOT_CACHE_MAX_DIRS=2)
+def test_fleet_snapshots_are_evicted_least_recently_used_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, '_snapshots', snapshots.OrderedDict())
+    dirs = []
+    for name in ('db1', 'db2', 'db3'):
+        (tmp_path / name).mkdir()
+        dirs.append(str(tmp_path / name))
+    db1, db2, db3 = dirs
+    fingerprint = snapshots.directory_fingerprint(db1)
+
+    first = snapshots.get_snapshot(db1, fingerprint)
+    snapshots.get_snapshot(db2, fingerprint)
+    assert snapshots.get_snapshot(db1, fingerprint) is first
+    snapshots.get_snapshot(db3, fingerprint)
+
+    assert list(snapshots._snapshots) == [db1, db3]
+    assert snapshots.get_snapshot(db1, fingerprint) is first
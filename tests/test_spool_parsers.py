@@ -0,0 +1,85 @@
+import os
+
+from spool_parsers import SQL_PIECE_WIDTH, iter_dbstructure, iter_disk_io_contention, iter_io_usage_sql
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output_csv')
+
+# One statement of output_csv/io_usage_sql.csv, as spooled: a piece ends in
+# the space between ":B2" and "AND".
+IO_USAGE_SQL_STATEMENT = "\n".join([
+    'SELECT R.XLSX_ROW, C.XLSX_COL#, C.XLSX_COL, C.XLSX_COL_TYPE, C.X,   6660689,         6,1110114.83',
+    'ITC',
+    '',
+    'LSX_COL_STYLE, C.XLSX_VAL, C.XLSX_INL_STR FROM APEX_230200.WWV_F,   6660689,         6,1110114.83',
+    'ITC',
+    '',
+    "LOW_COLLECTIONS C, XMLTABLE( XMLNAMESPACES( DEFAULT 'http://sche,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "mas.openxmlformats.org/spreadsheetml/2006/main' ), '/worksheet/s,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "heetData/row[exists(c)]' PASSING C.XMLTYPE001 COLUMNS XLSX_ROW N,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "UMBER PATH '@r', XLSX_COLS SYS.XMLTYPE PATH 'c' ) R, XMLTABLE ( ,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "XMLNAMESPACES( DEFAULT 'http://schemas.openxmlformats.org/spread,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "sheetml/2006/main' ), 'c' PASSING R.XLSX_COLS COLUMNS XLSX_COL# ,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "FOR ORDINALITY, XLSX_COL VARCHAR2(15) PATH '@r', XLSX_COL_TYPE V,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "ARCHAR2(15) PATH '@t', XLSX_COL_STYLE VARCHAR2(15) PATH '@s', XL,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "SX_VAL VARCHAR2(4000) PATH 'v/text()', XLSX_INL_STR VARCHAR2(400,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    "0) PATH 'is' ) C WHERE C.COLLECTION_NAME = :B3 AND C.C001 = :B2 ,   6660689,         6,1110114.83",
+    'ITC',
+    '',
+    'AND :B1 IS NULL OR R.XLSX_ROW <= :B1                            ,   6660689,         6,1110114.83',
+    'ITC',
+    '',
+]) + "\n"
+
+
+def test_io_usage_sql_keeps_spaces_at_piece_boundaries(tmp_path):
+    path = tmp_path / 'io_usage_sql.csv'
+    path.write_text(IO_USAGE_SQL_STATEMENT)
+    [statement] = iter_io_usage_sql(path)
+    assert statement.sql_text.startswith("SELECT R.XLSX_ROW, C.XLSX_COL#, C.XLSX_COL, C.XLSX_COL_TYPE, C.XLSX_COL_STYLE,")
+    assert statement.sql_text.endswith("C.C001 = :B2 AND :B1 IS NULL OR R.XLSX_ROW <= :B1")
+    assert len(statement.sql_text) == 12 * SQL_PIECE_WIDTH + len("AND :B1 IS NULL OR R.XLSX_ROW <= :B1")
+    assert (statement.disk_reads, statement.executions, statement.ratio) == (6660689, 6, 1110114.83)
+    assert statement.username == "ITC"
+
+
+def test_io_usage_sql_sample():
+    statements = list(iter_io_usage_sql(os.path.join(CSV_DIR, 'io_usage_sql.csv')))
+    assert len(statements) == 28
+    assert not any(":B2AND" in statement.sql_text for statement in statements)
+    assert all(statement.sql_text == statement.sql_text.rstrip() for statement in statements)
+
+
+def test_disk_io_contention_sample():
+    datafiles = list(iter_disk_io_contention(os.path.join(CSV_DIR, 'disk_io_contention.csv')))
+    assert len(datafiles) == 1628
+    assert datafiles[0].name == "+DATA/DCDB_TCH_BOM/027E5A394E7AA930E0630324F00A8CF5/DATAFILE/apex.1384.1199697567"
+    assert (datafiles[0].phys_reads, datafiles[0].read_pct, datafiles[0].phys_writes,
+            datafiles[0].write_pct, datafiles[0].block_ios) == (233605, 5.72, 22950, 12.13, 6928525)
+
+
+def test_dbstructure_sample():
+    files = list(iter_dbstructure(os.path.join(CSV_DIR, 'dbstructure.csv')))
+    assert [f.kind for f in files[:5]] == ['controlfile', 'logfile', 'logfile', 'logfile', 'logfile']
+    assert files[1].number == 2
+    datafiles = [f for f in files if f.kind == 'datafile']
+    assert len(datafiles) == 1628
+    assert (datafiles[0].number, datafiles[0].size_mb, datafiles[0].status, datafiles[0].tablespace) == (
+        2427, 50, 'OK', 'ABMD')
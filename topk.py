@@ -0,0 +1,60 @@
+"""
+Streaming top-K selection for the top-SQL spool files.
+
+The top-10 page only shows ten statements per metric, but the spool files
+behind it can list thousands. Rather than collecting every statement and
+sorting, each metric keeps a bounded min-heap of the best records seen so
+far while the parser is still reading, and totals are summed in the same
+pass.
+"""
+import heapq
+from itertools import count
+
+from records import TopSql
+
+DEFAULT_LIMIT = 10
+
+
+class TopK:
+    """The k records with the largest key seen so far; ties keep the earlier record."""
+
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._order = count()
+
+    def push(self, record):
+        # (key, -arrival) makes a later record with an equal key the
+        # smallest entry, so it is the one dropped; arrival numbers are
+        # unique, so records themselves are never compared.
+        entry = (self.key(record), -next(self._order), record)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def result(self):
+        """Selected records, largest key first."""
+        return tuple(entry[2] for entry in sorted(self._heap, reverse=True))
+
+
+def rank_statements(records, metrics, totals=(), limit=DEFAULT_LIMIT):
+    """Consume records once into a TopSql ranked by each attribute in metrics.
+
+    totals names the attributes to sum over every record; None values are
+    ranked and summed as 0.
+    """
+    selectors = {
+        metric: TopK(limit, lambda record, metric=metric: getattr(record, metric) or 0)
+        for metric in metrics
+    }
+    sums = dict.fromkeys(totals, 0)
+    statements = 0
+    for record in records:
+        statements += 1
+        for selector in selectors.values():
+            selector.push(record)
+        for name in sums:
+            sums[name] += getattr(record, name) or 0
+    return TopSql(statements, sums, {metric: selector.result() for metric, selector in selectors.items()})
@@ -6,35 +6,49 @@ Update calculated values from your real CSV data
 import os
 import csv
 
+from manifest import Manifest, write_if_changed
+
+# Pipeline step name in the manifest (see manifest.py)
+MANIFEST_STEP = "update_calculated_values"
+
 def update_calculated_values():
-    """Update simple count files based on detailed CSV data"""
+    """Update simple count files based on detailed CSV data
+
+    Counts are only recomputed from source files whose content changed
+    since the last time this ran (see manifest.py), and only rewritten
+    when they change.
+    """
     
     csv_dir = "output_csv"
+    manifest = Manifest(csv_dir)
+    manifest.scan()
+    changed = manifest.changed(MANIFEST_STEP)
+
+    def needed(source, target):
+        return source in changed or not os.path.exists(os.path.join(csv_dir, target))
     
     # Count invalid objects from invalid_objects.csv
-    if os.path.exists(os.path.join(csv_dir, "invalid_objects.csv")):
+    if os.path.exists(os.path.join(csv_dir, "invalid_objects.csv")) and needed("invalid_objects.csv", "invalid_object_count.csv"):
         try:
             with open(os.path.join(csv_dir, "invalid_objects.csv"), 'r', encoding='utf-8') as f:
                 lines = f.readlines()
                 # Count non-empty lines (excluding header if any)
                 count = len([line for line in lines if line.strip() and not line.startswith('OBJECT_NAME')])
                 
-            with open(os.path.join(csv_dir, "invalid_object_count.csv"), 'w') as f:
-                f.write(str(count))
-            print(f"✓ Updated invalid_object_count.csv with {count} objects")
+            if write_if_changed(os.path.join(csv_dir, "invalid_object_count.csv"), str(count)):
+                print(f"✓ Updated invalid_object_count.csv with {count} objects")
         except Exception as e:
             print(f"Warning: Could not process invalid_objects.csv: {e}")
     
     # Count stale objects if we have the file
-    if os.path.exists(os.path.join(csv_dir, "stale_mviews.csv")):
+    if os.path.exists(os.path.join(csv_dir, "stale_mviews.csv")) and needed("stale_mviews.csv", "stale_table_count.csv"):
         try:
             with open(os.path.join(csv_dir, "stale_mviews.csv"), 'r', encoding='utf-8') as f:
                 lines = f.readlines()
                 count = len([line for line in lines if line.strip()])
                 
-            with open(os.path.join(csv_dir, "stale_table_count.csv"), 'w') as f:
-                f.write(str(count))
-            print(f"✓ Updated stale_table_count.csv with {count} objects")
+            if write_if_changed(os.path.join(csv_dir, "stale_table_count.csv"), str(count)):
+                print(f"✓ Updated stale_table_count.csv with {count} objects")
         except Exception as e:
             print(f"Warning: Could not process stale_mviews.csv: {e}")
     
@@ -52,6 +66,11 @@ def update_calculated_values():
                 f.write("95.5")  # Good performance default
             print(f"✓ Created {filename} with default value")
     
+    # Record what was processed, derived files included, for the next run
+    manifest.scan()
+    manifest.processed(MANIFEST_STEP)
+    manifest.save()
+    
     print("✓ All calculated values updated successfully!")
 
 if __name__ == "__main__":
@@ -7,4 +7,5 @@ urlpatterns = [
     path('health/', views.health_check, name='health_check'),
     path('wait_event_summary/', views.wait_event_summary, name='wait_event_summary'),
     path('top-10/', views.top_10_checklists, name='top_10_checklists'),
+    path('api/<slug:name>/', views.report_dataset, name='report_dataset'),
 ]
\ No newline at end of file
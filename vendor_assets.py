@@ -0,0 +1,81 @@
+"""
+Third-party browser libraries used by the report pages, self-hosted
+under static/vendor/.
+
+The monitoring network has no internet egress, so the pages load these
+from our own static files. ``python app.py fetch_vendor_assets`` downloads
+the pinned versions on a machine that does have access. There is no CDN
+fallback: check_vendor_assets() is a system check that warns while a
+library's files are missing, since the pages using it will not load.
+"""
+import os
+import re
+
+from django.contrib.staticfiles import finders
+from django.core import checks
+from django.templatetags.static import static
+
+
+class VendorAsset:
+    """Files of one library, mirrored from base_url into static/vendor/<name>/.
+
+    entry is the file the pages include. Files referenced from it (fonts in
+    a stylesheet, a source map) are fetched along with it.
+    """
+    __slots__ = ('name', 'base_url', 'entry')
+
+    def __init__(self, name, base_url, entry):
+        self.name = name
+        self.base_url = base_url
+        self.entry = entry
+
+    def static_path(self, filename=None):
+        return f"vendor/{self.name}/{filename or self.entry}"
+
+    def cdn_url(self):
+        return self.base_url + self.entry
+
+
+VENDOR_ASSETS = {asset.name: asset for asset in (
+    VendorAsset('chart.js', "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/", "chart.umd.js"),
+    VendorAsset('vis-network', "https://unpkg.com/vis-network@9.1.9/standalone/umd/", "vis-network.min.js"),
+    VendorAsset('font-awesome', "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/", "css/all.min.css"),
+)}
+
+# References that ManifestStaticFilesStorage rewrites, and so must exist
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?(?!data:|https?:|/|#)([^'")?#]+)""")
+SOURCE_MAP_RE = re.compile(r"^/[/*]# sourceMappingURL=([^\s*]+)", re.MULTILINE)
+
+
+def referenced_files(filename, content):
+    """Relative paths of the files a downloaded stylesheet or script refers to."""
+    text = content.decode('utf-8', 'replace')
+    refs = SOURCE_MAP_RE.findall(text)
+    if filename.endswith('.css'):
+        refs += CSS_URL_RE.findall(text)
+    base = os.path.dirname(filename)
+    return sorted(set(os.path.normpath(os.path.join(base, ref)) for ref in refs))
+
+
+def vendor_url(name):
+    """URL of a library's self-hosted entry file."""
+    return static(VENDOR_ASSETS[name].static_path())
+
+
+def check_vendor_assets(app_configs=None, **kwargs):
+    """Warning for every library whose entry file is not in the static files.
+
+    Registered under the staticfiles tag (see apps.py), so collectstatic
+    reports it too. A warning rather than an error, so that the dashboard
+    still starts (with those charts blank) before the files are fetched.
+    """
+    return [
+        checks.Warning(
+            f"{asset.static_path()} is missing, so what the pages draw with {name} will not render.",
+            hint="Run `python app.py fetch_vendor_assets` on a machine with internet access.",
+            obj=name,
+            id='report.W001',
+        )
+        for name, asset in VENDOR_ASSETS.items()
+        if finders.find(asset.static_path()) is None
+    ]
@@ -1,885 +1,451 @@
-import os
-import csv
+import asyncio
+import functools
+import glob
+import hashlib
 import json
 import html
-import random
+import mimetypes
+import os
 import re
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-import pandas as pd
-from django.shortcuts import render
+from datetime import datetime
 from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed
+from django.shortcuts import render
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils._os import safe_join
+from django.utils.http import http_date, quote_etag
+from django.utils.text import compress_string
+
+import datasets
+from datasets import DATASETS, HISTORY_DATASETS
+import scores
+from fleet import adatabase_fingerprint, cache_partition, database_dir, get_fleet
+from history import database_name, get_connection, history_path, parse_window, select_tier, store_state
+from scores import (
+    SECTIONS, display_score, score_attrs, section_scores,
+    summary_section, health_section, wait_section, checklist_section,
+)
+from snapshot import CSV_DIR, aget_snapshot, afiles_fingerprint, source_files
+from vendor_assets import VENDOR_ASSETS, vendor_url
+
+# --- Conditional GET and render cache ---
+#
+# A page only changes when the spool files behind it change. Every page
+# shows the composite score of all four sections (see scores.py), so that
+# means the files behind any section. Their fingerprints go into a strong
+# ETag, so a wall display polling an unchanged page gets a 304 before the
+# snapshot is parsed or the template rendered. The same digest keys the
+# rendered page in the report cache, so every user looking at the same
+# snapshot shares one render.
+#
+# In fleet mode the same views serve /db/<name>/...: db names the database,
+# whose collection directory the page is built from and whose partition of
+# the report cache holds its renders (see fleet.py).
+
+
+def report_dir(db):
+    """Collection directory of the pages of database db (None: the single-database pages)."""
+    if db is None:
+        return CSV_DIR
+    csv_dir = database_dir(db)
+    if csv_dir is None:
+        raise Http404(f"No database named {db!r}")
+    return csv_dir
+
+
+async def report_source(db):
+    """(collection directory, fingerprint of its spool files) of the pages of database db.
+
+    The fingerprint is None for the single-database pages, whose snapshot
+    is kept current by its watcher, and the fleet's for a fleet database.
+    """
+    if db is None:
+        return CSV_DIR, None
+    csv_dir = report_dir(db)
+    return csv_dir, await adatabase_fingerprint(db, csv_dir)
+
+
+def report_cache(db):
+    return caches[settings.REPORT_CACHE_ALIAS] if db is None else cache_partition(db)
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Changes when views.py, datasets.py, scores.py, a template or the static files are redeployed.
+
+    Old ETags then stop matching, and cached pages stop linking to static
+    files that collectstatic has replaced.
+    """
+    paths = [__file__, datasets.__file__, scores.__file__] + sorted(glob.glob(os.path.join(settings.BASE_DIR, "templates", "**", "*.html"), recursive=True))
+    manifest = os.path.join(settings.STATIC_ROOT, staticfiles_storage.manifest_name)
+    if os.path.exists(manifest):
+        paths.append(manifest)
+    return tuple(os.stat(path).st_mtime_ns for path in paths) + tuple(vendor_url(name) for name in VENDOR_ASSETS)
+
+
+def conditional_page(view):
+    """Serve 304s for a report view, whose output depends on the files behind the composite score."""
+    filenames = source_files(score_attrs())
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, db=None, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await view(request, *args, db=db, **kwargs)
+        fingerprint = await afiles_fingerprint(filenames, *await report_source(db))
+        digest, etag, last_modified = validators((view.__name__, db), fingerprint)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await cached_render(request, report_cache(db), digest,
+                                           view, args, {**kwargs, 'db': db})
+        set_validators(response, etag, last_modified)
+        # Let browsers keep the page but make them revalidate on every poll.
+        patch_cache_control(response, no_cache=True)
+        return response
+    return wrapper
+
+
+def validators(key, fingerprint):
+    """(digest, ETag, Last-Modified timestamp) of a response built from the fingerprinted files."""
+    digest = hashlib.sha1(repr((key, code_version(), fingerprint)).encode()).hexdigest()
+    mtimes = [mtime for _, mtime, _ in fingerprint if mtime is not None]
+    return digest, quote_etag(digest), max(mtimes) // 1_000_000_000 if mtimes else None
+
+
+def set_validators(response, etag, last_modified):
+    if last_modified and not response.has_header("Last-Modified"):
+        response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers.setdefault("ETag", etag)
+
+
+async def cached_render(request, cache, digest, view, args, kwargs):
+    """Run view, or replay its output cached in cache for the same inputs."""
+    cache_key = f"report-page:{digest}"
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+    response = await view(request, *args, **kwargs)
+    if response.status_code == 200:
+        await cache.aset(cache_key, (response.content, response['Content-Type']))
+    return response
+
+
+async def composite_score(snapshot, db=None):
+    """(display score, emoji) over all sections of snapshot, computed once per snapshot version."""
+    cache = report_cache(db)
+    digest = hashlib.sha1(repr((code_version(), snapshot.version(*score_attrs()))).encode()).hexdigest()
+    cache_key = f"report-score:{digest}"
+    score = await cache.aget(cache_key)
+    if score is None:
+        score = display_score(section_scores(snapshot))
+        await cache.aset(cache_key, score)
+    return score
+
+
+def fragment_context(snapshot, db=None, **fragments):
+    """Template context for the {% report_cache %} fragments of a report page.
+
+    Each keyword names a fragment and lists the snapshot attributes it is
+    rendered from; its version changes when one of their files does.
+    """
+    cache_settings = settings.CACHES[settings.REPORT_CACHE_ALIAS]
+    return {
+        "fragment_cache": report_cache(db),
+        "report_cache_timeout": cache_settings.get('TIMEOUT', 300),
+        "fragment_versions": {
+            name: snapshot.version(*attrs) for name, attrs in fragments.items()
+        },
+    }
+
+# --- Chart datasets ---
+#
+# Each chart's data is served on its own from /api/<name>/ and validated
+# and cached against only the spool files behind it. The compact JSON and
+# its gzipped form are built once per version and shared by every client.
+
+ACCEPTS_GZIP_RE = re.compile(r"\bgzip\b")
+
+
+async def report_dataset(request, name, db=None):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    if name in HISTORY_DATASETS:
+        return await history_dataset(request, name, db)
+    if name not in DATASETS:
+        raise Http404(f"No dataset named {name!r}")
+    attrs, build = DATASETS[name]
+    csv_dir, source = await report_source(db)
+    fingerprint = await afiles_fingerprint(source_files(attrs), csv_dir, source)
+    digest, etag, last_modified = validators(("dataset", name, db), fingerprint)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        cache = report_cache(db)
+        cache_key = f"report-dataset:{digest}"
+        bodies = await cache.aget(cache_key)
+        if bodies is None:
+            snapshot = await aget_snapshot(csv_dir, source)
+            bodies = json_bodies(build(snapshot))
+            await cache.aset(cache_key, bodies)
+        response = json_response(request, bodies)
+    set_validators(response, etag, last_modified)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def json_bodies(data):
+    """(JSON, gzipped JSON) of data."""
+    content = json.dumps(data, separators=(",", ":")).encode()
+    return content, compress_string(content)
+
+
+def json_response(request, bodies):
+    content, compressed = bodies
+    response = HttpResponse(content_type="application/json")
+    if ACCEPTS_GZIP_RE.search(request.headers.get("Accept-Encoding", "")) and len(compressed) < len(content):
+        response.content = compressed
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response.content = content
+    return response
 
-CSV_DIR = os.path.join(settings.BASE_DIR, "output_csv")
 
-# Global variable for score
-v_score = 0
+# The trend datasets cover ?window= (HISTORY_TREND_WINDOW by default) up to
+# the newest run of the page's database in the history store, not up to
+# now, so they only change when a run is ingested (or the window moves to
+# a coarser tier of the store) and are validated and cached like the
+# others.
 
-# --- Utility functions ---
-def clean_and_read_value(filepath):
+async def history_dataset(request, name, db):
+    window = request.GET.get("window", settings.HISTORY_TREND_WINDOW)
     try:
-        if not os.path.exists(filepath):
-            return "NA"
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if not row:
-                    continue
-                cell = row[0].strip()
-                if cell and cell.lower() not in {"name", "column_name", "value", ""}:
-                    return cell
-        return "NA"
-    except Exception as e:
-        return "NA"
-
-def extract_ratio_value(filepath):
+        seconds = parse_window(window)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    if db is None:
+        database = database_name(await aget_snapshot(CSV_DIR))
+    else:
+        report_dir(db)  # 404 for an unknown database
+        database = db
+    path = str(history_path())
+    # A report request never creates the store; it is empty until the first ingest.
+    state = await asyncio.to_thread(history_state, path, database) if os.path.exists(path) else (0, None, None, None)
+    points = settings.HISTORY_TREND_POINTS
+    until = state[1]
+    since = until - seconds if until is not None else None
+    tier = select_tier(since, until, points, state[3]) if until is not None else None
+    digest = hashlib.sha1(repr((
+        ("history-dataset", name, db, database, seconds, points, tier), code_version(), path, state,
+    )).encode()).hexdigest()
+    etag, last_modified = quote_etag(digest), state[2]
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        cache = report_cache(db)
+        cache_key = f"report-dataset:{digest}"
+        bodies = await cache.aget(cache_key)
+        if bodies is None:
+            series = []
+            if until is not None:
+                series = await asyncio.to_thread(
+                    build_history_dataset, name, path, database, since, until, points, tier,
+                )
+            bodies = json_bodies({"window": window, "since": since, "until": until, "tier": tier, "series": series})
+            await cache.aset(cache_key, bodies)
+        response = json_response(request, bodies)
+    set_validators(response, etag, last_modified)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def history_state(path, database):
+    return store_state(get_connection(path), database)
+
+
+def build_history_dataset(name, path, database, since, until, points, tier):
+    return HISTORY_DATASETS[name](get_connection(path), database, since, until, points, tier)
+
+# --- Static files ---
+#
+# Collected files carry a content hash in their name, so they never change
+# and browsers may keep them for a year; a repeat page view then fetches
+# only the HTML. collectstatic wrote a .gz beside each compressible file
+# (see oracle_db_project/storage.py), which is sent as-is to clients that
+# accept gzip.
+
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def static_path(path):
+    """Filesystem path of a collected static file (or, under DEBUG, one in static/)."""
     try:
-        if not os.path.exists(filepath):
-            return None
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
-            for line in lines:
-                if not line.lower().startswith(("name", "column")):
-                    try:
-                        return float(line)
-                    except ValueError:
-                        continue
-        return None
-    except:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
         return None
+    if os.path.isfile(fullpath):
+        return fullpath
+    if settings.DEBUG:
+        return finders.find(path)
+    return None
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+async def static_file(request, path):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    fullpath = static_path(path)
+    if fullpath is None:
+        raise Http404(f"No static file {path!r}")
+    last_modified = int(os.stat(fullpath).st_mtime)
+
+    response = get_conditional_response(request, last_modified=last_modified)
+    if response is None:
+        content_type, _ = mimetypes.guess_type(fullpath)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        gzipped = fullpath + ".gz"
+        if ACCEPTS_GZIP_RE.search(request.headers.get("Accept-Encoding", "")) and os.path.isfile(gzipped):
+            response.content = await asyncio.to_thread(_read_file, gzipped)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response.content = await asyncio.to_thread(_read_file, fullpath)
+    response.headers["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if HASHED_NAME_RE.search(path):
+        patch_cache_control(response, public=True, max_age=STATIC_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
 
 # --- Views ---
 
-def summary_report(request):
-    v_score = 0
-    summary_map = {
-        "Db Name": "V_DB_NAME.csv",
-        "Version": "V_VERSION.csv",
-        "Nodes": "V_NODES.csv",
-        "Db Status": "V_DB_status.csv",
-        "Db Role": "V_DB_ROLE.csv",
-        "Db Archival Status": "v_db_archival_status.csv",
-        "Total Active Sessions": "v_total_active_sessions.csv",
-        "Pdb Size Gb": "V_PDB_SIZE_GB.csv",
-        "Cdb Size Gb": "V_CDB_SIZE_GB.csv",
-        "Location": "V_LOCATION.csv",
-        "Timezone": "V_TIMEZONE.csv",
-        "Last Reboot": "V_LAST_REBOOT.csv",
-        "Sga Mb": "V_SGA_MB.csv",
-        "Pga Mb": "V_PGA_MB.csv",
-        "Last Gather Run": "v_last_gather_run.csv"
-    }
-    summary_data = []
-    for label, filename in summary_map.items():
-        filepath = os.path.join(CSV_DIR, filename)
-        value = clean_and_read_value(filepath)
-        summary_data.append({'label': label, 'value': value})
-        v_score += 1
-    request.session['summary_score'] = v_score
-    total_score = v_score
-    for key in ['health_score', 'wait_score', 'checklist_score']:
-        total_score += request.session.get(key, 0)
-    # If all scores are zero (i.e., views not called), set display_score to 0
-    if (
-        v_score == 0 and
-        all(request.session.get(key, 0) == 0 for key in ['health_score', 'wait_score', 'checklist_score'])
-    ):
-        display_score = 0
-    elif total_score < 1000:
-        display_score = round((total_score / 1000) * 100, 2)
-    else:
-        display_score = round((total_score / 10000) * 100, 2)
-    score_emoji = "\U0001F44E" if display_score < 50 else "\U0001F44D"
+@conditional_page
+async def summary_report(request, db=None):
+    snapshot = await aget_snapshot(*await report_source(db))
+    _, context = summary_section(snapshot)
+    v_score, score_emoji = await composite_score(snapshot, db)
     return render(request, "report/summary_report.html", {
-        "summary_data": summary_data,
+        **context,
         "generated_on": datetime.now(),
-        "v_score": display_score,
-        "score_emoji": score_emoji
+        "v_score": v_score,
+        "score_emoji": score_emoji,
+        "fleet_db": db,
     })
 
-def health_check(request):
-    v_score = 0
-    # Use a local score variable
-    
-    # Cache ratios
-    cache_ratios = {
-        "Buffer Cache Hit Ratio": "buff_cache_hit_ratio.csv",
-        "Library Cache Hit Ratio": "lib_hit_ratio.csv"
-    }
-    db_object_check = {
-        "Invalid Objects": "invalid_object_count.csv",
-        "Stale Tables": "stale_table_count.csv"
-    }
-    db_usable_indexes_check = {
-        "Unusable Indexes": "unusable_indexes.csv"
-    }
-    asm_disk_group_check = {
-        "ASM Disk Groups": "asm_diskgroup_usage.csv"
-    }
-    pass_items = []
-    warn_items = []
-
-    for label, filename in cache_ratios.items():
-        filepath = os.path.join(CSV_DIR, filename)
-        value = extract_ratio_value(filepath)
-        if value is None:
-            warn_items.append((label, "Invalid or missing"))
-        elif value < 90:
-            warn_items.append((label, f"{value:.2f}%"))
-        else:
-            pass_items.append((label, f"{value:.2f}%"))
-            v_score += 5
-
-    for label, filename in db_object_check.items():
-        filepath = os.path.join(CSV_DIR, filename)
-        value = clean_and_read_value(filepath)
-        if value is None:
-            warn_items.append((label, "Invalid or missing"))
-        elif int(value) > 1000:
-            warn_items.append((label, value))
-        else:
-            pass_items.append((label, value))
-            v_score += 5
-
-    for label, filename in db_usable_indexes_check.items():
-        filepath = os.path.join(CSV_DIR, filename)
-        value = clean_and_read_value(filepath)
-        if value is None:
-            warn_items.append((label, "Invalid or missing"))
-        elif int(value) > 0:
-            warn_items.append((label, value))
-        else:
-            pass_items.append((label, value))
-            v_score += 5
-
-    # ASM Disk Group
-    for label, filename in asm_disk_group_check.items():
-        filepath = os.path.join(CSV_DIR, filename)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        group = parts[0].strip()
-                        try:
-                            usage = float(parts[1].strip())
-                            display_label = f"{label} - {group}"
-                            if usage > 90:
-                                warn_items.append((display_label, f"{usage:.2f}%"))
-                            else:
-                                pass_items.append((display_label, f"{usage:.2f}%"))
-                                v_score += 6
-                        except ValueError:
-                            warn_items.append((f"{label} - {group}", "Invalid number"))
-                    else:
-                        warn_items.append((f"{label} - {line}", "Missing value"))
-        except Exception as e:
-            warn_items.append((label, f"Error: {e}"))
-
-    # Most Modified Table
-    most_modified_table_path = os.path.join(CSV_DIR, "most_modified_table.csv")
-    try:
-        with open(most_modified_table_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) >= 6:
-                    owner = parts[0].strip()
-                    table = parts[1].strip()
-                    full_table = f"{owner}.{table}"
-                    try:
-                        insert = int(float(parts[2].strip()))
-                        update = int(float(parts[3].strip()))
-                        delete = int(float(parts[4].strip()))
-                        total = int(float(parts[5].strip()))
-                        summary = (
-                            f"Most Modified Table: {full_table} "
-                            f"(Insert: {insert:,} , Update: {update:,} , Delete: {delete:,} , Total: {total:,})"
-                        )
-                        warn_items.append(("Modification Alert", summary))
-                    except ValueError:
-                        warn_items.append(("Modification Alert", f"Invalid number format for {full_table}"))
-                else:
-                    warn_items.append(("Modification Alert", "Invalid row format in most_modified_table.csv"))
-    except Exception as e:
-        warn_items.append(("Modification Alert", f"Error reading most_modified_table.csv: {e}"))
-
-    # Transaction Manager Status Check
-    transaction_manager_file = os.path.join(CSV_DIR, "cost_inv_managers.csv")
-    try:
-        with open(transaction_manager_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                parts = line.split()
-                if len(parts) < 2:
-                    continue
-                label = " ".join(parts[:-2]) if len(parts) > 2 else parts[0]
-                status = parts[-1].strip().lower()
-                display_label = label.strip()
-                if status == "inactive":
-                    warn_items.append((display_label, "Inactive"))
-                elif status == "active":
-                    pass_items.append((display_label, "Active"))
-                    v_score += 1
-                else:
-                    warn_items.append((display_label, f"Unknown status: {status}"))
-    except Exception as e:
-        warn_items.append(("Transaction Manager Status", f"Error: {e}"))
-
-    # Tablespace chart data
-    tablespaces = []
-    freemb = []
-    point_colors = []
-    DATA_FILE = os.path.join(CSV_DIR, "tablespace.csv")
-    try:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r', encoding='utf-8') as file:
-                for line in file:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    parts = line.split()
-                    if len(parts) < 3:
-                        continue
-                    try:
-                        name = parts[0]
-                        free_str = parts[2].replace(',', '')
-                        free = float(free_str)
-                        tablespaces.append(name)
-                        freemb.append(free)
-                    except (ValueError, IndexError):
-                        continue
-    except Exception:
-        pass
-    combined = list(zip(tablespaces, freemb))
-    combined.sort(key=lambda x: x[1], reverse=True)
-    threshold = 10000
-    tablespaces_sorted = []
-    freemb_sorted = []
-    for name, free in combined:
-        tablespaces_sorted.append(name)
-        freemb_sorted.append(free)
-        if free <=10:
-            v_score += 2
-        elif free <= 30:
-            v_score += 5
-        elif free >= 90:
-            v_score += 10   
-        else:
-            v_score += 20
-        color = 'rgba(255, 99, 132, 1)'  if free < threshold else 'rgba(74, 144, 226, 1)'
-        point_colors.append(color)
-
-    # Archival Generation chart data
-    daily_data = {}
-    CSV_file = os.path.join(CSV_DIR, "archivals_for_last_2days_per_hour.csv")
-    try:
-        if os.path.exists(CSV_file):
-            with open(CSV_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if not parts or not parts[0].startswith('2025'):
-                        continue
-                    date = parts[0]
-                    try:
-                        hourly_values = list(map(int, parts[1:25]))
-                        daily_data[date] = hourly_values
-                    except (ValueError, IndexError):
-                        continue
-    except Exception:
-        pass
-    archival_score = 0
-    for date, values in daily_data.items():
-        if len(values) < 24:
-            continue
-        total = sum(values)
-        if total < 100:
-            archival_score += 20
-        elif total < 300:
-            archival_score += 10
-        elif total < 1000:
-            archival_score += 15
-        else:
-            archival_score += 5
-    v_score += archival_score
-
-
-    request.session['health_score'] = v_score
-    total_score = v_score
-    for key in ['summary_score', 'wait_score', 'checklist_score']:
-        total_score += request.session.get(key, 0)
-    if total_score < 1000:
-        display_score = round((total_score / 1000) * 100, 2)
-    else:
-        display_score = round((total_score / 10000) * 100, 2)
-    score_emoji = "\U0001F44E" if display_score < 50 else "\U0001F44D"
+@conditional_page
+async def health_check(request, db=None):
+    snapshot = await aget_snapshot(*await report_source(db))
+    _, context = health_section(snapshot)
+    v_score, score_emoji = await composite_score(snapshot, db)
     return render(request, "report/health_check.html", {
-        "pass_items": pass_items,
-        "warn_items": warn_items,
-        "tablespaces": json.dumps(tablespaces_sorted),
-        "freemb": json.dumps(freemb_sorted),
-        "point_colors": json.dumps(point_colors),
-        "threshold": threshold,
-        "daily_data": json.dumps(daily_data),
+        **context,
         "generated_on": datetime.now(),
-        "v_score": display_score,
-        "score_emoji": score_emoji
+        "v_score": v_score,
+        "score_emoji": score_emoji,
+        "fleet_db": db,
     })
 
-def wait_event_summary(request):
-    v_score = 0
-    CSV_DIR = os.path.join(settings.BASE_DIR, "output_csv")
-    session_wait_file = os.path.join(CSV_DIR, "wait_events.csv")
-    waiting_locks_file = os.path.join(CSV_DIR, "waiting_blocking_locks.csv")
-    blocking_sessions_file = os.path.join(CSV_DIR, "blocking_sessions.csv")
-    blocking_file = os.path.join(CSV_DIR, "blocking_sessions.csv")
-    
-    # Initialize all variables
-    wait_event_counter = Counter()
-    wait_event_trend = defaultdict(int)
-    generate_wait_trend = False
-    blocking_counter = Counter()
-    blocking_labels = []
-    blocking_counts = []
-    generate_blocking_graph = False
-    blkedges = set()
-    
-    # Initialize wait event detail variables
-    wait_event_labels = []
-    wait_event_counts = []
-    wait_event_times = []
-    wait_event_avg_times = []
-    wait_event_percentages = []
-
-    # Wait event summary (top 10) - Enhanced to extract detailed information
-    wait_event_details = {}  # Store detailed info: {event_name: {count, total_time, avg_time}}
-    try:
-        if os.path.exists(session_wait_file):
-            with open(session_wait_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    # Simple format: one event per line
-                    wait_event = line
-                    wait_event_counter[wait_event] += 1
-                    # Initialize detailed info if not exists
-                    if wait_event not in wait_event_details:
-                        wait_event_details[wait_event] = {
-                            'count': 0,
-                            'total_time': 0,
-                            'avg_time': 0
-                        }
-                    wait_event_details[wait_event]['count'] += 1
-        
-        # Try to get more detailed info from blocking_sessions.csv
-        if os.path.exists(blocking_sessions_file):
-            try:
-                with open(blocking_sessions_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line or line.startswith('#'):
-                            continue
-                        parts = line.split()
-                        if len(parts) >= 7:
-                            try:
-                                # Format: session_id sid serial# status wait_type sid count
-                                wait_type = parts[4] if len(parts) > 4 else ""
-                                count = int(parts[6]) if len(parts) > 6 else 1
-                                # Map wait type to full event name
-                                wait_event_map = {
-                                    'enq': 'enq: TX - row lock contention',
-                                    'db': 'db file sequential read',
-                                    'latch': 'latch: cache buffers chains',
-                                    'buffer': 'buffer busy waits',
-                                    'log': 'log file sync'
-                                }
-                                # Try to find matching event
-                                event_name = None
-                                for key, value in wait_event_map.items():
-                                    if wait_type.lower().startswith(key):
-                                        event_name = value
-                                        break
-                                
-                                if not event_name:
-                                    # Try to match from existing events
-                                    for event in wait_event_counter.keys():
-                                        if wait_type.lower() in event.lower() or event.lower().startswith(wait_type.lower()):
-                                            event_name = event
-                                            break
-                                
-                                if event_name and event_name in wait_event_details:
-                                    # Estimate time based on count (assuming 1ms per wait)
-                                    estimated_time = count * 1.0
-                                    wait_event_details[event_name]['total_time'] += estimated_time
-                                    wait_event_details[event_name]['count'] = max(
-                                        wait_event_details[event_name]['count'],
-                                        count
-                                    )
-                            except (ValueError, IndexError):
-                                continue
-            except Exception:
-                pass
-        
-        # Calculate averages and prepare data
-        for event_name, details in wait_event_details.items():
-            if details['count'] > 0:
-                details['avg_time'] = details['total_time'] / details['count']
-        
-        # Get top 10 by count
-        most_common_waits = wait_event_counter.most_common(10)
-        wait_event_labels = []
-        wait_event_counts = []
-        wait_event_times = []
-        wait_event_avg_times = []
-        wait_event_percentages = []
-        
-        total_wait_time = sum(details['total_time'] for details in wait_event_details.values())
-        
-        for event, count in most_common_waits:
-            wait_event_labels.append(event)
-            wait_event_counts.append(count)
-            
-            if event in wait_event_details:
-                details = wait_event_details[event]
-                wait_event_times.append(round(details['total_time'], 2))
-                wait_event_avg_times.append(round(details['avg_time'], 2))
-                if total_wait_time > 0:
-                    percentage = round((details['total_time'] / total_wait_time) * 100, 2)
-                else:
-                    percentage = 0
-                wait_event_percentages.append(percentage)
-            else:
-                # Default values if no detailed info
-                wait_event_times.append(0)
-                wait_event_avg_times.append(0)
-                wait_event_percentages.append(0)
-                
-    except Exception as e:
-        wait_event_labels = []
-        wait_event_counts = []
-        wait_event_times = []
-        wait_event_avg_times = []
-        wait_event_percentages = []
-
-    # Wait event trend (simulate as in trail.py)
-    trend_labels = []
-    trend_counts = []
-    if os.path.exists(waiting_locks_file):
-        with open(waiting_locks_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                generate_wait_trend = True
-                now = datetime.now()
-                for _ in range(100):
-                    event_time = now - timedelta(minutes=random.randint(0, 9))
-                    bucket = event_time.strftime("%H:%M")
-                    wait_event_trend[bucket] += 1
-                trend_labels = sorted(wait_event_trend.keys())
-                trend_counts = [wait_event_trend[t] for t in trend_labels]
-    else:
-        v_score += 5
-    if os.path.exists(blocking_sessions_file):
-        with open(blocking_sessions_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if content:
-                generate_blocking_graph = True
-                for line in content.splitlines():
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        sid = parts[1]
-                        count = int(parts[7])
-                        blocking_counter[sid] += count
-                most_common_blocking = blocking_counter.most_common(10)
-                blocking_labels = [sid for sid, _ in most_common_blocking]
-                blocking_counts = [count for _, count in most_common_blocking]
-    else:
-        v_score += 5
-    if os.path.exists(blocking_file):
-        with open(blocking_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                match = re.search(r"SID (\d+) is blocking status \w+ blocking (\d+)", line.strip())
-                if match:
-                    blocker_sid = match.group(1)
-                    blocked_session = match.group(2)
-                    blkedges.add((blocker_sid, blocked_session))
-    else:
-        v_score += 5
-    blkedges = list(blkedges)
-    blknodes = list(set([n for pair in blkedges for n in pair]))
-
-    vis_blknodes = [{"id": int(n), "label": f"SID {n}"} for n in blknodes] if blkedges else []
-    vis_blkedges = [{"from": int(f), "to": int(t)} for f, t in blkedges] if blkedges else []
-   
-    # Locking Sessions Graph (sessions_locks.csv)
-    locking_file = os.path.join(CSV_DIR, "sessions_locks.csv")
-    edges = []
-    if os.path.exists(locking_file):
-        with open(locking_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                match = re.search(r"SID (\d+) is blocking the sessions (\d+)", line.strip())
-                if match:
-                    blocker = match.group(1)
-                    blocked = match.group(2)
-                    edges.append((blocker, blocked))
-    else:
-        v_score += 5
-    nodes = list(set([n for pair in edges for n in pair]))
-    vis_nodes = [{"id": int(n), "label": f"SID {n}"} for n in nodes] if edges else []
-    vis_edges = [{"from": int(f), "to": int(t)} for f, t in edges] if edges else []
-
-    request.session['wait_score'] = v_score
-    total_score = v_score
-    for key in ['summary_score', 'health_score', 'checklist_score']:
-        total_score += request.session.get(key, 0)
-    if total_score < 1000:
-        display_score = round((total_score / 1000) * 100, 2)
-    else:
-        display_score = round((total_score / 10000) * 100, 2)
-    score_emoji = "\U0001F44E" if display_score < 50 else "\U0001F44D"
+@conditional_page
+async def wait_event_summary(request, db=None):
+    snapshot = await aget_snapshot(*await report_source(db))
+    _, context = wait_section(snapshot)
+    v_score, score_emoji = await composite_score(snapshot, db)
     return render(request, "report/wait_event_summary.html", {
-        "wait_event_labels": json.dumps(wait_event_labels),
-        "wait_event_counts": json.dumps(wait_event_counts),
-        "wait_event_times": json.dumps(wait_event_times),
-        "wait_event_avg_times": json.dumps(wait_event_avg_times),
-        "wait_event_percentages": json.dumps(wait_event_percentages),
-        "trend_labels": json.dumps(trend_labels),
-        "trend_counts": json.dumps(trend_counts),
-        "generate_wait_trend": generate_wait_trend,
-        "blocking_labels": json.dumps(blocking_labels),
-        "blocking_counts": json.dumps(blocking_counts),
-        "generate_blocking_graph": generate_blocking_graph,
-        "vis_blknodes": json.dumps(vis_blknodes),
-        "vis_blkedges": json.dumps(vis_blkedges),
-        "has_blocking_graph": bool(blkedges),
-        "vis_locknodes": json.dumps(vis_nodes),
-        "vis_lockedges": json.dumps(vis_edges),
-        "has_locking_graph": bool(edges),
+        **context,
         "generated_on": datetime.now(),
-        "v_score": display_score,
-        "score_emoji": score_emoji
+        "v_score": v_score,
+        "score_emoji": score_emoji,
+        "fleet_db": db,
     })
 
-def top_10_checklists(request):
-    # Use a local score variable
-    v_score = 0
-    v_frag_pct = 0
-    v_total_frag_score = 0
-    v_total_cpu_time = 0
-    v_total_disk_reads = 0
-    # Fragmented tables - exactly as in trail.py
-    # Read and parse the CSV into a list of dicts to avoid TypeError
-    frag_file = os.path.join(CSV_DIR, 'top_10_fragmented_tables.csv')
-    fragmented_tables = []
-    try:
-        if os.path.exists(frag_file):
-            with open(frag_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) == 6:
-                        try:
-                            rec = {
-                                'OWNER': parts[0],
-                                'TABLE_NAME': parts[1],
-                                'BLOCKS': int(float(parts[2])),
-                                'NUM_OF_ROWS': int(float(parts[3])),
-                                'AVG_ROW_LEN': float(parts[4]),
-                                'APPROX_UNUSED_MB': float(parts[5])
-                            }
-                            fragmented_tables.append(rec)
-                        except (ValueError, IndexError):
-                            continue
-    except Exception:
-        pass
-    # Sort by APPROX_UNUSED_MB descending
-    fragmented_tables.sort(key=lambda x: x['APPROX_UNUSED_MB'], reverse=True)
-    table_names = [rec['TABLE_NAME'] for rec in fragmented_tables]
-    unused_space = [rec['APPROX_UNUSED_MB'] for rec in fragmented_tables]
-    owners = [rec['OWNER'] for rec in fragmented_tables]
-    num_rows = [rec['NUM_OF_ROWS'] for rec in fragmented_tables]
-    for rec in fragmented_tables:
-        rec['BLOCKS'] = int(rec['BLOCKS'])
-        rec['APPROX_UNUSED_MB'] = float(rec['APPROX_UNUSED_MB'])
-        if rec['BLOCKS'] > 0:
-            v_frag_pct = ((rec['APPROX_UNUSED_MB']*1024*1024) / (rec['BLOCKS'] * 8192))*100
-            if v_frag_pct < 10:
-                v_total_frag_score = v_total_frag_score + 1.5
-            elif v_frag_pct < 30:
-                v_total_frag_score = v_total_frag_score + 1.0
-            else:
-                v_total_frag_score = v_total_frag_score + 0.5
-    
-    if v_total_frag_score > 15:
-        v_score += 15
-
-
-
-    # Top 10 CPU consuming queries - exactly as in trail.py
-    records = []
-    cpu_file = os.path.join(CSV_DIR, "top_10_cpu_consuming_queries.csv")
-    try:
-        if os.path.exists(cpu_file):
-            with open(cpu_file, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f if line.strip()]
-
-            for line in lines:
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Check if sql_text is in the same line
-                if "sql_text," in line:
-                    # Format: SQL_ID OWNER CPU_TIME sql_text,SQL_TEXT
-                    sql_text_start = line.find("sql_text,")
-                    meta_part = line[:sql_text_start].strip()
-                    sql_line = line[sql_text_start + 9:].strip()
-                    parts = meta_part.split()
-                else:
-                    # Format: SQL_ID OWNER CPU_TIME (no SQL text)
-                    parts = line.split()
-                    sql_line = ""
-
-                if len(parts) < 3:
-                    continue
-
-                try:
-                    sql_id = parts[0]
-                    owner = parts[1]
-                    cpu_time = float(parts[2])
-                    elapsed_time = float(parts[3]) if len(parts) > 3 else cpu_time
-                    rows_processed = int(float(parts[4])) if len(parts) > 4 else 0
-                    
-                    records.append({
-                        "SQL_ID": sql_id,
-                        "OWNER": owner,
-                        "CPU_TIME": cpu_time,
-                        "ELAPSED_TIME": elapsed_time,
-                        "ROWS_PROCESSED": rows_processed,
-                        "SQL_TEXT": sql_line if sql_line else "NA"
-                    })
-                except (ValueError, IndexError):
-                    continue
-    except Exception:
-        pass
-
-    # Create DataFrame and handle empty case
-    if records:
-        df = pd.DataFrame(records)
-        if not df.empty and "CPU_TIME" in df.columns:
-            df_sorted = df.sort_values(by="CPU_TIME", ascending=False)
-            sql_id = df_sorted["SQL_ID"].tolist()
-            cpu_times = df_sorted["CPU_TIME"].tolist()
-            owners_cpu = df_sorted["OWNER"].tolist()
-            elapsed_times = df_sorted["ELAPSED_TIME"].tolist()
-            rows = df_sorted["ROWS_PROCESSED"].tolist()
-            sql_texts = df_sorted["SQL_TEXT"].tolist()
-
-            for rec in df_sorted.to_dict('records'):
-                v_total_cpu_time += rec.get('CPU_TIME', 0) + rec.get('ELAPSED_TIME', 0)
-        else:
-            sql_id = []
-            cpu_times = []
-            owners_cpu = []
-            elapsed_times = []
-            rows = []
-            sql_texts = []
-    else:
-        sql_id = []
-        cpu_times = []
-        owners_cpu = []
-        elapsed_times = []
-        rows = []
-        sql_texts = []
-    if v_total_cpu_time < 100:
-        v_score += 20
-    elif v_total_cpu_time < 1000:
-        v_score += 10
-    elif v_total_cpu_time < 10000:
-        v_score += 15
-    else:
-        v_score += 5
-
-    # Top 10 IO consuming queries - exactly as in trail.py
-    CSV_FILE = "top_10_io_consuming_queries.csv"
-    CSV_PATH = os.path.join(CSV_DIR, CSV_FILE)
-
-    records_io = []
-    try:
-        if os.path.exists(CSV_PATH):
-            with open(CSV_PATH, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f if line.strip()]
-
-            for line in lines:
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Check if sql_text is in the same line
-                if "sql_text," in line:
-                    # Format: SQL_ID OWNER EXECUTIONS DISK_READS ... sql_text,SQL_TEXT
-                    sql_text_start = line.find("sql_text,")
-                    meta_part = line[:sql_text_start].strip()
-                    sql_line = line[sql_text_start + 9:].strip()
-                    parts = meta_part.split()
-                else:
-                    # Format: SQL_ID OWNER EXECUTIONS DISK_READS ... (no SQL text)
-                    parts = line.split()
-                    sql_line = ""
-
-                if len(parts) < 3:
-                    continue
-
-                try:
-                    sql_id_io = parts[0]
-                    owner_io = parts[1]
-                    executions = float(parts[2]) if len(parts) > 2 else 0
-                    disk_reads = float(parts[3]) if len(parts) > 3 else 0
-                    buffer_gets = float(parts[4]) if len(parts) > 4 else 0
-                    read_per_exec = float(parts[5]) if len(parts) > 5 else 0
-                    gets_per_exec = float(parts[6]) if len(parts) > 6 else 0
-                    
-                    sql_text = sql_line.strip() if sql_line else "NA"
-
-                    records_io.append({
-                        "SQL_ID": sql_id_io,
-                        "OWNER": owner_io,
-                        "EXECUTIONS": executions,
-                        "DISK_READS": disk_reads,
-                        "BUFFER_GETS": buffer_gets,
-                        "READ_PER_EXEC": read_per_exec,
-                        "GETS_PER_EXEC": gets_per_exec,
-                        "SQL_TEXT": sql_text
-                    })
-                except (ValueError, IndexError):
-                    continue
-    except Exception:
-        pass
-
-    # Create DataFrame and handle empty case
-    if records_io:
-        df_io = pd.DataFrame(records_io)
-        if not df_io.empty and "DISK_READS" in df_io.columns:
-            df_io_sorted = df_io.sort_values(by="DISK_READS", ascending=False).head(10)
-            sql_id_io = df_io_sorted["SQL_ID"].tolist()
-            owners_io = df_io_sorted["OWNER"].tolist()
-            executions = df_io_sorted["EXECUTIONS"].tolist()
-            disk_reads = df_io_sorted["DISK_READS"].tolist()
-            buffer_gets = df_io_sorted["BUFFER_GETS"].tolist()
-            read_per_exec = df_io_sorted["READ_PER_EXEC"].tolist()
-            gets_per_exec = df_io_sorted["GETS_PER_EXEC"].tolist()
-            sql_texts_io = df_io_sorted["SQL_TEXT"].tolist()
-
-            for rec in df_io_sorted.to_dict('records'):
-                v_total_disk_reads += rec.get('DISK_READS', 0) + rec.get('BUFFER_GETS', 0)
-        else:
-            sql_id_io = []
-            owners_io = []
-            executions = []
-            disk_reads = []
-            buffer_gets = []
-            read_per_exec = []
-            gets_per_exec = []
-            sql_texts_io = []
-    else:
-        sql_id_io = []
-        owners_io = []
-        executions = []
-        disk_reads = []
-        buffer_gets = []
-        read_per_exec = []
-        gets_per_exec = []
-        sql_texts_io = []
-    if v_total_disk_reads < 100000:
-        v_score += 20
-    elif v_total_disk_reads < 1000000:
-        v_score += 15
-    elif v_total_disk_reads < 10000000:
-        v_score += 10
-    else:
-        v_score += 5
-
-    # DB Links - exactly as in trail.py
-    cleaned_data = []
-    dblinks_file = os.path.join(CSV_DIR, "dblinks.csv")
-    try:
-        if os.path.exists(dblinks_file):
-            with open(dblinks_file, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f if line.strip()]
-
-            for i in range(0, len(lines), 3):
-                try:
-                    if i + 2 >= len(lines):
-                        break
-
-                    part1 = lines[i].split()
-                    if len(part1) < 3:
-                        continue
-                    owner, db_link, username = part1[0], part1[1], part1[2]
-
-                    host = lines[i + 1].strip() if i + 1 < len(lines) else "NA"
-
-                    part3 = lines[i + 2].split() if i + 2 < len(lines) else []
-                    if len(part3) < 5:
-                        continue
-
-                    created, hidden, shared_interval, valid, intra_cdb = part3[0], part3[1], part3[2], part3[3], part3[4]
-
-                    cleaned_data.append({
-                        "owner": owner,
-                        "dblink": db_link,
-                        "username": username,
-                        "host": host,
-                        "created": created,
-                        "hidden": hidden,
-                        "shared_interval": shared_interval,
-                        "valid": valid,
-                        "intra_cdb": intra_cdb
-                    })
-                    v_score += 1
-                except Exception:
-                    continue
-    except Exception:
-        pass
-
-    request.session['checklist_score'] = v_score
-    total_score = v_score
-    for key in ['summary_score', 'health_score', 'wait_score']:
-        total_score += request.session.get(key, 0)
-    if total_score < 1000:
-        display_score = round((total_score / 1000) * 100, 2)
-    else:
-        display_score = round((total_score / 10000) * 100, 2)
-    score_emoji = "\U0001F44E" if display_score < 50 else "\U0001F44D"
-    # Prepare CPU data for template
-    cpu_queries = []
-    if records:
-        df = pd.DataFrame(records)
-        df_sorted = df.sort_values(by="CPU_TIME", ascending=False).head(10)
-        cpu_queries = df_sorted.to_dict('records')
-    
-    # Prepare IO data for template
-    io_queries = []
-    if records_io:
-        df_io = pd.DataFrame(records_io)
-        df_io_sorted = df_io.sort_values(by="DISK_READS", ascending=False).head(10)
-        io_queries = df_io_sorted.to_dict('records')
-    
+@conditional_page
+async def top_10_checklists(request, db=None):
+    snapshot = await aget_snapshot(*await report_source(db))
+    _, context = checklist_section(snapshot)
+    v_score, score_emoji = await composite_score(snapshot, db)
     return render(request, "report/top_10_checklists.html", {
-        "table_names": json.dumps(table_names if fragmented_tables else []),
-        "unused_space": json.dumps(unused_space if fragmented_tables else []),
-        "owners": json.dumps(owners if fragmented_tables else []),
-        "num_rows": json.dumps(num_rows if fragmented_tables else []),
-        "cpu_queries": cpu_queries,  # Pass as Python list for template iteration
-        "cpu_queries_json": json.dumps(cpu_queries),  # JSON for JavaScript
-        "io_queries": io_queries,  # Pass as Python list for template iteration
-        "io_queries_json": json.dumps(io_queries),  # JSON for JavaScript
-        "dblinks": cleaned_data,
+        **context,
+        "generated_on": datetime.now(),
+        "v_score": v_score,
+        "score_emoji": score_emoji,
+        "fleet_db": db,
+        **fragment_context(snapshot, db, cpu_table=['cpu_sql'], io_table=['io_sql']),
+    })
+
+# --- Fleet overview ---
+#
+# One row per database under FLEET_DIR, worst composite score first (or
+# worst score in the ?sort= section). The rows come from the last fleet
+# refresh (see fleet.py), so the page never touches a spool file. It is
+# validated and cached against the fleet's version.
+
+SECTION_PAGES = {
+    'summary': 'db_summary_report',
+    'health': 'db_health_check',
+    'wait': 'db_wait_event_summary',
+    'checklist': 'db_top_10_checklists',
+}
+
+
+async def fleet_overview(request):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    sort = request.GET.get("sort")
+    if sort not in SECTIONS:
+        sort = None
+    version, databases = await get_fleet().acurrent()
+    digest = hashlib.sha1(repr(("fleet_overview", sort, code_version(), version)).encode()).hexdigest()
+    collected = [database.collected_at for database in databases.values() if database.collected_at]
+    etag, last_modified = quote_etag(digest), max(collected) // 1_000_000_000 if collected else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = await cached_render(request, caches[settings.REPORT_CACHE_ALIAS], digest,
+                                       render_fleet_overview, (databases, sort), {})
+    set_validators(response, etag, last_modified)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+async def render_fleet_overview(request, databases, sort):
+    def rank(database):
+        return (database.scores.get(sort, 0) if sort else database.score), database.name
+
+    # With 300+ rows, per-row reverse() calls and template filters cost
+    # most of the render: each page is reversed once with a placeholder
+    # name, and the cells are formatted here.
+    placeholder = "__db__"
+    urls = {name: reverse(page, args=[placeholder]) for name, page in SECTION_PAGES.items()}
+    rows = []
+    for database in sorted(databases.values(), key=rank):
+        collected_at = database.collected_at
+        rows.append({
+            "database": database,
+            "url": urls['summary'].replace(placeholder, database.name),
+            "score": f"{database.emoji} {database.score}%",
+            "sections": [
+                ("NA" if database.scores.get(name) is None else str(database.scores[name]),
+                 urls[name].replace(placeholder, database.name))
+                for name in SECTIONS
+            ],
+            "collected_at": datetime.fromtimestamp(collected_at / 1e9).strftime("%b %d, %H:%M") if collected_at else "NA",
+            "errors": str(database.errors),
+        })
+    return render(request, "report/fleet_overview.html", {
+        "rows": rows,
+        "sections": list(SECTIONS),
+        "sort": sort,
+        "unhealthy": sum(1 for database in databases.values() if database.score < 50),
         "generated_on": datetime.now(),
-        "v_score": display_score,
-        "score_emoji": score_emoji
-    })
\ No newline at end of file
+    })